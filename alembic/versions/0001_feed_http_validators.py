@@ -0,0 +1,28 @@
+"""Store HTTP validators and a content hash per news source
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("news_sources", sa.Column("etag", sa.String(), nullable=True))
+    op.add_column("news_sources", sa.Column("last_modified", sa.String(), nullable=True))
+    op.add_column("news_sources", sa.Column("content_hash", sa.String(64), nullable=True))
+
+
+def downgrade():
+    op.drop_column("news_sources", "content_hash")
+    op.drop_column("news_sources", "last_modified")
+    op.drop_column("news_sources", "etag")
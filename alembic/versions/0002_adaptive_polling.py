@@ -0,0 +1,37 @@
+"""Track per-source polling cadence and failures
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("news_sources", sa.Column("poll_interval_seconds", sa.Integer(), nullable=True))
+    op.add_column("news_sources", sa.Column("next_poll_at", sa.DateTime(), nullable=True))
+    op.add_column("news_sources", sa.Column("last_polled_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "news_sources",
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_news_sources_next_poll_at", "news_sources", ["next_poll_at"])
+    op.create_index("ix_articles_source_id_published_at", "articles", ["source_id", "published_at"])
+
+
+def downgrade():
+    op.drop_index("ix_articles_source_id_published_at", table_name="articles")
+    op.drop_index("ix_news_sources_next_poll_at", table_name="news_sources")
+    op.drop_column("news_sources", "consecutive_failures")
+    op.drop_column("news_sources", "last_polled_at")
+    op.drop_column("news_sources", "next_poll_at")
+    op.drop_column("news_sources", "poll_interval_seconds")
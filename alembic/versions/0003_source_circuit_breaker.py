@@ -0,0 +1,33 @@
+"""Track circuit breaker state and fetch latency per news source
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "news_sources",
+        sa.Column("circuit_state", sa.String(16), nullable=False, server_default="closed"),
+    )
+    op.add_column("news_sources", sa.Column("circuit_opened_at", sa.DateTime(), nullable=True))
+    op.add_column("news_sources", sa.Column("circuit_retry_at", sa.DateTime(), nullable=True))
+    op.add_column("news_sources", sa.Column("avg_latency_ms", sa.Float(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("news_sources", "avg_latency_ms")
+    op.drop_column("news_sources", "circuit_retry_at")
+    op.drop_column("news_sources", "circuit_opened_at")
+    op.drop_column("news_sources", "circuit_state")
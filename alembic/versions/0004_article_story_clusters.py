@@ -0,0 +1,28 @@
+"""Store near-duplicate fingerprints and story cluster IDs on articles
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("articles", sa.Column("simhash", sa.BigInteger(), nullable=True))
+    op.add_column("articles", sa.Column("cluster_id", sa.BigInteger(), nullable=True))
+    op.create_index("ix_articles_cluster_id_id", "articles", ["cluster_id", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_articles_cluster_id_id", table_name="articles")
+    op.drop_column("articles", "cluster_id")
+    op.drop_column("articles", "simhash")
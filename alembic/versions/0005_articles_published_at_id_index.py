@@ -0,0 +1,24 @@
+"""Index articles on (published_at, id) for keyset pagination
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_articles_published_at_id", "articles", ["published_at", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_articles_published_at_id", table_name="articles")
@@ -0,0 +1,40 @@
+"""Add a GIN-indexed full-text search vector to articles
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("articles", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+    # Backfill existing rows with the same text search configuration and weighting the writer uses (title A, content B)
+    op.get_bind().execute(
+        sa.text(
+            """
+            UPDATE articles
+            SET search_vector = setweight(to_tsvector(CAST(:config AS regconfig), COALESCE(title, '')), 'A')
+                             || setweight(to_tsvector(CAST(:config AS regconfig), COALESCE(content, '')), 'B')
+            """
+        ),
+        {"config": settings.SEARCH_TEXT_CONFIG},
+    )
+    op.create_index("ix_articles_search_vector", "articles", ["search_vector"], postgresql_using="gin")
+
+
+def downgrade():
+    op.drop_index("ix_articles_search_vector", table_name="articles")
+    op.drop_column("articles", "search_vector")
@@ -0,0 +1,80 @@
+"""Store numeric source coordinates and a geohash for location queries
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+NUMBER = r"'^\s*[-+]?[0-9]+(\.[0-9]+)?\s*$'"
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def _geohash(latitude: float, longitude: float, precision: int = 9) -> str:
+    # A copy of app.utilities.geohash.encode as of this revision, so the migration
+    # keeps producing the same values however that module changes later
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def upgrade():
+    # Coordinates were free-form strings; anything that is not a plain number becomes NULL
+    for column in ("latitude", "longitude"):
+        op.alter_column(
+            "news_sources",
+            column,
+            type_=sa.Float(),
+            postgresql_using=f"CASE WHEN {column} ~ {NUMBER} THEN {column}::double precision END",
+        )
+    op.execute(
+        "UPDATE news_sources SET latitude = NULL, longitude = NULL "
+        "WHERE latitude NOT BETWEEN -90 AND 90 OR longitude NOT BETWEEN -180 AND 180 "
+        "OR latitude IS NULL OR longitude IS NULL"
+    )
+    op.add_column("news_sources", sa.Column("geohash", sa.String(12), nullable=True))
+
+    connection = op.get_bind()
+    rows = connection.execute(sa.text("SELECT id, latitude, longitude FROM news_sources WHERE latitude IS NOT NULL")).fetchall()
+    for row in rows:
+        connection.execute(
+            sa.text("UPDATE news_sources SET geohash = :geohash WHERE id = :id"),
+            {"geohash": _geohash(row.latitude, row.longitude), "id": row.id},
+        )
+
+    op.create_index(
+        "ix_news_sources_geohash",
+        "news_sources",
+        ["geohash"],
+        postgresql_ops={"geohash": "text_pattern_ops"},
+    )
+
+
+def downgrade():
+    op.drop_index("ix_news_sources_geohash", table_name="news_sources")
+    op.drop_column("news_sources", "geohash")
+    for column in ("latitude", "longitude"):
+        op.alter_column("news_sources", column, type_=sa.String(), postgresql_using=f"{column}::text")
@@ -0,0 +1,64 @@
+"""Add incrementally maintained feedback rollups per type, content item and hour
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def _counters():
+    return [
+        sa.Column("feedback_count", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("total_impact", sa.BigInteger(), nullable=False, server_default="0"),
+    ]
+
+
+def upgrade():
+    op.create_table(
+        "feedback_type_rollup",
+        sa.Column("feedback_type", sa.String(), primary_key=True),
+        *_counters(),
+    )
+    op.create_table(
+        "feedback_content_rollup",
+        sa.Column("content_id", sa.Integer(), primary_key=True),
+        sa.Column("feedback_type", sa.String(), primary_key=True),
+        *_counters(),
+    )
+    op.create_table(
+        "feedback_hourly_rollup",
+        sa.Column("bucket", sa.DateTime(), primary_key=True),
+        sa.Column("feedback_type", sa.String(), primary_key=True),
+        *_counters(),
+    )
+
+    # Backfill from existing feedback; from here on every insert maintains the rollups
+    op.execute(
+        "INSERT INTO feedback_type_rollup (feedback_type, feedback_count, total_impact) "
+        "SELECT feedback_type, COUNT(*), COALESCE(SUM(impact_score), 0) FROM feedback GROUP BY feedback_type"
+    )
+    op.execute(
+        "INSERT INTO feedback_content_rollup (content_id, feedback_type, feedback_count, total_impact) "
+        "SELECT content_id, feedback_type, COUNT(*), COALESCE(SUM(impact_score), 0) FROM feedback GROUP BY content_id, feedback_type"
+    )
+    op.execute(
+        "INSERT INTO feedback_hourly_rollup (bucket, feedback_type, feedback_count, total_impact) "
+        "SELECT date_trunc('hour', timestamp), feedback_type, COUNT(*), COALESCE(SUM(impact_score), 0) "
+        "FROM feedback WHERE timestamp IS NOT NULL GROUP BY 1, 2"
+    )
+
+
+def downgrade():
+    op.drop_table("feedback_hourly_rollup")
+    op.drop_table("feedback_content_rollup")
+    op.drop_table("feedback_type_rollup")
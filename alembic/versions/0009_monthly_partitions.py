@@ -0,0 +1,149 @@
+"""Range-partition articles and feedback by month, with URL uniqueness in article_urls
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# The months present in the data plus every month from the retention cutoff through
+# PARTITION_PREMAKE_MONTHS ahead, so no month that ingest accepts lacks a partition
+MONTHS_QUERY = """
+    SELECT date_trunc('month', {column}) FROM {table}
+    UNION
+    SELECT generate_series(
+        date_trunc('month', timezone('utc', now())) - make_interval(months => {retention}),
+        date_trunc('month', timezone('utc', now())) + make_interval(months => {ahead}),
+        interval '1 month'
+    )
+    ORDER BY 1
+"""
+FOREIGN_KEYS_QUERY = """
+    SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+    WHERE conrelid = CAST(:table AS regclass) AND contype = 'f'
+"""
+
+ARTICLE_INDEXES = [
+    ("ix_articles_published_at_id", ["published_at", "id"], {}),
+    ("ix_articles_source_id_published_at", ["source_id", "published_at"], {}),
+    ("ix_articles_cluster_id_id", ["cluster_id", "id"], {}),
+    ("ix_articles_search_vector", ["search_vector"], {"postgresql_using": "gin"}),
+]
+
+# Claims each new article's URL; a URL already claimed, in any partition or an archived one, skips the row
+CLAIM_URL_FUNCTION = """
+    CREATE FUNCTION articles_claim_url() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO article_urls (url, article_id, published_at)
+        VALUES (NEW.url, NEW.id, NEW.published_at)
+        ON CONFLICT (url) DO NOTHING;
+        IF NOT FOUND THEN
+            RETURN NULL;
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def _swap_table(connection, table: str, create_sql: str) -> tuple:
+    # Renames the table aside and creates its replacement with the same columns, defaults and ID sequence
+    sequence = connection.execute(sa.text("SELECT pg_get_serial_sequence(:table, 'id')"), {"table": table}).scalar()
+    foreign_keys = connection.execute(sa.text(FOREIGN_KEYS_QUERY), {"table": table}).fetchall()
+    old = f"{table}_old"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(create_sql.format(table=table, old=old))
+    if sequence:
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+    return old, foreign_keys
+
+
+def _copy_and_drop(table: str, old: str, foreign_keys: list):
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+    for name, definition in foreign_keys:
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def _partition_table(connection, table: str, column: str, retention_months: int):
+    old, foreign_keys = _swap_table(
+        connection, table, f"CREATE TABLE {{table}} (LIKE {{old}} INCLUDING DEFAULTS) PARTITION BY RANGE ({column})"
+    )
+    months_query = MONTHS_QUERY.format(
+        table=old, column=column, retention=int(retention_months), ahead=int(settings.PARTITION_PREMAKE_MONTHS)
+    )
+    months = connection.execute(sa.text(months_query)).scalars().all()
+    for month in months:
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}')"
+        )
+    _copy_and_drop(table, old, foreign_keys)
+    # Unique constraints on a partitioned table must include the partition key
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {column})")
+
+
+def _unpartition_table(connection, table: str):
+    old, foreign_keys = _swap_table(connection, table, "CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)")
+    _copy_and_drop(table, old, foreign_keys)
+    op.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id)")
+
+
+def upgrade():
+    connection = op.get_bind()
+
+    # articles: URL uniqueness moves to article_urls, which also outlives archived partitions
+    op.create_table(
+        "article_urls",
+        sa.Column("url", sa.String(), primary_key=True),
+        sa.Column("article_id", sa.BigInteger(), nullable=False),
+        sa.Column("published_at", sa.DateTime(), nullable=False),
+    )
+    op.execute("INSERT INTO article_urls (url, article_id, published_at) SELECT url, id, published_at FROM articles")
+    _partition_table(connection, "articles", "published_at", settings.ARTICLE_RETENTION_MONTHS)
+    for name, columns, options in ARTICLE_INDEXES:
+        op.create_index(name, "articles", columns, **options)
+    op.execute(CLAIM_URL_FUNCTION)
+    op.execute("CREATE TRIGGER articles_claim_url BEFORE INSERT ON articles FOR EACH ROW EXECUTE FUNCTION articles_claim_url()")
+
+    # feedback: the partition key must be NOT NULL; rows written before timestamps were always set get the migration time
+    op.execute("UPDATE feedback SET timestamp = timezone('utc', now()) WHERE timestamp IS NULL")
+    op.alter_column("feedback", "timestamp", nullable=False, server_default=sa.text("timezone('utc', now())"))
+    _partition_table(connection, "feedback", "timestamp", settings.FEEDBACK_RETENTION_MONTHS)
+    op.create_index("ix_feedback_content_id_timestamp", "feedback", ["content_id", "timestamp"])
+
+
+def downgrade():
+    # Rows in partitions that were already archived stay in their Parquet files
+    connection = op.get_bind()
+
+    op.drop_index("ix_feedback_content_id_timestamp", table_name="feedback")
+    _unpartition_table(connection, "feedback")
+    op.alter_column("feedback", "timestamp", nullable=True, server_default=None)
+    op.create_index("ix_feedback_id", "feedback", ["id"])
+
+    op.execute("DROP TRIGGER articles_claim_url ON articles")
+    op.execute("DROP FUNCTION articles_claim_url()")
+    for name, _, _ in ARTICLE_INDEXES:
+        op.drop_index(name, table_name="articles")
+    _unpartition_table(connection, "articles")
+    op.create_unique_constraint("articles_url_key", "articles", ["url"])
+    op.create_index("ix_articles_id", "articles", ["id"])
+    for name, columns, options in ARTICLE_INDEXES:
+        op.create_index(name, "articles", columns, **options)
+    op.drop_table("article_urls")
@@ -1,47 +1,240 @@
-from fastapi import APIRouter, HTTPException
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from app.modules.article_export import EXPORT_FIELDS, EXPORT_FORMATS, iter_article_batches, iter_csv, iter_ndjson
+from app.modules.article_projection import DETAIL_FIELDS, finalize_rows, parse_fields, select_clause
+from app.modules.trending import get_trending
+from app.modules.article_search import POSTGRES, search_articles, search_backend, search_vector_sql
+from app.modules.partitions import partition_window, partitioning_enabled
+from app.config import settings
+from app.utilities.async_database import execute_query_async
 from app.utilities.database import execute_query
 from app.utilities.validation import sanitize_input
+from app.utilities.pagination import decode_cursor, encode_cursor
+from app.utilities.response_cache import cached_response, invalidate_tags
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 
 @router.get("/")
-async def list_articles(skip: int = 0, limit: int = 10):
+@cached_response("articles.list", tags=["articles"])
+async def list_articles(skip: int = 0, limit: int = 10, cursor: str = None, collapse_duplicates: bool = False, fields: str = None):
     """
-    List recent articles, paginated.
+    List recent articles, newest first.
+
+    Each article is a summary (id, title, url, source_id, source, published_at
+    and a short plain-text snippet) unless ``fields`` selects a comma-separated
+    list of columns, e.g. ``fields=id,title,published_at``. ``id`` and
+    ``published_at`` are always included. Full bodies are served by
+    ``/articles/{article_id}/content``.
+
+    Pages are addressed either by ``skip`` (offset mode, kept for backward
+    compatibility) or by ``cursor``, an opaque token from a previous response's
+    ``next_cursor``. Cursor mode seeks straight to ``(published_at, id)`` on an
+    index instead of scanning and discarding ``skip`` rows, and its pages do not
+    drift as new articles arrive. Pass an empty ``cursor`` to start in cursor mode.
+
+    With ``collapse_duplicates``, near-duplicate copies of a story (same
+    ``cluster_id``) are collapsed into the first one stored, which carries the
+    size of its cluster.
     """
-    query = f"SELECT * FROM articles ORDER BY published_at DESC LIMIT {limit} OFFSET {skip}"
     try:
-        result = execute_query(query)
-        return {"articles": result["data"]}
+        selected = parse_fields(fields, required=("id", "published_at"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    columns, from_sql = select_clause(selected)
+
+    conditions, params = [], []
+    if cursor:
+        try:
+            published_at, last_id = decode_cursor(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        conditions.append("(a.published_at, a.id) < (%s, %s)")
+        params.extend([published_at, last_id])
+
+    if collapse_duplicates:
+        columns += """,
+                   CASE WHEN a.cluster_id IS NULL THEN 1
+                        ELSE (SELECT COUNT(*) FROM articles d WHERE d.cluster_id = a.cluster_id)
+                   END AS cluster_size"""
+        conditions.append(
+            "(a.cluster_id IS NULL OR NOT EXISTS "
+            "(SELECT 1 FROM articles e WHERE e.cluster_id = a.cluster_id AND e.id < a.id))"
+        )
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    query = f"SELECT {columns} FROM {from_sql} {where} ORDER BY a.published_at DESC, a.id DESC LIMIT %s"
+    params.append(limit)
+    if cursor is None:
+        query += " OFFSET %s"
+        params.append(skip)
+
+    try:
+        result = await execute_query_async(query, tuple(params), read_only=True)
+        articles = finalize_rows(result["data"], selected)
+        next_cursor = None
+        if len(articles) == limit:
+            next_cursor = encode_cursor(articles[-1]["published_at"], articles[-1]["id"])
+        # Plain rows need no validation; returning the response directly skips
+        # FastAPI's per-value jsonable_encoder pass, which dominates on large pages
+        return ORJSONResponse({"articles": articles, "next_cursor": next_cursor})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing articles: {str(e)}")
 
+@router.get("/search")
+@cached_response("articles.search", tags=["articles"])
+async def search_articles_endpoint(
+    q: str = Query(..., min_length=1),
+    source_id: list[int] = Query(default=None),
+    since: datetime = None,
+    until: datetime = None,
+    sort: str = "relevance",
+    skip: int = 0,
+    limit: int = 10,
+):
+    """
+    Full-text search over article titles and content.
+
+    Results are ranked by relevance (or newest first with ``sort=recent``) and
+    can be narrowed to one or more ``source_id`` values and a ``since``/``until``
+    publication window.
+    """
+    limit = max(1, min(limit, settings.SEARCH_MAX_PAGE_SIZE))
+    try:
+        results = search_articles(q, source_ids=source_id, since=since, until=until, sort=sort, limit=limit, skip=skip)
+        return {"query": q, "articles": results}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching articles: {str(e)}")
+
+@router.get("/trending")
+async def trending_articles(skip: int = 0, limit: int = 20):
+    """
+    Articles trending now, ranked by time-decayed feedback.
+
+    Served straight from the incrementally maintained trending set.
+    """
+    limit = max(1, min(limit, 100))
+    try:
+        return ORJSONResponse({"articles": get_trending(limit=limit, skip=skip)})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching trending articles: {str(e)}")
+
+@router.get("/export")
+async def export_articles(
+    format: str = "ndjson",
+    fields: str = None,
+    source_id: list[int] = Query(default=None),
+    since: datetime = None,
+    until: datetime = None,
+    after_id: int = 0,
+):
+    """
+    Stream articles in ID order as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written out batch by batch,
+    so exports of any size run in constant memory. ``fields`` selects columns
+    (every stored column by default); ``after_id`` resumes an interrupted export.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}.")
+    try:
+        selected = parse_fields(fields, default=EXPORT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    batches = iter_article_batches(selected, source_ids=source_id, since=since, until=until, after_id=after_id)
+    if format == "csv":
+        return StreamingResponse(iter_csv(batches, selected), media_type="text/csv",
+                                 headers={"Content-Disposition": 'attachment; filename="articles.csv"'})
+    return StreamingResponse(iter_ndjson(batches), media_type="application/x-ndjson")
+
 @router.get("/{article_id}")
-async def get_article(article_id: int):
+@cached_response("articles.get", tags=["articles"])
+async def get_article(article_id: int, fields: str = None):
     """
     Retrieve a specific article by ID.
+
+    Returns every column except the body by default; ``fields`` selects
+    specific columns as in the listing. The body is served by
+    ``/articles/{article_id}/content``.
     """
-    query = "SELECT * FROM articles WHERE id = %s"
     try:
-        result = execute_query(query, (article_id,))
-        if not result["data"]:
-            raise HTTPException(status_code=404, detail="Article not found.")
-        return {"article": result["data"][0]}
+        selected = parse_fields(fields, default=DETAIL_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    columns, from_sql = select_clause(selected)
+    query = f"SELECT {columns} FROM {from_sql} WHERE a.id = %s"
+    try:
+        result = await execute_query_async(query, (article_id,))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving article: {str(e)}")
+    if not result["data"]:
+        raise HTTPException(status_code=404, detail="Article not found.")
+    return ORJSONResponse({"article": finalize_rows(result["data"], selected)[0]})
+
+@router.get("/{article_id}/content")
+async def get_article_content(article_id: int):
+    """
+    Retrieve the full body of a specific article.
+    """
+    query = "SELECT id, content FROM articles WHERE id = %s"
+    try:
+        result = await execute_query_async(query, (article_id,))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error retrieving article content: {str(e)}")
+    if not result["data"]:
+        raise HTTPException(status_code=404, detail="Article not found.")
+    return ORJSONResponse(result["data"][0])
+
+def _check_partition_window(published_at: str):
+    # Only months kept attached by maintain_partitions have a partition to insert into
+    try:
+        moment = datetime.fromisoformat(published_at)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="published_at must be an ISO 8601 timestamp.")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    start, end = partition_window("articles")
+    if not start <= moment < end:
+        raise HTTPException(
+            status_code=400,
+            detail=f"published_at must be on or after {start:%Y-%m-%d} and before {end:%Y-%m-%d}.",
+        )
 
 @router.post("/")
 async def add_article(title: str, content: str, url: str, source_id: int, published_at: str):
     """
     Add a new article to the database.
+
+    Returns 409 if an article with the same URL is already stored (or was
+    archived), and 400 if ``published_at`` falls outside the partitioned months.
     """
-    query = """
-        INSERT INTO articles (title, content, url, source_id, published_at, fetched_at)
-        VALUES (%s, %s, %s, %s, %s, NOW())
-    """
+    if partitioning_enabled():
+        _check_partition_window(published_at)
+    title, content = sanitize_input(title), sanitize_input(content)
+    if search_backend() == POSTGRES:
+        query = f"""
+            INSERT INTO articles (title, content, url, source_id, published_at, fetched_at, search_vector)
+            VALUES (%s, %s, %s, %s, %s, NOW(), {search_vector_sql()})
+            RETURNING id
+        """
+        params = (title, content, sanitize_input(url), source_id, published_at, title, content)
+    else:
+        query = """
+            INSERT INTO articles (title, content, url, source_id, published_at, fetched_at)
+            VALUES (%s, %s, %s, %s, %s, NOW())
+            RETURNING id
+        """
+        params = (title, content, sanitize_input(url), source_id, published_at)
     try:
-        execute_query(query, (sanitize_input(title), sanitize_input(content), sanitize_input(url), source_id, published_at))
-        return {"message": "Article added successfully."}
+        rows = execute_query(query, params)["data"]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding article: {str(e)}")
+    if not rows:
+        # The articles_claim_url trigger skips a URL that is already claimed
+        raise HTTPException(status_code=409, detail="An article with this URL already exists.")
+    invalidate_tags("articles")
+    return {"message": "Article added successfully.", "id": rows[0]["id"]}
 
@@ -1,5 +1,6 @@
-from fastapi import APIRouter, HTTPException
-from app.modules.feedback import add_feedback, get_feedback, analyze_feedback_trends
+import asyncio
+from fastapi import APIRouter, HTTPException, Query
+from app.modules.feedback import add_feedback, get_feedback_async, get_feedback_summary_async, analyze_feedback_trends_async
 from app.utilities.validation import sanitize_input
 
 router = APIRouter(prefix="/feedback", tags=["Feedback"])
@@ -11,30 +12,31 @@ async def submit_feedback(user_id: int, content_id: int, feedback_type: str, imp
     """
     try:
         feedback_type = sanitize_input(feedback_type)
-        result = add_feedback(user_id, content_id, feedback_type, impact_score)
+        # Accepting an event appends to the durable log (a Redis XADD or a spool write and fsync), which blocks
+        result = await asyncio.to_thread(add_feedback, user_id, content_id, feedback_type, impact_score)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/{content_id}")
-async def fetch_feedback(content_id: int):
+@router.get("/trends")
+async def fetch_feedback_trends(hours: int = Query(None, ge=1, le=24 * 90)):
     """
-    Fetch all feedback for a specific content item.
+    Fetch aggregated feedback trends across all content, optionally limited to the last ``hours`` hours.
     """
     try:
-        feedback = get_feedback(content_id)
-        return {"feedback": feedback}
+        trends = await analyze_feedback_trends_async(hours)
+        return {"trends": trends}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/trends")
-async def fetch_feedback_trends():
+@router.get("/{content_id}")
+async def fetch_feedback(content_id: int):
     """
-    Fetch aggregated feedback trends across all content.
+    Fetch all feedback for a specific content item.
     """
     try:
-        trends = analyze_feedback_trends()
-        return {"trends": trends}
+        feedback, summary = await asyncio.gather(get_feedback_async(content_id), get_feedback_summary_async(content_id))
+        return {"feedback": feedback, "summary": summary}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
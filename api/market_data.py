@@ -1,16 +1,18 @@
 from fastapi import APIRouter, HTTPException, Query
-from app.modules.market_data import fetch_market_items, add_market_item
+from app.modules.market_data import fetch_market_items_async, add_market_item
 from app.utilities.validation import sanitize_input
+from app.utilities.response_cache import cached_response
 
 router = APIRouter(prefix="/market", tags=["Market Data"])
 
 @router.get("/")
+@cached_response("market.list", tags=["items:region={region}"])
 async def list_market_items(skip: int = Query(default=0), limit: int = Query(default=10), region: str = Query(default="Lewiston")):
     """
     List market items for a specific region, paginated.
     """
     try:
-        items = fetch_market_items(skip=skip, limit=limit, region=region)
+        items = await fetch_market_items_async(skip=skip, limit=limit, region=region)
         return {"region": region, "items": items}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
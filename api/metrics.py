@@ -0,0 +1,47 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.utilities.async_database import async_engine, async_pool_metrics
+from app.utilities.database import engine, pool_metrics, replica_router
+from app.utilities.logging import log_exception
+from app.utilities.metrics import render_metric
+from app.utilities.query_metrics import query_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _pools() -> list:
+    pools = [({"pool": "primary"}, engine.pool, pool_metrics), ({"pool": "primary-async"}, async_engine.sync_engine.pool, async_pool_metrics)]
+    for replica in replica_router.replicas:
+        pools.append(({"pool": f"replica:{replica.name}"}, replica.engine.pool, replica.metrics))
+    return pools
+
+
+def _pool_lines() -> list:
+    pools = _pools()
+    lines = render_metric(
+        "db_pool_wait_seconds", "histogram", "Time checkouts waited for a free connection.",
+        [(labels, metrics.wait_histogram) for labels, _, metrics in pools],
+    )
+    lines += render_metric(
+        "db_pool_checked_out", "gauge", "Connections currently checked out.",
+        [(labels, pool.checkedout()) for labels, pool, _ in pools if hasattr(pool, "checkedout")],
+    )
+    lines += render_metric("db_pool_checkouts_total", "counter", "Connection checkouts.", [(labels, metrics.checkouts) for labels, _, metrics in pools])
+    lines += render_metric("db_pool_timeouts_total", "counter", "Checkouts that timed out waiting.", [(labels, metrics.timeouts) for labels, _, metrics in pools])
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Query latency histograms by SQL fingerprint, rows, errors, slow queries,
+    pool waits and N+1 detections in the Prometheus text format.
+    """
+    try:
+        lines = query_metrics.prometheus_lines() + _pool_lines()
+        return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
+    except Exception as e:
+        log_exception(e, "Error rendering metrics.")
+        raise HTTPException(status_code=500, detail="Error rendering metrics.")
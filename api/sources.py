@@ -1,38 +1,123 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
+from app.config import settings
+from app.modules.source_geo import (
+    find_sources_near,
+    find_sources_within,
+    latest_articles_for_sources,
+    source_geo_index,
+    source_geohash,
+)
 from app.utilities.database import execute_query
+from app.utilities.geohash import decode, encode
 from app.utilities.validation import is_valid_url, sanitize_input
+from app.utilities.response_cache import cached_response, invalidate_tags
 
 router = APIRouter(prefix="/sources", tags=["Sources"])
 
+# Columns that only change on real source writes (add, discovery, status); the
+# fetch, circuit and poll bookkeeping columns would make cached listings stale
+# after every ingestion cycle
+LISTED_COLUMNS = "id, name, website, status, reliability_score, discovered_by, discovery_timestamp, latitude, longitude"
+
 @router.get("/")
+@cached_response("sources.list", tags=["sources"])
 async def list_sources():
     """
     List all active sources, ordered by reliability score.
     """
-    query = "SELECT * FROM news_sources WHERE status = 'active' ORDER BY reliability_score DESC"
+    query = f"SELECT {LISTED_COLUMNS} FROM news_sources WHERE status = 'active' ORDER BY reliability_score DESC"
     try:
         result = execute_query(query)
         return {"sources": result["data"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing sources: {str(e)}")
 
+def _nearby_cache_params(params: dict) -> dict:
+    # Every point in the same geohash cell shares one cached response
+    return {
+        "cell": encode(params["lat"], params["lon"], settings.GEO_CACHE_PRECISION),
+        "radius_km": params["radius_km"],
+        "limit": params["limit"],
+        "articles": params["articles"],
+    }
+
+@router.get("/nearby")
+@cached_response("sources.nearby", tags=["sources", "articles"], key_params=_nearby_cache_params)
+async def nearby_sources(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(default=25.0, gt=0),
+    limit: int = Query(default=50, ge=1, le=200),
+    articles: int = Query(default=20, ge=0, le=100),
+):
+    """
+    Active sources within ``radius_km`` of a point, nearest first, with the
+    latest articles across them.
+
+    The point is snapped to the center of its geohash cell (``GEO_CACHE_PRECISION``)
+    so nearby clients share cached results.
+    """
+    radius_km = min(radius_km, settings.GEO_MAX_RADIUS_KM)
+    center_lat, center_lon = decode(encode(lat, lon, settings.GEO_CACHE_PRECISION))
+    try:
+        sources = find_sources_near(center_lat, center_lon, radius_km, limit=limit)
+        latest = latest_articles_for_sources([source["id"] for source in sources], limit=articles)
+        return {"center": {"lat": center_lat, "lon": center_lon}, "radius_km": radius_km, "sources": sources, "articles": latest}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error finding nearby sources: {str(e)}")
+
+@router.get("/within")
+@cached_response("sources.within", tags=["sources", "articles"])
+async def sources_within(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lon: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lon: float = Query(..., ge=-180, le=180),
+    limit: int = Query(default=50, ge=1, le=200),
+    articles: int = Query(default=20, ge=0, le=100),
+):
+    """
+    Active sources inside a bounding box, with the latest articles across them.
+    """
+    if min_lat > max_lat or min_lon > max_lon:
+        raise HTTPException(status_code=400, detail="Bounding box minimums must not exceed its maximums.")
+    try:
+        sources = find_sources_within(min_lat, min_lon, max_lat, max_lon, limit=limit)
+        latest = latest_articles_for_sources([source["id"] for source in sources], limit=articles)
+        return {"sources": sources, "articles": latest}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error finding sources in area: {str(e)}")
+
 @router.post("/")
-async def add_source(name: str, website: str):
+async def add_source(
+    name: str,
+    website: str,
+    latitude: float = Query(default=None, ge=-90, le=90),
+    longitude: float = Query(default=None, ge=-180, le=180),
+):
     """
-    Add a new news source.
+    Add a new news source, optionally with its coordinates.
     """
     if not is_valid_url(website):
         raise HTTPException(status_code=400, detail="Invalid website URL.")
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(status_code=400, detail="Provide both latitude and longitude, or neither.")
 
     query = """
-        INSERT INTO news_sources (name, website, status, reliability_score, discovered_by, discovery_timestamp)
-        VALUES (%s, %s, 'pending', 0, 'Manual', NOW())
+        INSERT INTO news_sources (name, website, status, reliability_score, discovered_by, discovery_timestamp,
+                                  latitude, longitude, geohash)
+        VALUES (%s, %s, 'pending', 0, 'Manual', NOW(), %s, %s, %s)
     """
     try:
         execute_query(query, (
             sanitize_input(name),
-            sanitize_input(website)
+            sanitize_input(website),
+            latitude,
+            longitude,
+            source_geohash(latitude, longitude),
         ))
+        invalidate_tags("sources")
+        source_geo_index.invalidate()
         return {"message": "Source added successfully."}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error adding source: {str(e)}")
@@ -2,9 +2,15 @@ from fastapi import APIRouter, HTTPException, Query
 from app.modules.weather import fetch_weather
 from app.modules.emergency_alerts import fetch_emergency_alerts
 from app.modules.source_discovery import validate_sources
-from app.modules.feedback import analyze_feedback_trends
-from app.modules.market_data import fetch_market_items
-from app.modules.content_aggregation import aggregate_articles
+from app.modules.circuit_breaker import get_circuit_states
+from app.modules.feedback import analyze_feedback_trends_async, feedback_buffer
+from app.modules.market_data import fetch_market_items_async
+from app.modules.content_aggregation import aggregate_articles_async
+from app.modules.seen_urls import seen_url_filter
+from app.modules import ingestion_pipeline
+from app.utilities.async_database import async_pool_status
+from app.utilities.database import explain_slow_query, pool_status, replica_router
+from app.utilities.query_metrics import query_metrics
 from app.utilities.logging import log_event, log_exception
 from app.config import settings
 
@@ -49,13 +55,26 @@ async def transparency_validate_sources():
         log_exception(e, "Error during source validation.")
         raise HTTPException(status_code=500, detail="Error validating sources.")
 
+@router.get("/sources/circuits")
+async def transparency_source_circuits():
+    """
+    Report each source's circuit breaker state, consecutive failures and average fetch latency.
+    """
+    try:
+        circuits = get_circuit_states()
+        log_event("TRANSPARENCY", "Source circuit states fetched successfully.")
+        return {"circuits": circuits}
+    except Exception as e:
+        log_exception(e, "Error fetching source circuit states.")
+        raise HTTPException(status_code=500, detail="Error fetching source circuit states.")
+
 @router.get("/feedback/trends")
 async def transparency_feedback_trends():
     """
     Fetch feedback trends for transparency panel.
     """
     try:
-        trends = analyze_feedback_trends()
+        trends = await analyze_feedback_trends_async()
         log_event("TRANSPARENCY", "Feedback trends fetched successfully.")
         return {"trends": trends}
     except Exception as e:
@@ -68,7 +87,7 @@ async def transparency_market_data(skip: int = Query(default=0), limit: int = Qu
     Fetch market data (e.g., classifieds, items for sale) for transparency panel.
     """
     try:
-        items = fetch_market_items(skip=skip, limit=limit, region=region)
+        items = await fetch_market_items_async(skip=skip, limit=limit, region=region)
         log_event("TRANSPARENCY", f"Market data fetched for region: {region}")
         return {"region": region, "items": items}
     except Exception as e:
@@ -81,13 +100,95 @@ async def transparency_articles():
     Trigger article aggregation for transparency panel.
     """
     try:
-        aggregate_articles()
+        await aggregate_articles_async()
         log_event("TRANSPARENCY", "Articles aggregated successfully.")
         return {"message": "Articles aggregated successfully."}
     except Exception as e:
         log_exception(e, "Error aggregating articles.")
         raise HTTPException(status_code=500, detail="Error aggregating articles.")
 
+@router.get("/articles/seen-urls")
+async def transparency_seen_urls():
+    """
+    Report the seen-URL filter's size, memory footprint and false-positive rate.
+    """
+    try:
+        stats = seen_url_filter.stats()
+        log_event("TRANSPARENCY", "Seen-URL filter stats fetched successfully.")
+        return {"seen_urls": stats}
+    except Exception as e:
+        log_exception(e, "Error fetching seen-URL filter stats.")
+        raise HTTPException(status_code=500, detail="Error fetching seen-URL filter stats.")
+
+@router.get("/articles/pipeline")
+async def transparency_ingestion_pipeline():
+    """
+    Report per-stage throughput and queue-depth metrics from the last ingestion run.
+    """
+    try:
+        metrics = ingestion_pipeline.last_run_metrics
+        log_event("TRANSPARENCY", "Ingestion pipeline metrics fetched successfully.")
+        return {"pipeline": metrics}
+    except Exception as e:
+        log_exception(e, "Error fetching ingestion pipeline metrics.")
+        raise HTTPException(status_code=500, detail="Error fetching ingestion pipeline metrics.")
+
+@router.get("/feedback/buffer")
+async def transparency_feedback_buffer():
+    """
+    Report the feedback write-behind buffer's backlog, batch sizes and flush latency.
+    """
+    try:
+        stats = feedback_buffer.stats()
+        log_event("TRANSPARENCY", "Feedback buffer stats fetched successfully.")
+        return {"feedback_buffer": stats}
+    except Exception as e:
+        log_exception(e, "Error fetching feedback buffer stats.")
+        raise HTTPException(status_code=500, detail="Error fetching feedback buffer stats.")
+
+@router.get("/database/pool")
+async def transparency_database_pool():
+    """
+    Report occupancy, checkout counts, wait times and timeouts of the sync and async connection pools, and read replica health and lag.
+    """
+    try:
+        status, async_status = pool_status(), async_pool_status()
+        log_event("TRANSPARENCY", "Database pool status fetched successfully.")
+        return {"database_pool": status, "async_database_pool": async_status, "read_replicas": replica_router.status()}
+    except Exception as e:
+        log_exception(e, "Error fetching database pool status.")
+        raise HTTPException(status_code=500, detail="Error fetching database pool status.")
+
+@router.get("/database/slow-queries")
+async def transparency_slow_queries(limit: int = Query(default=50, ge=1, le=500)):
+    """
+    List the latest statements slower than SLOW_QUERY_THRESHOLD_MS, newest first, by normalized fingerprint.
+    """
+    try:
+        slow_queries = query_metrics.recent_slow_queries(limit)
+        log_event("TRANSPARENCY", f"Fetched {len(slow_queries)} slow queries.")
+        return {"threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS, "slow_queries": slow_queries}
+    except Exception as e:
+        log_exception(e, "Error fetching slow queries.")
+        raise HTTPException(status_code=500, detail="Error fetching slow queries.")
+
+@router.get("/database/slow-queries/{fingerprint_id}/explain")
+async def transparency_explain_slow_query(fingerprint_id: str, analyze: bool = Query(default=False)):
+    """
+    EXPLAIN the latest slow execution of a fingerprint; ``analyze`` runs it again for actual timings (reads only).
+    """
+    try:
+        explained = explain_slow_query(fingerprint_id, analyze=analyze)
+        log_event("TRANSPARENCY", f"Explained slow query {fingerprint_id}.")
+        return explained
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        log_exception(e, f"Error explaining slow query {fingerprint_id}.")
+        raise HTTPException(status_code=500, detail="Error explaining slow query.")
+
 @router.get("/config")
 async def transparency_config():
     """
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from app.utilities.database import execute_query
+from app.modules.preferences import get_user_feed
 from app.utilities.security import hash_password, verify_password, create_access_token
 from app.utilities.validation import is_valid_email, is_strong_password, sanitize_input
 from datetime import timedelta
@@ -50,3 +51,17 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error during login: {str(e)}")
 
+
+@router.get("/{user_id}/feed")
+async def read_user_feed(user_id: int, skip: int = 0, limit: int = 20):
+    """
+    Page through a user's personalized feed, best first.
+
+    The feed is ranked ahead of time from the user's preferences and feedback
+    and kept in a Redis sorted set, so reading a page does no ranking.
+    """
+    limit = max(1, min(limit, 100))
+    try:
+        return {"user_id": user_id, "articles": get_user_feed(user_id, skip=skip, limit=limit)}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching feed: {str(e)}")
@@ -10,9 +10,127 @@ class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str
 
+    # Database pool settings
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # How long a checkout waits for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections older than this, before server or proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 500  # Compiled statements per engine, prepared statements per connection
+    DB_PREPARED_STATEMENTS: bool = False  # Server-side PREPARE for raw SQL; not for PgBouncer transaction pooling
+    DB_EXECUTEMANY_PAGE_SIZE: int = 1000
+    READ_REPLICA_URLS: list[str] = []  # Replicas for lag-tolerant reads; empty sends every read to the primary
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Replicas further behind are skipped until they catch up
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 10.0
+    REPLICA_CONNECT_TIMEOUT_SECONDS: int = 3
+    ASYNC_DATABASE_URL: str = ""  # Defaults to DATABASE_URL with its async driver (asyncpg)
+    ASYNC_DB_POOL_SIZE: int = 20  # Async endpoints can have this many queries in flight per worker, plus overflow
+    ASYNC_DB_MAX_OVERFLOW: int = 30
+
+    # Query instrumentation settings
+    QUERY_METRICS_ENABLED: bool = True
+    QUERY_METRICS_MAX_FINGERPRINTS: int = 500  # Statement shapes tracked per database; the rest count as "other"
+    SLOW_QUERY_THRESHOLD_MS: float = 500.0  # Slower statements are logged and kept for EXPLAIN
+    SLOW_QUERY_LOG_SIZE: int = 100
+    N_PLUS_ONE_THRESHOLD: int = 10  # Flag requests that run one statement shape at least this many times
+
     # Redis settings
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # Feed fetching settings
+    FEED_FETCH_MAX_CONCURRENCY: int = 50
+    FEED_FETCH_PER_HOST_LIMIT: int = 4
+    FEED_FETCH_TIMEOUT_SECONDS: float = 15.0
+    FEED_FETCH_USER_AGENT: str = "rTNA-FeedFetcher/1.0"
+    FEED_PARSE_PROCESSES: int = 0  # 0 parses every feed in-process
+    FEED_PARSE_OFFLOAD_BYTES: int = 262144
+    FEED_PARSE_TIMEOUT_SECONDS: float = 30.0
+
+    # Ingestion settings
+    ARTICLE_WRITE_BATCH_SIZE: int = 500
+    SEEN_URL_FILTER_ENABLED: bool = True
+    SEEN_URL_FILTER_CAPACITY: int = 2000000
+    SEEN_URL_FILTER_ERROR_RATE: float = 0.001
+    SEEN_URL_FILTER_BACKEND: str = "none"  # "none", "disk" or "redis"
+    SEEN_URL_FILTER_PATH: str = "data/seen_urls.bloom"
+    NEAR_DUP_MAX_DISTANCE: int = 3  # Max differing SimHash bits for two articles to share a cluster
+    NEAR_DUP_INDEX_CAPACITY: int = 200000
+    NEAR_DUP_MAX_TOKENS: int = 64  # Words fingerprinted per article: the title, then the start of the summary
+    NEAR_DUP_MIN_FEATURES: int = 8  # Shorter texts are too generic to cluster and get no cluster ID
+    INGEST_QUEUE_SIZE: int = 100
+    INGEST_FETCH_WORKERS: int = 50
+    INGEST_PARSE_WORKERS: int = 4
+    INGEST_NORMALIZE_WORKERS: int = 1
+    INGEST_WRITE_WORKERS: int = 2
+    INGEST_WRITE_FLUSH_SECONDS: float = 1.0
+
+    # Adaptive polling settings
+    POLL_MIN_INTERVAL_SECONDS: int = 300
+    POLL_MAX_INTERVAL_SECONDS: int = 21600
+    POLL_DEFAULT_INTERVAL_SECONDS: int = 3600
+    POLL_CADENCE_FACTOR: float = 0.5  # Poll interval as a fraction of the typical gap between articles
+    POLL_HISTORY_SIZE: int = 20
+    POLL_DISPATCH_INTERVAL_SECONDS: float = 60.0
+    POLL_DISPATCH_BATCH_SIZE: int = 100
+
+    # Source circuit breaker settings
+    CIRCUIT_FAILURE_THRESHOLD: int = 3
+    CIRCUIT_BASE_RETRY_SECONDS: int = 600
+    CIRCUIT_MAX_RETRY_SECONDS: int = 86400
+    CIRCUIT_LATENCY_EWMA_ALPHA: float = 0.3
+
+    # Article listing and search settings
+    SEARCH_BACKEND: str = "auto"  # "auto", "postgres" or "memory"; auto picks postgres for Postgres databases
+    SEARCH_TEXT_CONFIG: str = "english"
+    SEARCH_MAX_PAGE_SIZE: int = 100
+    ARTICLE_SNIPPET_LENGTH: int = 200
+    EXPORT_FETCH_SIZE: int = 2000  # Rows per server-side cursor fetch in /articles/export
+
+    # Geo settings
+    GEO_BACKEND: str = "auto"  # "auto", "postgres" or "memory"; auto picks postgres for Postgres databases
+    GEO_INDEX_PRECISION: int = 5  # In-process grid cells of about 5 km x 5 km
+    GEO_INDEX_REFRESH_SECONDS: int = 300
+    GEO_CACHE_PRECISION: int = 6  # Nearby queries are snapped to cells of about 1.2 km x 0.6 km
+    GEO_MAX_RADIUS_KM: float = 200.0
+
+    # Personalized feed settings
+    FEED_ENABLED: bool = True
+    FEED_SIZE: int = 500  # Articles kept in each user's materialized feed
+    FEED_HALF_LIFE_HOURS: float = 12.0
+    FEED_CANDIDATE_HOURS: int = 72
+    FEED_CANDIDATE_LIMIT: int = 5000
+    FEED_ACTIVE_DAYS: int = 7  # Users who read their feed within this window get new articles pushed
+    FEED_REFRESH_INTERVAL_SECONDS: float = 60.0
+
+    # Trending settings
+    TRENDING_HALF_LIFE_HOURS: float = 2.0
+    TRENDING_MIN_SCORE: float = 0.01  # Articles whose decayed score drops below this leave the trending set
+    TRENDING_MAX_ITEMS: int = 10000
+    TRENDING_REBUILD_HALF_LIVES: int = 12  # Feedback window replayed when the set is rebuilt
+    TRENDING_MAINTENANCE_INTERVAL_SECONDS: float = 300.0
+
+    # Feedback write-behind settings
+    FEEDBACK_BUFFER_MODE: str = "redis"  # "redis" stream, "spool" file or "off" for synchronous inserts
+    FEEDBACK_BUFFER_BATCH_SIZE: int = 500
+    FEEDBACK_BUFFER_FLUSH_SECONDS: float = 1.0
+    FEEDBACK_BUFFER_SPOOL_DIR: str = "data/feedback_spool"
+    FEEDBACK_BUFFER_FSYNC: bool = True  # fsync each spooled event; off trades crash safety for throughput
+    FEEDBACK_BUFFER_CLAIM_IDLE_SECONDS: float = 60.0  # Stream entries unacknowledged this long are taken over
+
+    # Partitioning and archival settings
+    PARTITION_PREMAKE_MONTHS: int = 3  # Monthly partitions created ahead of the current month
+    ARTICLE_RETENTION_MONTHS: int = 12  # Older article partitions are archived to Parquet and dropped
+    FEEDBACK_RETENTION_MONTHS: int = 24
+    PARTITION_ARCHIVE_DIR: str = "data/archive"
+    PARTITION_ARCHIVE_BATCH_ROWS: int = 50000
+    PARTITION_LOCK_TIMEOUT_MS: int = 5000  # A detach waiting longer for its lock gives up until the next run
+    PARTITION_MAINTENANCE_INTERVAL_SECONDS: float = 21600.0
+
+    # Response cache settings
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    HTTP_CACHE_MAX_AGE_SECONDS: int = 5  # Client-side freshness before revalidating with If-None-Match
+
     # CORS settings
     ALLOWED_ORIGINS: list[str] = ["*"]
 
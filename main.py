@@ -1,14 +1,39 @@
 from fastapi import FastAPI, HTTPException
 from app.modules.source_discovery import discover_sources, validate_sources
-from app.modules.content_aggregation import aggregate_articles
-from app.modules.feedback import analyze_feedback_trends
+from app.modules.content_aggregation import aggregate_articles_async
+from app.modules.feed_fetcher import feed_fetcher
+from app.modules.seen_urls import seen_url_filter
+from app.modules.feed_parsing import shutdown_parse_pool
+from app.config import settings
+from app.modules.feedback import analyze_feedback_trends_async, feedback_buffer
 from app.modules.preferences import update_user_preferences
 from app.modules.emergency_alerts import fetch_emergency_alerts
 from app.utilities.logging import log_event, log_exception
+from app.utilities.middleware import QueryStatsMiddleware, ReadYourWritesMiddleware
+from app.api.metrics import router as metrics_router
 
 app = FastAPI()
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(health_router)
+app.include_router(metrics_router)
+
+@app.on_event("startup")
+async def startup_event():
+    """Open the shared feed fetcher's HTTP connection pool, warm the seen-URL filter and start the feedback buffer."""
+    await feed_fetcher.connect()
+    feedback_buffer.start()
+    if settings.SEEN_URL_FILTER_ENABLED:
+        seen_url_filter.ensure_warm()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared feed fetcher's HTTP connection pool, stop the parse pool, persist the seen-URL filter and flush the feedback buffer."""
+    await feed_fetcher.disconnect()
+    shutdown_parse_pool()
+    seen_url_filter.persist()
+    feedback_buffer.stop()
 
 @app.post("/sources/refresh")
 async def refresh_sources():
@@ -18,7 +43,7 @@ async def refresh_sources():
     try:
         log_event("API_CALL", "Triggering source discovery and article aggregation.")
         discover_sources()
-        aggregate_articles()
+        await aggregate_articles_async()
         return {"status": "success", "message": "Sources and articles refreshed successfully."}
     except Exception as e:
         log_exception(e, "Error in source refresh process.")
@@ -57,7 +82,7 @@ async def get_feedback_analysis():
     """
     try:
         log_event("API_CALL", "Fetching feedback analysis.")
-        trends = analyze_feedback_trends()
+        trends = await analyze_feedback_trends_async()
         return {"status": "success", "trends": trends}
     except Exception as e:
         log_exception(e, "Error analyzing feedback trends.")
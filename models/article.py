@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 from app.utilities.database import Base
 from datetime import datetime
@@ -9,10 +9,20 @@ class Article(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     content = Column(Text, nullable=False)
-    url = Column(String, unique=True, nullable=False)
+    url = Column(String, nullable=False)  # Unique through article_urls, across partitions
     published_at = Column(DateTime, nullable=False)
     fetched_at = Column(DateTime, default=datetime.utcnow)
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=False)
     source = relationship("Source", back_populates="articles")
     keywords = Column(String, nullable=True)  # Added for SEO and search functionality
+    simhash = Column(BigInteger, nullable=True)  # Near-duplicate fingerprint of title and summary
+    cluster_id = Column(BigInteger, nullable=True)  # Shared by syndicated copies of the same story
 
+
+class ArticleUrl(Base):
+    """Every URL ever stored in ``articles``, kept after its partition is archived so it is not ingested again."""
+    __tablename__ = "article_urls"
+
+    url = Column(String, primary_key=True)
+    article_id = Column(BigInteger, nullable=False)
+    published_at = Column(DateTime, nullable=False)  # Partition key of the article row
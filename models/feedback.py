@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
 from app.utilities.database import Base
 from datetime import datetime
 
@@ -10,5 +10,28 @@ class Feedback(Base):
     feedback_type = Column(String, nullable=False)  # "like", "dislike", "flag", etc.
     user_id = Column(Integer, ForeignKey("users.id"))
     impact_score = Column(Integer, nullable=False, default=1)  # Adjusted to include default
-    timestamp = Column(DateTime, default=datetime.utcnow)
+    timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)  # Monthly partition key
 
+
+class FeedbackTypeRollup(Base):
+    __tablename__ = "feedback_type_rollup"
+
+    feedback_type = Column(String, primary_key=True)
+    feedback_count = Column(BigInteger, nullable=False, default=0)
+    total_impact = Column(BigInteger, nullable=False, default=0)
+
+class FeedbackContentRollup(Base):
+    __tablename__ = "feedback_content_rollup"
+
+    content_id = Column(Integer, primary_key=True)
+    feedback_type = Column(String, primary_key=True)
+    feedback_count = Column(BigInteger, nullable=False, default=0)
+    total_impact = Column(BigInteger, nullable=False, default=0)
+
+class FeedbackHourlyRollup(Base):
+    __tablename__ = "feedback_hourly_rollup"
+
+    bucket = Column(DateTime, primary_key=True)  # Start of the hour
+    feedback_type = Column(String, primary_key=True)
+    feedback_count = Column(BigInteger, nullable=False, default=0)
+    total_impact = Column(BigInteger, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, Float, DateTime
 from sqlalchemy.orm import relationship
 from app.utilities.database import Base
 from datetime import datetime
@@ -9,8 +9,9 @@ class Source(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     website = Column(String, unique=True, nullable=False)
-    latitude = Column(String)  # Lat/Long for location-based news aggregation
-    longitude = Column(String)
+    latitude = Column(Float)  # Lat/Long for location-based news aggregation
+    longitude = Column(Float)
+    geohash = Column(String(12), index=True)  # Derived from lat/long for prefix (cell) lookups
     reliability_score = Column(Integer, default=0)
     discovered_by = Column(String, nullable=False)  # E.g., "Manual", "Crawler"
     discovery_timestamp = Column(DateTime, default=datetime.utcnow)
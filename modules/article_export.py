@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import orjson
+
+from app.config import settings
+from app.modules.article_projection import ARTICLE_FIELDS, finalize_rows, select_clause
+from app.utilities.database import engine
+from app.utilities.logging import get_logger, log_event, log_exception
+
+logger = get_logger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+# Everything stored on an article; the source name (a join) and snippet can be requested explicitly
+EXPORT_FIELDS = tuple(field for field in ARTICLE_FIELDS if field not in ("source", "snippet"))
+
+
+def iter_article_batches(fields: tuple = EXPORT_FIELDS, source_ids=None, since=None, until=None, after_id: int = 0, fetch_size: int = settings.EXPORT_FETCH_SIZE):
+    """
+    Stream articles in ID order through a server-side cursor.
+
+    With ``stream_results`` the psycopg2 dialect declares a named cursor, so
+    Postgres holds the result set and each batch is a ``FETCH FORWARD`` of
+    ``fetch_size`` rows; memory stays flat however many rows match.
+
+    Args:
+        fields (tuple): Article fields to export.
+        source_ids (list): Only export articles from these sources.
+        since (datetime): Only export articles published at or after this time.
+        until (datetime): Only export articles published before this time.
+        after_id (int): Resume after this article ID.
+        fetch_size (int): Rows fetched per round-trip.
+
+    Yields:
+        list: Batches of up to ``fetch_size`` article dicts.
+    """
+    columns, from_sql = select_clause(fields)
+    conditions, params = ["a.id > %s"], [after_id]
+    if source_ids:
+        conditions.append("a.source_id = ANY(%s)")
+        params.append(list(source_ids))
+    if since is not None:
+        conditions.append("a.published_at >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("a.published_at < %s")
+        params.append(until)
+    query = f"SELECT {columns} FROM {from_sql} WHERE {' AND '.join(conditions)} ORDER BY a.id"
+
+    exported = 0
+    try:
+        with engine.connect() as connection:
+            result = connection.execution_options(stream_results=True, max_row_buffer=fetch_size).exec_driver_sql(query, tuple(params))
+            for partition in result.mappings().partitions(fetch_size):
+                batch = finalize_rows([dict(row) for row in partition], fields)
+                exported += len(batch)
+                yield batch
+    except Exception as e:
+        # The response status is already sent, so the client sees a truncated stream
+        log_exception(logger, e, "Article export failed", exported=exported)
+        raise
+    log_event(logger, "EXPORT", f"Exported {exported} articles.")
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def iter_ndjson(batches):
+    """Encode article batches as newline-delimited JSON, one chunk per batch."""
+    for batch in batches:
+        yield b"".join(orjson.dumps(row, default=_default) + b"\n" for row in batch)
+
+
+def iter_csv(batches, fields: tuple):
+    """Encode article batches as CSV with a header row, one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for batch in batches:
+        for row in batch:
+            writer.writerow([_csv_value(row.get(field)) for field in fields])
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
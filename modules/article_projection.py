@@ -0,0 +1,67 @@
+from app.config import settings
+from app.utilities.general import make_snippet
+
+# Selectable article fields and the SQL producing each, relative to
+# ``articles a`` (and ``news_sources s`` for the source name).
+ARTICLE_FIELDS = {
+    "id": "a.id",
+    "title": "a.title",
+    "url": "a.url",
+    "source_id": "a.source_id",
+    "source": "s.name",
+    "published_at": "a.published_at",
+    "fetched_at": "a.fetched_at",
+    "snippet": f"SUBSTR(a.content, 1, {settings.ARTICLE_SNIPPET_LENGTH * 4})",
+    "content": "a.content",
+    "keywords": "a.keywords",
+    "cluster_id": "a.cluster_id",
+    "transparency_metadata": "a.transparency_metadata",
+}
+
+SUMMARY_FIELDS = ("id", "title", "url", "source_id", "source", "published_at", "snippet")
+DETAIL_FIELDS = tuple(field for field in ARTICLE_FIELDS if field != "content")
+
+
+def parse_fields(fields: str = None, default: tuple = SUMMARY_FIELDS, required: tuple = ("id",)) -> tuple:
+    """
+    Resolve a comma-separated ``fields=`` selector into field names.
+
+    Args:
+        fields (str): The selector, or None for ``default``.
+        default (tuple): Fields returned when no selector is given.
+        required (tuple): Fields always included, e.g. the keys a cursor is built from.
+
+    Raises:
+        ValueError: If an unknown field is requested.
+    """
+    if not fields:
+        names = list(default)
+    else:
+        names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+        unknown = [name for name in names if name not in ARTICLE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. Valid fields: {', '.join(ARTICLE_FIELDS)}")
+    return tuple([name for name in required if name not in names] + names)
+
+
+def select_clause(fields: tuple) -> tuple:
+    """
+    Build the select list and FROM clause for ``fields``.
+
+    Returns:
+        tuple: ``(columns_sql, from_sql)``; the sources table is only joined
+        when the source name is requested.
+    """
+    columns = ", ".join(f"{ARTICLE_FIELDS[name]} AS {name}" for name in fields)
+    from_sql = "articles a"
+    if "source" in fields:
+        from_sql += " LEFT JOIN news_sources s ON s.id = a.source_id"
+    return columns, from_sql
+
+
+def finalize_rows(rows: list, fields: tuple) -> list:
+    """Turn the raw content prefix selected for ``snippet`` into a clean, truncated snippet."""
+    if "snippet" in fields:
+        for row in rows:
+            row["snippet"] = make_snippet(row["snippet"], settings.ARTICLE_SNIPPET_LENGTH)
+    return rows
@@ -0,0 +1,169 @@
+import threading
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.utilities.database import engine, execute_query
+from app.utilities.logging import get_logger, log_event
+from app.utilities.search_index import InvertedIndex
+
+logger = get_logger(__name__)
+
+POSTGRES = "postgres"
+MEMORY = "memory"
+CATCH_UP_CHUNK_SIZE = 5000
+# Bound parameters rather than execute_query's %s, so the query runs on SQLite, the backend this index exists for
+CATCH_UP_QUERY = text(
+    """
+    SELECT id, title, content, url, source_id, published_at FROM articles
+    WHERE id > :last_id ORDER BY id LIMIT :limit
+    """
+)
+SORT_ORDERS = ("relevance", "recent")
+
+
+def search_backend() -> str:
+    """The configured search backend, resolving ``auto`` from ``DATABASE_URL``."""
+    if settings.SEARCH_BACKEND != "auto":
+        return settings.SEARCH_BACKEND
+    return POSTGRES if settings.DATABASE_URL.startswith("postgres") else MEMORY
+
+
+def search_vector_sql(title: str = "%s", content: str = "%s") -> str:
+    """
+    SQL expression building an article's ``search_vector`` from its title and content.
+
+    Title terms are weighted above body terms. The arguments are the SQL to
+    substitute for each field: placeholders by default, or column names.
+    """
+    config = f"'{settings.SEARCH_TEXT_CONFIG}'::regconfig"
+    return (
+        f"setweight(to_tsvector({config}, COALESCE({title}, '')), 'A') || "
+        f"setweight(to_tsvector({config}, COALESCE({content}, '')), 'B')"
+    )
+
+
+class ArticleSearchIndex:
+    """
+    In-process BM25 index over article titles and content, for SQLite and dev
+    setups without Postgres full-text search.
+
+    The index is built from the ``articles`` table on first use and catches up
+    on rows with a higher ID before every search, so articles written by the
+    Celery workers become searchable without a restart.
+    """
+
+    def __init__(self):
+        self.index = InvertedIndex()
+        self.last_id = 0
+        self._lock = threading.Lock()
+
+    def catch_up(self):
+        with self._lock:
+            added = 0
+            while True:
+                with engine.connect() as connection:
+                    result = connection.execute(CATCH_UP_QUERY, {"last_id": self.last_id, "limit": CATCH_UP_CHUNK_SIZE})
+                    rows = [dict(row) for row in result.mappings()]
+                for row in rows:
+                    self.index.add(
+                        row["id"],
+                        row["title"],
+                        row["content"],
+                        {
+                            "id": row["id"],
+                            "title": row["title"],
+                            "url": row["url"],
+                            "source_id": row["source_id"],
+                            "published_at": _as_datetime(row["published_at"]),
+                        },
+                    )
+                added += len(rows)
+                if rows:
+                    self.last_id = rows[-1]["id"]
+                if len(rows) < CATCH_UP_CHUNK_SIZE:
+                    break
+            if added:
+                log_event(logger, "SEARCH", f"Indexed {added} articles; {len(self.index)} searchable in memory.")
+
+    def search(self, query: str, source_ids=None, since=None, until=None, sort="relevance", limit=10, skip=0) -> list:
+        self.catch_up()
+        sources = set(source_ids) if source_ids else None
+
+        def predicate(metadata):
+            published_at = metadata["published_at"]
+            return (
+                (sources is None or metadata["source_id"] in sources)
+                and (since is None or (published_at is not None and published_at >= since))
+                and (until is None or (published_at is not None and published_at < until))
+            )
+
+        if sort == "recent":
+            matches = self.index.search(query, limit=len(self.index), predicate=predicate)
+            matches.sort(key=lambda match: (match[2]["published_at"] or datetime.min, match[0]), reverse=True)
+            matches = matches[skip:skip + limit]
+        else:
+            matches = self.index.search(query, limit=limit, offset=skip, predicate=predicate)
+        return [dict(metadata, rank=round(score, 6)) for _, score, metadata in matches]
+
+
+def _as_datetime(value):
+    # SQLite hands timestamps back as strings
+    return datetime.fromisoformat(str(value)) if value is not None and not isinstance(value, datetime) else value
+
+
+def _search_postgres(query: str, source_ids, since, until, sort, limit, skip) -> list:
+    conditions = ["a.search_vector @@ q"]
+    params = [settings.SEARCH_TEXT_CONFIG, query]
+    if source_ids:
+        conditions.append("a.source_id = ANY(%s)")
+        params.append(list(source_ids))
+    if since is not None:
+        conditions.append("a.published_at >= %s")
+        params.append(since)
+    if until is not None:
+        conditions.append("a.published_at < %s")
+        params.append(until)
+    order = "rank DESC, a.id DESC" if sort == "relevance" else "a.published_at DESC, a.id DESC"
+    sql = f"""
+        SELECT a.id, a.title, a.url, a.source_id, a.published_at,
+               ts_rank_cd(a.search_vector, q) AS rank
+        FROM articles a, websearch_to_tsquery(%s::regconfig, %s) q
+        WHERE {' AND '.join(conditions)}
+        ORDER BY {order}
+        LIMIT %s OFFSET %s
+    """
+    params.extend([limit, skip])
+    return execute_query(sql, tuple(params), read_only=True)["data"]
+
+
+def search_articles(query: str, source_ids=None, since=None, until=None, sort: str = "relevance", limit: int = 10, skip: int = 0) -> list:
+    """
+    Full-text search over article titles and content.
+
+    Uses the GIN-indexed ``search_vector`` column on Postgres and the
+    in-process BM25 index otherwise.
+
+    Args:
+        query (str): Free-text query; on Postgres it accepts web-search syntax
+            (quoted phrases, ``or``, ``-term``).
+        source_ids (list): Only return articles from these sources.
+        since (datetime): Only return articles published at or after this time.
+        until (datetime): Only return articles published before this time.
+        sort (str): ``relevance`` (default) or ``recent``.
+        limit (int): Page size.
+        skip (int): Number of results to skip.
+
+    Returns:
+        list: Matching articles (id, title, url, source_id, published_at, rank).
+    """
+    if sort not in SORT_ORDERS:
+        raise ValueError(f"Unknown sort order: {sort}")
+    if search_backend() == POSTGRES:
+        return _search_postgres(query, source_ids, since, until, sort, limit, skip)
+    return article_search_index.search(query, source_ids, since, until, sort, limit, skip)
+
+
+# Instantiate a shared in-process search index
+article_search_index = ArticleSearchIndex()
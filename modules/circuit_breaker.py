@@ -0,0 +1,134 @@
+from app.config import settings
+from app.utilities.database import execute_query
+from app.utilities.logging import get_logger, log_event
+from app.utilities.general import handle_error
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+def compute_retry_delay(consecutive_failures: int) -> int:
+    """
+    Seconds to keep a circuit open, doubling for every failure past the threshold.
+    """
+    extra_failures = max(0, consecutive_failures - settings.CIRCUIT_FAILURE_THRESHOLD)
+    delay = settings.CIRCUIT_BASE_RETRY_SECONDS * (2 ** min(extra_failures, 16))
+    return int(min(delay, settings.CIRCUIT_MAX_RETRY_SECONDS))
+
+def next_circuit_state(state: str, consecutive_failures: int, success: bool) -> str:
+    """
+    Transition a circuit after a fetch attempt.
+
+    Args:
+        state (str): Current state (closed, open or half_open).
+        consecutive_failures (int): Failures in a row, including this attempt.
+        success (bool): Whether the attempt succeeded.
+
+    Returns:
+        str: The new state. Any success closes the circuit; a failed half-open
+        probe, or reaching the failure threshold, opens it.
+    """
+    if success:
+        return CLOSED
+    if state == HALF_OPEN or consecutive_failures >= settings.CIRCUIT_FAILURE_THRESHOLD:
+        return OPEN
+    return state or CLOSED
+
+def filter_permitted_sources(sources: list) -> tuple:
+    """
+    Split sources into those that may be fetched and those with an open circuit.
+
+    Open circuits whose retry time has passed are moved to half-open in a
+    single claiming UPDATE, so concurrent runs send only one probe each. The
+    claim also pushes the retry time out, so a probe that never reports back
+    is retried later rather than leaving the circuit stuck half-open.
+
+    Returns:
+        tuple: ``(permitted, blocked)`` lists of source rows.
+    """
+    permitted, not_closed, blocked = [], [], []
+    for source in sources:
+        if (source.get("circuit_state") or CLOSED) == CLOSED:
+            permitted.append(source)
+        else:
+            not_closed.append(source)
+
+    if not_closed:
+        claim_query = """
+            UPDATE news_sources
+            SET circuit_state = %s, circuit_retry_at = NOW() + make_interval(secs => %s)
+            WHERE id = ANY(%s) AND circuit_state <> %s
+              AND (circuit_retry_at IS NULL OR circuit_retry_at <= NOW())
+            RETURNING id
+        """
+        params = (HALF_OPEN, settings.CIRCUIT_BASE_RETRY_SECONDS, [source["id"] for source in not_closed], CLOSED)
+        claimed = {row["id"] for row in execute_query(claim_query, params)["data"]}
+        for source in not_closed:
+            if source["id"] in claimed:
+                source["circuit_state"] = HALF_OPEN
+                permitted.append(source)
+                log_event(logger, "CIRCUIT", "Sending half-open probe", source_id=source["id"])
+            else:
+                blocked.append(source)
+
+    return permitted, blocked
+
+@handle_error
+def record_fetch_result(source: dict, success: bool, latency_seconds: float):
+    """
+    Update a source's failure count, latency average and circuit state.
+
+    Args:
+        source (dict): The source row, including its current circuit columns.
+        success (bool): Whether the fetch succeeded.
+        latency_seconds (float): How long the fetch took.
+    """
+    failures = 0 if success else (source.get("consecutive_failures") or 0) + 1
+    state = next_circuit_state(source.get("circuit_state"), failures, success)
+    retry_delay = compute_retry_delay(failures) if state == OPEN else None
+
+    query = """
+        UPDATE news_sources
+        SET consecutive_failures = %s,
+            circuit_state = %s,
+            circuit_opened_at = CASE
+                WHEN %s = 'open' AND circuit_state = 'closed' THEN NOW()
+                WHEN %s = 'closed' THEN NULL
+                ELSE circuit_opened_at
+            END,
+            circuit_retry_at = NOW() + make_interval(secs => %s),
+            avg_latency_ms = COALESCE(avg_latency_ms * (1 - %s) + %s * %s, %s)
+        WHERE id = %s
+    """
+    latency_ms = latency_seconds * 1000
+    alpha = settings.CIRCUIT_LATENCY_EWMA_ALPHA
+    params = (failures, state, state, state, retry_delay, alpha, latency_ms, alpha, latency_ms, source["id"])
+    execute_query(query, params)
+
+    if state != (source.get("circuit_state") or CLOSED):
+        log_event(
+            logger,
+            "CIRCUIT",
+            f"Circuit for source {source['id']} is now {state}",
+            level="WARNING" if state == OPEN else "INFO",
+            consecutive_failures=failures,
+            retry_in_seconds=retry_delay,
+        )
+
+@handle_error
+def get_circuit_states():
+    """
+    List every source's circuit state, failure count and average latency.
+
+    Returns:
+        list: One row per source, open circuits first.
+    """
+    query = """
+        SELECT id, name, website, circuit_state, consecutive_failures, avg_latency_ms,
+               circuit_opened_at, circuit_retry_at
+        FROM news_sources
+        ORDER BY (circuit_state = 'closed'), consecutive_failures DESC, id
+    """
+    return execute_query(query)["data"]
@@ -1,69 +1,272 @@
-from app.utilities.database import execute_query
+from app.config import settings
+from app.utilities.database import engine, execute_query
 from app.utilities.validation import is_valid_url
 from app.utilities.logging import get_logger, log_event, log_exception
 from app.utilities.general import format_datetime, handle_error
-import feedparser
+from app.utilities.response_cache import invalidate_tags
+from app.modules.feed_fetcher import FeedFetcher, feed_fetcher
+from app.modules.seen_urls import seen_url_filter
+from app.modules.ingestion_pipeline import IngestionPipeline, PipelineStage
+from app.modules.feed_parsing import parse_feed, parse_feed_offloaded
+from app.modules.circuit_breaker import filter_permitted_sources, record_fetch_result
+from app.modules.story_clusters import story_cluster_index
+from app.modules.article_search import POSTGRES, search_backend, search_vector_sql
+from app.modules.partitions import partition_window, partitioning_enabled
+import asyncio
+import hashlib
+import json
+import threading
+from collections import Counter
 from datetime import datetime
 
 logger = get_logger(__name__)
 
-@handle_error
-def aggregate_articles():
+class _AggregationRun:
+    """
+    Stage handlers and shared counters for one aggregation run.
+
+    The handlers are wired into an ``IngestionPipeline`` as
+    fetch -> parse -> normalize -> write; parse and write run in worker threads,
+    so counters are updated under a lock.
+
+    A source's HTTP validators and body hash are saved only once every one of
+    its articles has been written or dropped as already seen. If a write
+    fails they are left unchanged, so the next poll fetches and parses the
+    feed again instead of getting a 304 or an "unchanged" hash.
+    """
+
+    COUNTERS = ("total_articles", "articles_inserted", "articles_duplicate", "articles_seen", "feeds_parsed", "feeds_skipped")
+
+    def __init__(self, fetcher: FeedFetcher, sources: list):
+        self.fetcher = fetcher
+        self.sources_by_id = {source["id"]: source for source in sources}
+        self.counts = dict.fromkeys(self.COUNTERS, 0)
+        self.failed_sources = []
+        self.urls_in_run = set()
+        self._pending = {}  # source_id -> articles still to write, whether a write failed, validators to save
+        self._lock = threading.Lock()
+
+    def _add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                self.counts[name] += value
+
+    async def fetch(self, source: dict):
+        return [await self.fetcher.fetch(source["website"], source["id"], source.get("etag"), source.get("last_modified"))]
+
+    def parse(self, response: dict):
+        source_id = response["source_id"]
+        record_fetch_result(self.sources_by_id[source_id], not response["error"], response["elapsed"])
+        if response["error"]:
+            with self._lock:
+                self.failed_sources.append(source_id)
+            return []
+
+        if response["status"] == 304:
+            log_event(logger, "RSS_FETCH", f"Feed not modified: {response['url']}", level="DEBUG", source_id=source_id)
+            self._add(feeds_skipped=1)
+            return []
+
+        articles = []
+        content_hash = hashlib.sha256(response["content"]).hexdigest()
+        if content_hash == self.sources_by_id[source_id].get("content_hash"):
+            log_event(logger, "RSS_FETCH", f"Feed body unchanged: {response['url']}", level="DEBUG", source_id=source_id)
+            self._add(feeds_skipped=1)
+        else:
+            articles = fetch_rss_feed(response["url"], source_id, content=response["content"])
+            if articles is None:
+                # Parse timed out: keep the old validators so the next poll fetches and parses the feed again
+                log_event(logger, "RSS_FETCH", f"Deferring feed to its next poll: {response['url']}", level="WARNING", source_id=source_id)
+                return []
+            self._add(feeds_parsed=1)
+
+        validators = (response["etag"], response["last_modified"], content_hash)
+        if not articles:
+            update_feed_validators(source_id, *validators)
+            return []
+        with self._lock:
+            self._pending[source_id] = {"remaining": len(articles), "failed": False, "validators": validators}
+        return [articles]
+
+    def _settle(self, source_id: int, count: int, failed: bool = False):
+        with self._lock:
+            pending = self._pending.get(source_id)
+            if pending is None:
+                return
+            pending["remaining"] -= count
+            pending["failed"] = pending["failed"] or failed
+            if pending["remaining"] > 0:
+                return
+            del self._pending[source_id]
+        if pending["failed"]:
+            log_event(logger, "RSS_FETCH", "Keeping previous feed validators after a failed write.", level="WARNING", source_id=source_id)
+        else:
+            update_feed_validators(source_id, *pending["validators"])
+
+    def normalize(self, articles: list):
+        with self._lock:
+            unique = []
+            for article in articles:
+                article["title"] = article["title"].strip()
+                if article["url"] not in self.urls_in_run:
+                    self.urls_in_run.add(article["url"])
+                    unique.append(article)
+
+        new_articles = seen_url_filter.filter_new(unique) if settings.SEEN_URL_FILTER_ENABLED else unique
+        self._add(articles_seen=len(unique) - len(new_articles))
+        if articles:
+            self._settle(articles[0]["source_id"], len(articles) - len(new_articles))
+        return new_articles
+
+    def write(self, batch: list):
+        saved = save_articles_to_db(batch, batch_size=len(batch))
+        self._add(
+            total_articles=len(batch),
+            articles_inserted=saved.get("inserted", 0),
+            articles_duplicate=saved.get("duplicates", 0),
+        )
+        failed = "error" in saved or saved.get("failed", 0) > 0
+        for source_id, count in Counter(article["source_id"] for article in batch).items():
+            self._settle(source_id, count, failed)
+        return []
+
+    def pipeline(self) -> IngestionPipeline:
+        return IngestionPipeline(
+            [
+                PipelineStage("fetch", self.fetch, workers=settings.INGEST_FETCH_WORKERS),
+                PipelineStage("parse", self.parse, workers=settings.INGEST_PARSE_WORKERS, blocking=True),
+                PipelineStage("normalize", self.normalize, workers=settings.INGEST_NORMALIZE_WORKERS),
+                PipelineStage(
+                    "write",
+                    self.write,
+                    workers=settings.INGEST_WRITE_WORKERS,
+                    blocking=True,
+                    batch_size=settings.ARTICLE_WRITE_BATCH_SIZE,
+                    flush_seconds=settings.INGEST_WRITE_FLUSH_SECONDS,
+                ),
+            ],
+            queue_size=settings.INGEST_QUEUE_SIZE,
+        )
+
+async def aggregate_articles_async(fetcher: FeedFetcher = feed_fetcher, source_ids: list[int] = None):
     """
-    Aggregate articles from all active sources and save them to the database.
+    Aggregate articles from active sources and save them to the database.
+
+    Sources flow through a staged pipeline (fetch -> parse -> normalize/dedupe ->
+    batch write) connected by bounded queues, so a slow database throttles
+    fetching instead of buffering without limit, and a slow feed never holds up
+    writes for the others.
+
+    Args:
+        fetcher (FeedFetcher): The fetcher to download feeds with.
+        source_ids (list): Restrict the run to these sources (default: all active sources).
     """
-    log_event(logger, "AGGREGATION", "Starting article aggregation.")
+    log_event(logger, "AGGREGATION", "Starting article aggregation.", source_ids=source_ids)
 
-    query = "SELECT id, website FROM news_sources WHERE status = 'active'"
-    sources = execute_query(query)["data"]
+    query = """
+        SELECT id, website, etag, last_modified, content_hash, consecutive_failures, circuit_state
+        FROM news_sources WHERE status = 'active'
+    """
+    if source_ids is not None:
+        sources = execute_query(query + " AND id = ANY(%s)", (list(source_ids),))["data"]
+    else:
+        sources = execute_query(query)["data"]
 
     if not sources:
         log_event(logger, "AGGREGATION", "No active sources available for aggregation.", level="INFO")
         return {"message": "No active sources to aggregate from."}
 
-    total_articles = 0
+    valid_sources = []
     for source in sources:
-        source_id = source["id"]
-        rss_url = source["website"]
-
-        if not is_valid_url(rss_url):
-            log_event(logger, "VALIDATION", f"Skipping invalid RSS URL: {rss_url}", level="WARNING", source_id=source_id)
+        if not is_valid_url(source["website"]):
+            log_event(logger, "VALIDATION", f"Skipping invalid RSS URL: {source['website']}", level="WARNING", source_id=source["id"])
             continue
+        valid_sources.append(source)
 
-        articles = fetch_rss_feed(rss_url, source_id)
-        if articles:
-            save_articles_to_db(articles)
-            total_articles += len(articles)
+    permitted_sources, blocked_sources = filter_permitted_sources(valid_sources)
+    if blocked_sources:
+        log_event(logger, "CIRCUIT", f"Skipping {len(blocked_sources)} sources with open circuits.", level="INFO")
+
+    run = _AggregationRun(fetcher, permitted_sources)
+    pipeline_metrics = await run.pipeline().run(permitted_sources)
 
-    log_event(logger, "AGGREGATION", f"Article aggregation completed. Total articles aggregated: {total_articles}")
-    return {"message": "Article aggregation completed successfully.", "total_articles": total_articles}
+    if settings.SEEN_URL_FILTER_ENABLED:
+        seen_url_filter.persist()
+
+    log_event(
+        logger,
+        "AGGREGATION",
+        f"Article aggregation completed. Total articles aggregated: {run.counts['total_articles']}",
+        feeds_failed=len(run.failed_sources),
+        circuit_open=len(blocked_sources),
+        **{name: value for name, value in run.counts.items() if name != "total_articles"},
+    )
+    return {
+        "message": "Article aggregation completed successfully.",
+        **run.counts,
+        "feeds_failed": len(run.failed_sources),
+        "failed_sources": run.failed_sources,
+        "circuit_open": len(blocked_sources),
+        "circuit_open_sources": [source["id"] for source in blocked_sources],
+        "pipeline": pipeline_metrics,
+    }
 
 @handle_error
-def fetch_rss_feed(rss_url: str, source_id: int):
+def aggregate_articles(source_ids: list[int] = None):
+    """
+    Synchronous entry point for article aggregation (e.g. from Celery).
+
+    Runs ``aggregate_articles_async`` on a fresh event loop with its own fetcher,
+    since the shared client cannot outlive the loop it was created on.
     """
-    Fetch and parse articles from an RSS feed.
+    async def _run():
+        async with FeedFetcher() as fetcher:
+            return await aggregate_articles_async(fetcher, source_ids)
+
+    return asyncio.run(_run())
+
+@handle_error
+def fetch_rss_feed(rss_url: str, source_id: int, content: bytes = None):
+    """
+    Parse articles from an RSS feed.
+
+    Args:
+        rss_url (str): The feed URL, recorded in the transparency metadata.
+        source_id (int): ID of the source the feed belongs to.
+        content (bytes): The already-downloaded feed body. When omitted, the
+            feed is downloaded synchronously from ``rss_url``. Large bodies are
+            parsed in the feed parse pool when ``FEED_PARSE_PROCESSES`` is set.
+
+    Returns:
+        list: The parsed articles, or None if parsing the body timed out.
     """
-    log_event(logger, "RSS_FETCH", f"Fetching RSS feed from {rss_url}.", source_id=source_id)
+    log_event(logger, "RSS_FETCH", f"Parsing RSS feed from {rss_url}.", source_id=source_id)
     try:
-        feed = feedparser.parse(rss_url)
+        if content is not None:
+            parsed = parse_feed_offloaded(content)
+            if parsed is None:
+                return None
+            bozo, feed_title, entries = parsed
+        else:
+            bozo, feed_title, entries = parse_feed(rss_url)
 
-        if feed.bozo:
+        if bozo:
             log_event(logger, "RSS_ERROR", f"Malformed RSS feed from {rss_url}.", level="WARNING", source_id=source_id)
             return []
 
         articles = []
-        for entry in feed.entries:
-            published_at = format_datetime(entry.get("published_parsed")) if entry.get("published_parsed") else None
+        fetched_at = format_datetime(datetime.now())
+        for title, summary, link, published in entries:
             article = {
-                "title": entry.get("title", "No Title"),
-                "content": entry.get("summary", ""),
-                "url": entry.get("link", ""),
-                "published_at": published_at,
+                "title": title,
+                "content": summary,
+                "url": link,
+                "published_at": format_datetime(datetime(*published)) if published else None,
                 "source_id": source_id,
                 "transparency_metadata": {
-                    "source_name": feed.feed.get("title", "Unknown Source"),
+                    "source_name": feed_title,
                     "rss_url": rss_url,
-                    "fetched_at": format_datetime(datetime.now())
+                    "fetched_at": fetched_at
                 }
             }
             if is_valid_url(article["url"]):
@@ -78,34 +281,125 @@ def fetch_rss_feed(rss_url: str, source_id: int):
         return []
 
 @handle_error
-def save_articles_to_db(articles):
+def update_feed_validators(source_id: int, etag: str, last_modified: str, content_hash: str):
+    """
+    Remember a feed's HTTP validators and body hash for the next conditional fetch.
+    """
+    query = "UPDATE news_sources SET etag = %s, last_modified = %s, content_hash = %s WHERE id = %s"
+    execute_query(query, (etag, last_modified, content_hash, source_id))
+
+ARTICLE_INSERT_COLUMNS = "title, content, url, published_at, fetched_at, source_id, transparency_metadata, simhash, cluster_id"
+ARTICLE_INSERT_ROW = "%s, %s, %s, %s, %s, %s, %s, %s, %s"
+
+def _published_at(article: dict):
+    # published_at is NOT NULL and keys listing order; fall back to the fetch time
+    return article["published_at"] or article["transparency_metadata"]["fetched_at"]
+
+def _within_partitions(articles: list) -> list:
+    # A row outside the attached monthly partitions would fail its whole batch's INSERT
+    start, end = partition_window("articles")
+    within = []
+    for article in articles:
+        published_at = _published_at(article)
+        if isinstance(published_at, str):
+            published_at = datetime.fromisoformat(published_at)
+        if start <= published_at < end:
+            within.append(article)
+    return within
+
+def _article_params(article: dict, with_search_vector: bool = False) -> tuple:
+    params = (
+        article["title"],
+        article["content"],
+        article["url"],
+        _published_at(article),
+        article["transparency_metadata"]["fetched_at"],
+        article["source_id"],
+        json.dumps(article["transparency_metadata"]),
+        article["simhash"],
+        article["cluster_id"],
+    )
+    if with_search_vector:
+        params += (article["title"], article["content"])
+    return params
+
+def _insert_article_batch(batch: list) -> list:
+    """
+    Insert one batch with a single multi-row statement in its own transaction.
+
+    On Postgres each row's ``search_vector`` is computed in the same statement,
+    so articles are searchable as soon as they are committed.
+
+    Returns:
+        list: ``(id, url)`` rows for the articles that were actually inserted.
+    """
+    with_search_vector = search_backend() == POSTGRES
+    columns, row = ARTICLE_INSERT_COLUMNS, ARTICLE_INSERT_ROW
+    if with_search_vector:
+        columns, row = f"{columns}, search_vector", f"{row}, {search_vector_sql()}"
+    query = (
+        f"INSERT INTO articles ({columns}) "
+        f"VALUES {', '.join([f'({row})'] * len(batch))} "
+        # URLs are claimed in article_urls by a trigger that skips duplicates across partitions
+        "ON CONFLICT DO NOTHING RETURNING id, url"
+    )
+    params = tuple(value for article in batch for value in _article_params(article, with_search_vector))
+    with engine.begin() as connection:
+        return connection.exec_driver_sql(query, params).fetchall()
+
+def _queue_feed_merge(inserted_rows: list):
+    # Scoring for every active user runs in a Celery task, off the write stage, and
+    # must never fail a write that has already committed. Imported here because
+    # the task module imports this one.
+    try:
+        from app.tasks.scheduler import merge_articles_into_feeds
+        merge_articles_into_feeds.delay([article_id for article_id, _ in inserted_rows])
+    except Exception as e:
+        log_exception(logger, e, "Failed to queue new articles for user feeds")
+
+@handle_error
+def save_articles_to_db(articles, batch_size: int = settings.ARTICLE_WRITE_BATCH_SIZE):
     """
-    Save aggregated articles to the database.
+    Save aggregated articles to the database in batches.
+
+    Each batch is written with one multi-row ``INSERT`` that skips URLs already
+    stored, in its own transaction, so a feed costs one round-trip per
+    ``batch_size`` articles. Every article is assigned a near-duplicate cluster
+    ID before it is written. On PostgreSQL, articles published outside the
+    partitions kept by ``maintain_partitions`` (older than the retention or
+    too far in the future) are left out.
+
+    Returns:
+        dict: Counts of inserted, duplicate and failed articles.
     """
     if not articles:
         log_event(logger, "DATA_PROCESSING", "No articles to save.", level="INFO")
-        return
+        return {"inserted": 0, "duplicates": 0, "failed": 0}
 
-    query = """
-        INSERT INTO articles (title, content, url, published_at, fetched_at, source_id, transparency_metadata)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (url) DO NOTHING
-    """
-    for article in articles:
-        params = (
-            article["title"],
-            article["content"],
-            article["url"],
-            article["published_at"],
-            article["transparency_metadata"]["fetched_at"],
-            article["source_id"],
-            article["transparency_metadata"]
-        )
+    if partitioning_enabled():
+        received, articles = len(articles), _within_partitions(articles)
+        if len(articles) < received:
+            log_event(logger, "DATA_PROCESSING", f"Skipped {received - len(articles)} articles published outside the partition window.", level="WARNING")
+
+    inserted = failed = 0
+    for start in range(0, len(articles), batch_size):
+        batch = articles[start:start + batch_size]
         try:
-            execute_query(query, params)
-            log_event(logger, "DATABASE", f"Article saved: {article['title']}", article_url=article["url"])
+            story_cluster_index.assign(batch)
+            inserted_rows = _insert_article_batch(batch)
+            inserted += len(inserted_rows)
+            inserted_urls = {url for _, url in inserted_rows}
+            story_cluster_index.remember([article for article in batch if article["url"] in inserted_urls])
+            if settings.SEEN_URL_FILTER_ENABLED:
+                seen_url_filter.add_many(article["url"] for article in batch)
+            if settings.FEED_ENABLED and inserted_rows:
+                _queue_feed_merge(inserted_rows)
         except Exception as e:
-            log_exception(logger, e, f"Error saving article: {article['url']}")
-
-    log_event(logger, "DATABASE", f"{len(articles)} articles saved to the database.")
+            failed += len(batch)
+            log_exception(logger, e, f"Error saving batch of {len(batch)} articles", first_url=batch[0]["url"])
 
+    if inserted:
+        invalidate_tags("articles")
+    duplicates = len(articles) - inserted - failed
+    log_event(logger, "DATABASE", f"Saved articles: {inserted} inserted, {duplicates} duplicates, {failed} failed.")
+    return {"inserted": inserted, "duplicates": duplicates, "failed": failed}
@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+import feedparser
+
+from app.config import settings
+from app.utilities.logging import get_logger, log_event, log_exception
+
+logger = get_logger(__name__)
+
+_parse_pool: ProcessPoolExecutor = None
+_pool_lock = threading.Lock()
+
+
+def parse_feed(source) -> tuple:
+    """
+    Parse a feed into a compact, picklable form.
+
+    Runs in the parse pool's worker processes, so it must stay a module-level
+    function and return only plain tuples.
+
+    Args:
+        source (bytes | str): The downloaded feed body, or a URL for feedparser to fetch.
+
+    Returns:
+        tuple: ``(bozo, feed_title, entries)`` where each entry is
+        ``(title, summary, link, published)`` and ``published`` is a
+        ``(year, month, day, hour, minute, second)`` tuple or None.
+    """
+    feed = feedparser.parse(source)
+    entries = tuple(
+        (
+            entry.get("title", "No Title"),
+            entry.get("summary", ""),
+            entry.get("link", ""),
+            tuple(entry["published_parsed"][:6]) if entry.get("published_parsed") else None,
+        )
+        for entry in feed.entries
+    )
+    return bool(feed.bozo), feed.feed.get("title", "Unknown Source"), entries
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """Return the shared parse pool, creating it on first use (None when disabled)."""
+    global _parse_pool
+    if settings.FEED_PARSE_PROCESSES <= 0:
+        return None
+    with _pool_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(max_workers=settings.FEED_PARSE_PROCESSES)
+            log_event(logger, "RSS_PARSE", f"Started feed parse pool with {settings.FEED_PARSE_PROCESSES} processes.")
+        return _parse_pool
+
+
+def shutdown_parse_pool():
+    """Stop the shared parse pool, if it was started."""
+    global _parse_pool
+    with _pool_lock:
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
+
+
+def _recycle_parse_pool(pool: ProcessPoolExecutor):
+    # Drops a broken or stuck pool so the next offloaded parse starts a fresh one.
+    # shutdown() never stops a worker that is mid-parse, so the workers are
+    # terminated; parses still running in them fail with BrokenProcessPool.
+    global _parse_pool
+    with _pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+
+def parse_feed_offloaded(content: bytes) -> tuple:
+    """
+    Parse a downloaded feed, in the process pool if it is large enough.
+
+    Bodies of at least ``FEED_PARSE_OFFLOAD_BYTES`` go to the pool when
+    ``FEED_PARSE_PROCESSES`` is set; anything else, or any pool failure (for
+    example inside daemonic Celery prefork workers, which cannot start child
+    processes), falls back to parsing in the calling thread.
+
+    If a pool parse takes longer than ``FEED_PARSE_TIMEOUT_SECONDS`` the pool
+    is recycled, terminating its workers, so the stuck parse cannot hold a
+    worker and make later feeds time out behind it. That feed is not retried
+    inline, since the same body would tie up the calling thread just as long.
+
+    Returns:
+        tuple: As ``parse_feed``, or None if the parse timed out.
+    """
+    if len(content) >= settings.FEED_PARSE_OFFLOAD_BYTES:
+        pool = None
+        try:
+            pool = get_parse_pool()
+            if pool is not None:
+                future = pool.submit(parse_feed, content)
+                try:
+                    return future.result(timeout=settings.FEED_PARSE_TIMEOUT_SECONDS)
+                except FutureTimeoutError:
+                    log_event(
+                        logger, "RSS_PARSE", f"Feed parse timed out after {settings.FEED_PARSE_TIMEOUT_SECONDS}s; restarting the parse pool.",
+                        level="WARNING", size=len(content),
+                    )
+                    _recycle_parse_pool(pool)
+                    return None
+        except BrokenProcessPool as e:
+            log_exception(logger, e, "Feed parse pool broke; restarting it on next use")
+            _recycle_parse_pool(pool)
+        except Exception as e:
+            log_exception(logger, e, "Offloaded feed parse failed; parsing inline")
+    return parse_feed(content)
@@ -1,14 +1,31 @@
+from app.utilities.async_database import execute_query_async
 from app.utilities.database import execute_query
 from app.utilities.logging import get_logger, log_event, log_exception
 from app.utilities.general import handle_error
+from app.modules.preferences import mark_feed_stale
+from app.modules.trending import safe_record_feedback
+from app.modules.feedback_buffer import FeedbackBuffer
 
 logger = get_logger(__name__)
 
+
+def _mark_feeds_stale(events: list):
+    # Feeds are re-ranked from the feedback table, so only once the events are stored
+    for user_id in {event["user_id"] for event in events}:
+        mark_feed_stale(user_id)
+
+
+# Instantiate a shared feedback buffer
+feedback_buffer = FeedbackBuffer(on_flush=_mark_feeds_stale)
+
 @handle_error
 def add_feedback(user_id: int, content_id: int, feedback_type: str, impact_score: int = 1):
     """
     Add feedback for a specific content item.
 
+    The event is accepted into the write-behind ``feedback_buffer`` and
+    stored with the next batch; it counts towards trending immediately.
+
     Args:
         user_id (int): ID of the user providing feedback.
         content_id (int): ID of the content receiving feedback.
@@ -19,18 +36,47 @@ def add_feedback(user_id: int, content_id: int, feedback_type: str, impact_score
         dict: Success message.
     """
     log_event(logger, "DATA_INSERT", "Adding feedback", user_id=user_id, content_id=content_id, feedback_type=feedback_type)
-    query = """
-        INSERT INTO feedback (user_id, content_id, feedback_type, impact_score, timestamp)
-        VALUES (%s, %s, %s, %s, NOW())
-    """
     try:
-        execute_query(query, (user_id, content_id, feedback_type, impact_score))
+        feedback_buffer.add(user_id, content_id, feedback_type, impact_score)
+        safe_record_feedback(content_id, feedback_type, impact_score)
         log_event(logger, "DATA_INSERT", "Feedback added successfully", user_id=user_id, content_id=content_id)
         return {"message": "Feedback added successfully."}
     except Exception as e:
         log_exception(logger, e, "Error adding feedback", user_id=user_id, content_id=content_id)
         raise
 
+FEEDBACK_QUERY = """
+    SELECT user_id, feedback_type, impact_score, timestamp
+    FROM feedback
+    WHERE content_id = %s
+    ORDER BY timestamp DESC
+"""
+FEEDBACK_SUMMARY_QUERY = """
+    SELECT feedback_type, feedback_count, total_impact
+    FROM feedback_content_rollup
+    WHERE content_id = %s
+    ORDER BY total_impact DESC
+"""
+TYPE_TRENDS_QUERY = """
+    SELECT feedback_type, feedback_count, total_impact
+    FROM feedback_type_rollup
+    ORDER BY total_impact DESC
+"""
+# Buckets are naive UTC, so the window starts from UTC now rather than the session time zone
+HOURLY_TRENDS_QUERY = """
+    SELECT feedback_type, SUM(feedback_count) AS feedback_count, SUM(total_impact) AS total_impact
+    FROM feedback_hourly_rollup
+    WHERE bucket >= date_trunc('hour', timezone('utc', now())) - make_interval(hours => %s)
+    GROUP BY feedback_type
+    ORDER BY total_impact DESC
+"""
+
+
+def _trends_query(hours: int = None):
+    if hours is None:
+        return TYPE_TRENDS_QUERY, None
+    return HOURLY_TRENDS_QUERY, (hours - 1,)
+
 @handle_error
 def get_feedback(content_id: int):
     """
@@ -43,14 +89,20 @@ def get_feedback(content_id: int):
         list: List of feedback entries.
     """
     log_event(logger, "DATA_FETCH", "Fetching feedback", content_id=content_id)
-    query = """
-        SELECT user_id, feedback_type, impact_score, timestamp
-        FROM feedback
-        WHERE content_id = %s
-        ORDER BY timestamp DESC
-    """
     try:
-        feedback = execute_query(query, (content_id,))["data"]
+        feedback = execute_query(FEEDBACK_QUERY, (content_id,), read_only=True)["data"]
+        log_event(logger, "DATA_FETCH", f"Retrieved {len(feedback)} feedback records", content_id=content_id)
+        return feedback
+    except Exception as e:
+        log_exception(logger, e, "Error retrieving feedback", content_id=content_id)
+        raise
+
+@handle_error
+async def get_feedback_async(content_id: int):
+    """Async variant of ``get_feedback`` for async endpoints."""
+    log_event(logger, "DATA_FETCH", "Fetching feedback", content_id=content_id)
+    try:
+        feedback = (await execute_query_async(FEEDBACK_QUERY, (content_id,), read_only=True))["data"]
         log_event(logger, "DATA_FETCH", f"Retrieved {len(feedback)} feedback records", content_id=content_id)
         return feedback
     except Exception as e:
@@ -58,25 +110,54 @@ def get_feedback(content_id: int):
         raise
 
 @handle_error
-def analyze_feedback_trends():
+def get_feedback_summary(content_id: int):
+    """
+    Per-type feedback counts and impact for one content item, read from
+    ``feedback_content_rollup``.
+
+    Returns:
+        list: One row per feedback type with ``feedback_count`` and ``total_impact``.
+    """
+    return execute_query(FEEDBACK_SUMMARY_QUERY, (content_id,), read_only=True)["data"]
+
+@handle_error
+async def get_feedback_summary_async(content_id: int):
+    """Async variant of ``get_feedback_summary``."""
+    return (await execute_query_async(FEEDBACK_SUMMARY_QUERY, (content_id,), read_only=True))["data"]
+
+@handle_error
+def analyze_feedback_trends(hours: int = None):
     """
     Analyze trends in feedback across all content.
 
+    Reads the rollups maintained with every feedback insert, so the cost
+    depends on the number of feedback types (and hours), not on the size of
+    the ``feedback`` table.
+
+    Args:
+        hours (int): Only count feedback from the last ``hours`` hour buckets
+            (default: all time).
+
     Returns:
         list: Aggregated feedback trends with counts and impact scores.
     """
-    log_event(logger, "ANALYSIS", "Starting feedback trends analysis")
-    query = """
-        SELECT feedback_type, COUNT(*) as feedback_count, SUM(impact_score) as total_impact
-        FROM feedback
-        GROUP BY feedback_type
-        ORDER BY total_impact DESC
-    """
+    log_event(logger, "ANALYSIS", "Starting feedback trends analysis", hours=hours)
     try:
-        trends = execute_query(query)["data"]
+        trends = execute_query(*_trends_query(hours), read_only=True)["data"]
         log_event(logger, "ANALYSIS", "Feedback trends analysis completed successfully")
         return trends
     except Exception as e:
         log_exception(logger, e, "Error analyzing feedback trends")
         raise
 
+@handle_error
+async def analyze_feedback_trends_async(hours: int = None):
+    """Async variant of ``analyze_feedback_trends`` for async endpoints."""
+    log_event(logger, "ANALYSIS", "Starting feedback trends analysis", hours=hours)
+    try:
+        trends = (await execute_query_async(*_trends_query(hours), read_only=True))["data"]
+        log_event(logger, "ANALYSIS", "Feedback trends analysis completed successfully")
+        return trends
+    except Exception as e:
+        log_exception(logger, e, "Error analyzing feedback trends")
+        raise
@@ -0,0 +1,390 @@
+import glob
+import json
+import os
+import socket
+import threading
+import time
+
+import redis
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config import settings
+from app.utilities.database import execute_query
+from app.utilities.logging import get_logger, log_event, log_exception
+from app.utilities.metrics import LatencyStats
+
+logger = get_logger(__name__)
+
+REDIS = "redis"
+SPOOL = "spool"
+OFF = "off"
+
+STREAM_KEY = "feedback:stream"
+STREAM_GROUP = "feedback-writers"
+
+FEEDBACK_COLUMNS = ("user_id", "content_id", "feedback_type", "impact_score", "accepted_at")
+# to_timestamp() gives a timestamptz; feedback.timestamp holds naive UTC, so convert explicitly rather than by session TimeZone
+ROW_PLACEHOLDER = "(%s, %s, %s, %s, timezone('utc', to_timestamp(%s)))"
+
+
+def _rollup_upsert(name: str, table: str, keys: str, key_sql: str) -> str:
+    # Groups are upserted in key order so concurrent flushers lock rollup rows in the same order
+    return f"""{name} AS (
+            INSERT INTO {table} ({keys}, feedback_count, total_impact)
+            SELECT {key_sql}, COUNT(*), COALESCE(SUM(impact_score), 0) FROM inserted
+            GROUP BY {key_sql} ORDER BY {key_sql}
+            ON CONFLICT ({keys}) DO UPDATE SET
+                feedback_count = {table}.feedback_count + EXCLUDED.feedback_count,
+                total_impact = {table}.total_impact + EXCLUDED.total_impact
+        )"""
+
+
+# The feedback rows and their rollup increments are written by one statement, so they commit together
+INSERT_TEMPLATE = f"""
+    WITH inserted AS (
+        INSERT INTO feedback (user_id, content_id, feedback_type, impact_score, timestamp)
+        VALUES {{rows}}
+        RETURNING content_id, feedback_type, impact_score, timestamp
+    ),
+    {_rollup_upsert("by_type", "feedback_type_rollup", "feedback_type", "feedback_type")},
+    {_rollup_upsert("by_content", "feedback_content_rollup", "content_id, feedback_type", "content_id, feedback_type")},
+    {_rollup_upsert("by_hour", "feedback_hourly_rollup", "bucket, feedback_type", "date_trunc('hour', timestamp), feedback_type")}
+    SELECT (SELECT COUNT(*) FROM inserted) AS inserted
+"""
+
+
+def insert_feedback_rows(events: list):
+    """
+    Write feedback events with one multi-row INSERT, keeping each event's
+    accept time, and add them to the per-type, per-content and hourly rollups.
+    """
+    params = []
+    for event in events:
+        params.extend(event[column] for column in FEEDBACK_COLUMNS)
+    execute_query(INSERT_TEMPLATE.format(rows=", ".join([ROW_PLACEHOLDER] * len(events))), tuple(params))
+
+
+class FeedbackBuffer:
+    """
+    Write-behind buffer for feedback events.
+
+    ``add`` records an event in a durable log and returns at once; a
+    background thread flushes the log to the ``feedback`` table in multi-row
+    INSERTs whenever ``batch_size`` events are waiting or ``flush_seconds``
+    have passed. Events leave the log only after their INSERT commits, so a
+    crash replays them instead of dropping them.
+
+    Modes:
+        ``redis``: events go to a Redis stream read through a consumer group.
+            Any process can flush any event, and entries left pending by a
+            crashed process are claimed after ``claim_idle_seconds``.
+        ``spool``: events are appended to a per-process file in ``spool_dir``;
+            a flush rotates the file and deletes it once written. Files left
+            by a dead process are replayed on start.
+        ``off``: no buffering; ``add`` inserts synchronously.
+    """
+
+    def __init__(
+        self,
+        mode: str = settings.FEEDBACK_BUFFER_MODE,
+        batch_size: int = settings.FEEDBACK_BUFFER_BATCH_SIZE,
+        flush_seconds: float = settings.FEEDBACK_BUFFER_FLUSH_SECONDS,
+        spool_dir: str = settings.FEEDBACK_BUFFER_SPOOL_DIR,
+        fsync: bool = settings.FEEDBACK_BUFFER_FSYNC,
+        claim_idle_seconds: float = settings.FEEDBACK_BUFFER_CLAIM_IDLE_SECONDS,
+        on_flush=None,
+    ):
+        self.mode = mode
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.spool_dir = spool_dir
+        self.fsync = fsync
+        self.claim_idle_seconds = claim_idle_seconds
+        self.on_flush = on_flush
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.pending = 0
+        self._client: redis.Redis = None
+        self._spool = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: threading.Thread = None
+        self.reset_metrics()
+
+    def reset_metrics(self):
+        self.accepted = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flush_latency = LatencyStats()  # Time spent in each INSERT
+        self.commit_lag = LatencyStats()  # Accept-to-commit delay of the oldest event in each batch
+
+    # Durable log
+
+    def _redis(self) -> redis.Redis:
+        if self._client is None:
+            client = redis.Redis.from_url(settings.REDIS_URL)
+            try:
+                client.xgroup_create(STREAM_KEY, STREAM_GROUP, id="0", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._client = client
+        return self._client
+
+    def _spool_path(self, pid: int = None) -> str:
+        return os.path.join(self.spool_dir, f"feedback-{pid or os.getpid()}.spool")
+
+    def _append_spool(self, line: str):
+        if self._spool is None:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._spool = open(self._spool_path(), "a", encoding="utf-8")
+        self._spool.write(line)
+        self._spool.flush()
+        if self.fsync:
+            os.fsync(self._spool.fileno())
+
+    def add(self, user_id: int, content_id: int, feedback_type: str, impact_score: int = 1):
+        """Accept one feedback event; it is durable when this returns."""
+        event = {
+            "user_id": user_id,
+            "content_id": content_id,
+            "feedback_type": feedback_type,
+            "impact_score": impact_score,
+            "accepted_at": time.time(),
+        }
+        if self.mode == OFF:
+            insert_feedback_rows([event])
+            self._after_flush([event])
+            return
+        if self.mode == REDIS:
+            self._redis().xadd(STREAM_KEY, {"event": json.dumps(event)})
+        with self._lock:
+            if self.mode == SPOOL:
+                self._append_spool(json.dumps(event) + "\n")
+            self.accepted += 1
+            self.pending += 1
+            full = self.pending >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    # Flushing
+
+    def _write(self, events: list) -> tuple:
+        """
+        Insert a batch.
+
+        A batch rejected for its data (e.g. feedback on a deleted article) is
+        retried row by row so one bad event cannot block the rest; bad rows are
+        logged and dropped. Any other failure (the database is unavailable)
+        leaves the remaining events for the next flush.
+
+        Returns:
+            tuple: ``(inserted, remaining)``, the events that were stored and
+            the suffix of the batch that still has to be written. Events in
+            neither were dropped.
+        """
+        started = time.perf_counter()
+        try:
+            insert_feedback_rows(events)
+            self.flush_latency.observe(time.perf_counter() - started)
+            return events, []
+        except (IntegrityError, DataError) as e:
+            log_exception(logger, e, "Batched feedback insert rejected; retrying row by row", events=len(events))
+        except Exception as e:
+            log_exception(logger, e, "Batched feedback insert failed", events=len(events))
+            return [], events
+        inserted = []
+        for index, event in enumerate(events):
+            try:
+                insert_feedback_rows([event])
+                inserted.append(event)
+            except (IntegrityError, DataError) as e:
+                self.dropped += 1
+                log_exception(logger, e, "Dropping feedback event that cannot be stored", event=event)
+            except Exception as e:
+                log_exception(logger, e, "Feedback insert failed", events=len(events) - index)
+                return inserted, events[index:]
+        self.flush_latency.observe(time.perf_counter() - started)
+        return inserted, []
+
+    def _after_flush(self, events: list):
+        if self.on_flush and events:
+            try:
+                self.on_flush(events)
+            except Exception as e:
+                log_exception(logger, e, "Feedback flush callback failed", events=len(events))
+
+    def _record(self, events: list):
+        self.flushes += 1
+        self.flushed += len(events)
+        self.commit_lag.observe(time.time() - min(event["accepted_at"] for event in events))
+        self._after_flush(events)
+
+    def _flush_redis(self) -> tuple:
+        # Returns the number of events stored and the number of stream entries finished with (stored or dropped)
+        client = self._redis()
+        # Entries another (crashed) consumer read but never acknowledged come first
+        _, claimed, *_ = client.xautoclaim(
+            STREAM_KEY, STREAM_GROUP, self.consumer, int(self.claim_idle_seconds * 1000), "0-0", count=self.batch_size
+        )
+        entries = list(claimed)
+        # Then this consumer's own unacknowledged entries from a failed flush, then new ones
+        for start in ("0", ">"):
+            if len(entries) >= self.batch_size:
+                break
+            response = client.xreadgroup(STREAM_GROUP, self.consumer, {STREAM_KEY: start}, count=self.batch_size - len(entries))
+            seen = {entry_id for entry_id, _ in entries}
+            entries.extend(entry for _, stream_entries in response or [] for entry in stream_entries if entry[0] not in seen)
+        entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+        if not entries:
+            return 0, 0
+
+        events = [json.loads(fields[b"event"]) for _, fields in entries]
+        inserted, remaining = self._write(events)
+        done = len(events) - len(remaining)
+        if done:
+            # Unacknowledged entries stay pending and are read again by the next flush
+            ids = [entry_id for entry_id, _ in entries[:done]]
+            pipeline = client.pipeline()
+            pipeline.xack(STREAM_KEY, STREAM_GROUP, *ids)
+            pipeline.xdel(STREAM_KEY, *ids)
+            pipeline.execute()
+        if inserted:
+            self._record(inserted)
+        if remaining:
+            self.failed_flushes += 1
+            return len(inserted), 0
+        return len(inserted), done
+
+    def _flush_spool(self) -> int:
+        with self._lock:
+            if self._spool is not None and self._spool.tell():
+                self._spool.close()
+                self._spool = None
+                os.replace(self._spool_path(), f"{self._spool_path()}.{time.time_ns()}.flushing")
+            self.pending = 0
+        flushed = 0
+        for path in sorted(glob.glob(f"{self._spool_path()}.*.flushing")):
+            with open(path, encoding="utf-8") as f:
+                # A torn last line from a crash mid-append is skipped
+                events = [json.loads(line) for line in f if line.endswith("\n")]
+            for start in range(0, len(events), self.batch_size):
+                batch = events[start:start + self.batch_size]
+                inserted, remaining = self._write(batch)
+                if inserted:
+                    self._record(inserted)
+                    flushed += len(inserted)
+                if remaining:
+                    # Rewrite the file to what is still unwritten so a retry never duplicates rows
+                    unwritten = remaining + events[start + len(batch):]
+                    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                        f.writelines(json.dumps(event) + "\n" for event in unwritten)
+                    os.replace(f"{path}.tmp", path)
+                    self.failed_flushes += 1
+                    with self._lock:
+                        self.pending += len(unwritten)
+                    return flushed
+            os.remove(path)
+        return flushed
+
+    def flush(self) -> int:
+        """Write everything currently buffered; returns the number of events stored."""
+        if self.mode == OFF:
+            return 0
+        with self._flush_lock:
+            if self.mode == SPOOL:
+                return self._flush_spool()
+            flushed = 0
+            while True:
+                stored, done = self._flush_redis()
+                flushed += stored
+                if done < self.batch_size:
+                    break
+            with self._lock:
+                self.pending = 0
+            return flushed
+
+    def recover(self) -> int:
+        """Adopt spool files left by processes that are no longer running."""
+        if self.mode != SPOOL or not os.path.isdir(self.spool_dir):
+            return 0
+        adopted = 0
+        for path in glob.glob(os.path.join(self.spool_dir, "feedback-*.spool*")):
+            if path.endswith(".tmp"):
+                continue
+            pid = int(os.path.basename(path).split("-")[1].split(".")[0])
+            if pid == os.getpid():
+                # A previous process with the same PID (e.g. PID 1 in a restarted container)
+                if path == self._spool_path() and self._spool is None:
+                    os.replace(path, f"{path}.{time.time_ns()}.flushing")
+                    adopted += 1
+                continue
+            if _process_alive(pid):
+                continue
+            os.replace(path, f"{self._spool_path()}.{time.time_ns()}.flushing")
+            adopted += 1
+        if adopted:
+            log_event(logger, "FEEDBACK", f"Recovered {adopted} feedback spool files from stopped processes.")
+        return adopted
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_seconds)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                self.failed_flushes += 1
+                log_exception(logger, e, "Feedback flush failed")
+
+    def start(self):
+        """Recover leftover events and start the background flusher."""
+        if self.mode == OFF or self._thread is not None:
+            return
+        self.recover()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="feedback-buffer", daemon=True)
+        self._thread.start()
+        log_event(logger, "FEEDBACK", f"Feedback buffer started in {self.mode} mode.")
+
+    def stop(self):
+        """Stop the background flusher and write whatever is still buffered."""
+        if self._thread is None:
+            return
+        self._stopping.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            self.flush()
+        except Exception as e:
+            log_exception(logger, e, "Final feedback flush failed; events stay in the durable log")
+
+    def stats(self) -> dict:
+        """Throughput and flush-latency metrics for the transparency panel."""
+        return {
+            "mode": self.mode,
+            "running": self._thread is not None,
+            "accepted": self.accepted,
+            "pending": self.pending,
+            "flushed": self.flushed,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "mean_batch_size": round(self.flushed / self.flushes, 2) if self.flushes else 0.0,
+            "flush_latency": self.flush_latency.as_dict(),
+            "commit_lag": self.commit_lag.as_dict(),
+        }
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
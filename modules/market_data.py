@@ -1,9 +1,18 @@
+from app.utilities.async_database import execute_query_async
 from app.utilities.database import execute_query
 from app.utilities.logging import get_logger, log_event, log_exception
 from app.utilities.general import handle_error
+from app.utilities.response_cache import invalidate_tags
 
 logger = get_logger(__name__)
 
+MARKET_ITEMS_QUERY = """
+    SELECT * FROM items
+    WHERE region = %s AND available = 1
+    ORDER BY id DESC
+    LIMIT %s OFFSET %s
+"""
+
 @handle_error
 def fetch_market_items(skip: int = 0, limit: int = 10, region: str = "Lewiston"):
     """
@@ -18,14 +27,20 @@ def fetch_market_items(skip: int = 0, limit: int = 10, region: str = "Lewiston")
         list: Market items.
     """
     log_event(logger, "DATA_FETCH", "Fetching market items", region=region, skip=skip, limit=limit)
-    query = """
-        SELECT * FROM items
-        WHERE region = %s AND available = 1
-        ORDER BY id DESC
-        LIMIT %s OFFSET %s
-    """
     try:
-        items = execute_query(query, (region, limit, skip))["data"]
+        items = execute_query(MARKET_ITEMS_QUERY, (region, limit, skip), read_only=True)["data"]
+        log_event(logger, "DATA_FETCH", f"Fetched {len(items)} market items", region=region)
+        return items
+    except Exception as e:
+        log_exception(logger, e, "Error fetching market items", region=region)
+        raise
+
+@handle_error
+async def fetch_market_items_async(skip: int = 0, limit: int = 10, region: str = "Lewiston"):
+    """Async variant of ``fetch_market_items`` for async endpoints."""
+    log_event(logger, "DATA_FETCH", "Fetching market items", region=region, skip=skip, limit=limit)
+    try:
+        items = (await execute_query_async(MARKET_ITEMS_QUERY, (region, limit, skip), read_only=True))["data"]
         log_event(logger, "DATA_FETCH", f"Fetched {len(items)} market items", region=region)
         return items
     except Exception as e:
@@ -53,6 +68,7 @@ def add_market_item(title: str, description: str, price: int, region: str):
     """
     try:
         execute_query(query, (title, description, price, region))
+        invalidate_tags(f"items:region={region}")
         log_event(logger, "DATA_INSERT", "Market item added successfully", title=title, region=region)
         return {"message": "Item added successfully."}
     except Exception as e:
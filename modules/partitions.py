@@ -0,0 +1,214 @@
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.config import settings
+from app.utilities.database import engine
+from app.utilities.logging import get_logger, log_event, log_exception
+from app.utilities.response_cache import invalidate_tags
+
+logger = get_logger(__name__)
+
+# Monthly range-partitioned tables and their partition keys (see migration 0009)
+PARTITIONED_TABLES = {"articles": "published_at", "feedback": "timestamp"}
+
+ATTACHED_PARTITIONS_QUERY = """
+    SELECT child.relname FROM pg_inherits
+    JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+    JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+    WHERE parent.relname = %s AND parent.relnamespace = current_schema()::regnamespace
+"""
+# Partitions detached by an archive run that stopped before dropping them
+DETACHED_PARTITIONS_QUERY = """
+    SELECT relname FROM pg_class
+    WHERE relkind = 'r' AND NOT relispartition AND relname ~ %s
+      AND relnamespace = current_schema()::regnamespace
+"""
+COLUMNS_QUERY = """
+    SELECT column_name, data_type FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = %s
+    ORDER BY ordinal_position
+"""
+
+# Column types written natively to Parquet; anything else (JSON, tsvector, ...) is exported as text
+ARROW_TYPES = {
+    "smallint": pa.int16(),
+    "integer": pa.int32(),
+    "bigint": pa.int64(),
+    "real": pa.float32(),
+    "double precision": pa.float64(),
+    "boolean": pa.bool_(),
+    "text": pa.string(),
+    "character varying": pa.string(),
+    "date": pa.date32(),
+    "timestamp without time zone": pa.timestamp("us"),
+    "timestamp with time zone": pa.timestamp("us", tz="UTC"),
+}
+
+
+def month_start(moment: datetime) -> datetime:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+
+def _name_pattern(table: str) -> str:
+    return rf"^{table}_p(\d{{4}})_(\d{{2}})$"
+
+
+def partition_month(table: str, name: str) -> datetime:
+    """Month a partition named by ``partition_name`` holds, or None for any other table."""
+    match = re.match(_name_pattern(table), name)
+    return datetime(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def archive_cutoff(table: str, now: datetime = None) -> datetime:
+    """First month kept in ``table``; partitions of earlier months are archived."""
+    retention = {"articles": settings.ARTICLE_RETENTION_MONTHS, "feedback": settings.FEEDBACK_RETENTION_MONTHS}[table]
+    return add_months(month_start(now or datetime.utcnow()), -retention)
+
+
+def partition_window(table: str, now: datetime = None) -> tuple:
+    """``(start, end)`` of the partition key range that maintenance keeps attached to ``table``."""
+    current = month_start(now or datetime.utcnow())
+    return archive_cutoff(table, current), add_months(current, settings.PARTITION_PREMAKE_MONTHS + 1)
+
+
+def partitioning_enabled() -> bool:
+    """Partitioning is PostgreSQL-only; other databases keep plain tables."""
+    return engine.dialect.name == "postgresql"
+
+
+def _attached_partitions(connection, table: str) -> dict:
+    rows = connection.exec_driver_sql(ATTACHED_PARTITIONS_QUERY, (table,)).fetchall()
+    return {name: partition_month(table, name) for (name,) in rows if partition_month(table, name)}
+
+
+def ensure_partitions(now: datetime = None) -> list:
+    """
+    Create every missing monthly partition in ``partition_window``, from the
+    retention cutoff through ``PARTITION_PREMAKE_MONTHS`` ahead, so any row
+    ingest accepts has a partition to go to.
+
+    Returns:
+        list: Names of the partitions created.
+    """
+    created = []
+    for table in PARTITIONED_TABLES:
+        month, end = partition_window(table, now)
+        with engine.begin() as connection:
+            attached = _attached_partitions(connection, table)
+            while month < end:
+                name = partition_name(table, month)
+                if name not in attached:
+                    connection.exec_driver_sql(
+                        f"CREATE TABLE {name} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+                    )
+                    created.append(name)
+                month = add_months(month, 1)
+    if created:
+        log_event(logger, "PARTITIONS", f"Created partitions: {', '.join(created)}")
+    return created
+
+
+def export_partition(table: str, name: str) -> dict:
+    """
+    Write a detached partition to ``PARTITION_ARCHIVE_DIR/<table>/<name>.parquet``
+    (zstd-compressed), streaming ``PARTITION_ARCHIVE_BATCH_ROWS`` rows at a time.
+
+    The file is written under a temporary name and renamed once complete, so a
+    file with the final name is always a full copy.
+
+    Returns:
+        dict: ``path`` of the Parquet file and the number of ``rows`` written.
+    """
+    directory = Path(settings.PARTITION_ARCHIVE_DIR) / table
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{name}.parquet"
+    partial = directory / f"{name}.parquet.partial"
+
+    with engine.connect() as connection:
+        columns = connection.exec_driver_sql(COLUMNS_QUERY, (name,)).fetchall()
+        schema = pa.schema([(column, ARROW_TYPES.get(data_type, pa.string())) for column, data_type in columns])
+        select_list = ", ".join(
+            column if data_type in ARROW_TYPES else f"{column}::text AS {column}" for column, data_type in columns
+        )
+        result = connection.execution_options(stream_results=True).exec_driver_sql(f"SELECT {select_list} FROM {name}")
+        rows = 0
+        with pq.ParquetWriter(partial, schema, compression="zstd") as writer:
+            for chunk in result.partitions(settings.PARTITION_ARCHIVE_BATCH_ROWS):
+                arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)]
+                writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+                rows += len(chunk)
+
+    with open(partial, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(partial, path)
+    if pq.read_metadata(path).num_rows != rows:
+        raise RuntimeError(f"Archive of {name} has {pq.read_metadata(path).num_rows} rows, expected {rows}.")
+    return {"path": str(path), "rows": rows}
+
+
+def archive_partitions(now: datetime = None) -> list:
+    """
+    Detach the partitions older than each table's retention, export them to
+    Parquet and drop them.
+
+    Each detach runs in its own short transaction with a lock timeout, so it
+    gives up (and is retried on the next run) rather than queueing behind
+    long-running queries. A partition is only dropped after its archive has
+    been written and its row count verified; partitions left detached by an
+    interrupted run are picked up again.
+
+    Returns:
+        list: ``table``, ``partition``, ``rows`` and ``path`` of each archived partition.
+    """
+    archived = []
+    for table in PARTITIONED_TABLES:
+        cutoff = archive_cutoff(table, now)
+        with engine.connect() as connection:
+            expired = sorted(name for name, month in _attached_partitions(connection, table).items() if month < cutoff)
+        detached_any = False
+        for name in expired:
+            try:
+                with engine.begin() as connection:
+                    connection.exec_driver_sql(f"SET LOCAL lock_timeout = {int(settings.PARTITION_LOCK_TIMEOUT_MS)}")
+                    connection.exec_driver_sql(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                detached_any = True
+                log_event(logger, "PARTITIONS", f"Detached {name} from {table}.")
+            except Exception as e:
+                log_exception(logger, e, f"Could not detach {name}; retrying on the next run", table=table)
+        if detached_any and table == "articles":
+            # The detached rows are gone from every query; cached listings must not keep serving them
+            invalidate_tags("articles")
+
+        with engine.connect() as connection:
+            detached = connection.exec_driver_sql(DETACHED_PARTITIONS_QUERY, (_name_pattern(table),)).fetchall()
+        for (name,) in sorted(detached):
+            if partition_month(table, name) >= cutoff:
+                continue
+            export = export_partition(table, name)
+            with engine.begin() as connection:
+                connection.exec_driver_sql(f"DROP TABLE {name}")
+            log_event(logger, "PARTITIONS", f"Archived {name}: {export['rows']} rows to {export['path']}.")
+            archived.append({"table": table, "partition": name, **export})
+    return archived
+
+
+def maintain_partitions(now: datetime = None) -> dict:
+    """Create upcoming partitions, then archive expired ones."""
+    if not partitioning_enabled():
+        return {"created": [], "archived": []}
+    return {"created": ensure_partitions(now), "archived": archive_partitions(now)}
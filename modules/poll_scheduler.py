@@ -0,0 +1,103 @@
+from app.config import settings
+from app.utilities.database import execute_query
+from app.utilities.logging import get_logger, log_event
+from app.utilities.general import handle_error
+from datetime import datetime
+from statistics import median
+
+logger = get_logger(__name__)
+
+def compute_poll_interval(
+    published_at: list[datetime],
+    consecutive_failures: int = 0,
+    min_interval: int = settings.POLL_MIN_INTERVAL_SECONDS,
+    max_interval: int = settings.POLL_MAX_INTERVAL_SECONDS,
+) -> int:
+    """
+    Derive a source's polling interval from its publishing history.
+
+    The interval is ``POLL_CADENCE_FACTOR`` times the median gap between recent
+    articles, doubled for every consecutive failure, and clamped to
+    ``[min_interval, max_interval]``.
+
+    Args:
+        published_at (list): Recent publication times, in any order.
+        consecutive_failures (int): Failed polls since the last success.
+
+    Returns:
+        int: Seconds until the next poll.
+    """
+    timestamps = sorted(published_at)
+    gaps = [(later - earlier).total_seconds() for earlier, later in zip(timestamps, timestamps[1:])]
+    gaps = [gap for gap in gaps if gap > 0]
+    if gaps:
+        interval = median(gaps) * settings.POLL_CADENCE_FACTOR
+    else:
+        interval = settings.POLL_DEFAULT_INTERVAL_SECONDS
+
+    interval = max(interval, min_interval) * (2 ** min(consecutive_failures, 16))
+    return int(min(max(interval, min_interval), max_interval))
+
+def claim_due_sources(limit: int = settings.POLL_DISPATCH_BATCH_SIZE) -> list[int]:
+    """
+    Claim active sources whose next poll is due.
+
+    Claimed sources get a short lease on ``next_poll_at`` so an overlapping
+    dispatcher run does not send them again; ``record_poll_result`` replaces the
+    lease with the learned interval once the poll finishes.
+
+    Returns:
+        list: IDs of the claimed sources.
+    """
+    query = """
+        UPDATE news_sources SET next_poll_at = NOW() + make_interval(secs => %s)
+        WHERE id IN (
+            SELECT id FROM news_sources
+            WHERE status = 'active' AND (next_poll_at IS NULL OR next_poll_at <= NOW())
+            ORDER BY next_poll_at NULLS FIRST
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id
+    """
+    rows = execute_query(query, (settings.POLL_MIN_INTERVAL_SECONDS, limit))["data"]
+    source_ids = [row["id"] for row in rows]
+    log_event(logger, "POLL_SCHEDULER", f"Claimed {len(source_ids)} due sources.")
+    return source_ids
+
+@handle_error
+def record_poll_result(source_id: int):
+    """
+    Schedule a source's next poll after an aggregation attempt.
+
+    The failure count is the one maintained by the circuit breaker during the
+    fetch, and the next poll is never earlier than the circuit's retry time.
+
+    Args:
+        source_id (int): ID of the polled source.
+
+    Returns:
+        dict: The new interval and failure count.
+    """
+    source = execute_query("SELECT consecutive_failures FROM news_sources WHERE id = %s", (source_id,))["data"]
+    failures = source[0]["consecutive_failures"] if source else 0
+
+    history_query = """
+        SELECT published_at FROM articles
+        WHERE source_id = %s AND published_at IS NOT NULL
+        ORDER BY published_at DESC
+        LIMIT %s
+    """
+    history = execute_query(history_query, (source_id, settings.POLL_HISTORY_SIZE))["data"]
+    interval = compute_poll_interval([row["published_at"] for row in history], failures)
+
+    update_query = """
+        UPDATE news_sources
+        SET poll_interval_seconds = %s,
+            next_poll_at = GREATEST(NOW() + make_interval(secs => %s), COALESCE(circuit_retry_at, NOW())),
+            last_polled_at = NOW()
+        WHERE id = %s
+    """
+    execute_query(update_query, (interval, interval, source_id))
+    log_event(logger, "POLL_SCHEDULER", "Scheduled next poll", source_id=source_id, interval=interval, failures=failures)
+    return {"interval": interval, "consecutive_failures": failures}
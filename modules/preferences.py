@@ -0,0 +1,268 @@
+import json
+import math
+import time
+from datetime import datetime
+
+import redis
+
+from app.config import settings
+from app.modules.article_projection import SUMMARY_FIELDS, finalize_rows, select_clause
+from app.utilities.database import execute_query
+from app.utilities.logging import get_logger, log_event, log_exception
+from app.utilities.general import handle_error
+from app.utilities.search_index import tokenize
+from app.utilities.validation import sanitize_input
+
+logger = get_logger(__name__)
+
+FEED_KEY = "feed:user:{user_id}"
+PROFILE_KEY = "feed:profile:{user_id}"
+ACTIVE_USERS_KEY = "feed:active"
+STALE_USERS_KEY = "feed:stale"
+
+PREFERRED_SOURCE_BOOST = 1.0
+KEYWORD_BOOST = 0.5
+AFFINITY_WEIGHT = 1.0  # Feedback can scale a source's articles by up to e^±1
+FEEDBACK_WEIGHTS = {"like": 1, "dislike": -1, "flag": -2}
+
+_client: redis.Redis = None
+
+
+def _redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+def _timestamp(value) -> float:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp() if value else time.time()
+
+
+def normalize_preferences(preferences: dict) -> dict:
+    """
+    Validate a preferences document.
+
+    Recognized keys are ``sources`` (preferred source IDs), ``muted_sources``
+    and ``keywords``; anything else is dropped.
+    """
+    return {
+        "sources": sorted({int(source_id) for source_id in preferences.get("sources", [])}),
+        "muted_sources": sorted({int(source_id) for source_id in preferences.get("muted_sources", [])}),
+        "keywords": sorted({sanitize_input(str(keyword)).strip().lower() for keyword in preferences.get("keywords", [])} - {""}),
+    }
+
+
+def _load_preferences(user_id: int) -> dict:
+    rows = execute_query("SELECT preferences FROM users WHERE id = %s", (user_id,))["data"]
+    if not rows or not rows[0]["preferences"]:
+        return normalize_preferences({})
+    return normalize_preferences(json.loads(rows[0]["preferences"]))
+
+
+@handle_error
+def get_user_preferences(user_id: int):
+    """
+    Fetch a user's feed preferences.
+
+    Returns:
+        dict: Preferred and muted source IDs and keywords.
+    """
+    return _load_preferences(user_id)
+
+
+@handle_error
+def update_user_preferences(user_id: int, preferences: dict):
+    """
+    Store a user's feed preferences and re-rank their feed.
+
+    Returns:
+        dict: Confirmation message and the stored preferences.
+    """
+    normalized = normalize_preferences(preferences)
+    execute_query("UPDATE users SET preferences = %s WHERE id = %s", (json.dumps(normalized), user_id))
+    log_event(logger, "PREFERENCES", "User preferences updated", user_id=user_id)
+    if settings.FEED_ENABLED:
+        try:
+            rebuild_user_feed(user_id)
+        except Exception as e:
+            log_exception(logger, e, "Failed to rebuild feed after preference update", user_id=user_id)
+            mark_feed_stale(user_id)
+    return {"message": "Preferences updated successfully.", "preferences": normalized}
+
+
+def build_user_profile(user_id: int) -> dict:
+    """
+    Everything feed scoring needs about a user: explicit preferences, a
+    per-source affinity learned from their feedback, and the articles they
+    disliked or flagged (never shown again).
+    """
+    profile = _load_preferences(user_id)
+    query = """
+        SELECT a.source_id, f.content_id, f.feedback_type, f.impact_score
+        FROM feedback f
+        JOIN articles a ON a.id = f.content_id
+        WHERE f.user_id = %s
+    """
+    affinity, hidden = {}, set()
+    for row in execute_query(query, (user_id,))["data"]:
+        weight = FEEDBACK_WEIGHTS.get(row["feedback_type"], 0) * (row["impact_score"] or 1)
+        key = str(row["source_id"])
+        affinity[key] = affinity.get(key, 0) + weight
+        if weight < 0:
+            hidden.add(row["content_id"])
+    profile["source_affinity"] = affinity
+    profile["hidden_articles"] = sorted(hidden)
+    return profile
+
+
+def score_article(article: dict, profile: dict, half_life_hours: float = settings.FEED_HALF_LIFE_HOURS):
+    """
+    Rank key of an article for one user, or None if it must not be shown.
+
+    The key is ``log(relevance) + ln(2) * published_at / half_life``. Adding
+    the publish time in log space means comparing two keys is the same as
+    comparing ``relevance * 2 ** (-age / half_life)`` at any moment, so stored
+    scores never need to be recomputed as articles age.
+    """
+    source_id = article["source_id"]
+    if source_id in profile["muted_sources"] or article["id"] in profile["hidden_articles"]:
+        return None
+
+    relevance = 1.0
+    if source_id in profile["sources"]:
+        relevance += PREFERRED_SOURCE_BOOST
+    if profile["keywords"]:
+        terms = set(tokenize(f"{article['title']} {article.get('content') or article.get('snippet') or ''}"))
+        relevance += KEYWORD_BOOST * sum(1 for keyword in profile["keywords"] if keyword in terms)
+    affinity = profile["source_affinity"].get(str(source_id), 0)
+    relevance *= math.exp(AFFINITY_WEIGHT * math.tanh(affinity / 5))
+
+    return math.log(relevance) + math.log(2) * _timestamp(article["published_at"]) / (half_life_hours * 3600)
+
+
+def _store_scores(pipeline, user_id: int, scores: dict, replace: bool = False):
+    key = FEED_KEY.format(user_id=user_id)
+    if replace:
+        pipeline.delete(key)
+    if scores:
+        pipeline.zadd(key, scores)
+        # Keep only the top FEED_SIZE articles
+        pipeline.zremrangebyrank(key, 0, -settings.FEED_SIZE - 1)
+    pipeline.expire(key, settings.FEED_ACTIVE_DAYS * 86400)
+
+
+def rebuild_user_feed(user_id: int) -> int:
+    """
+    Score recent articles for a user and replace their materialized feed.
+
+    Returns:
+        int: Number of articles in the feed.
+    """
+    profile = build_user_profile(user_id)
+    query = """
+        SELECT id, title, content, source_id, published_at FROM articles
+        WHERE published_at >= NOW() - make_interval(hours => %s)
+        ORDER BY published_at DESC
+        LIMIT %s
+    """
+    candidates = execute_query(query, (settings.FEED_CANDIDATE_HOURS, settings.FEED_CANDIDATE_LIMIT))["data"]
+    scores = {}
+    for article in candidates:
+        score = score_article(article, profile)
+        if score is not None:
+            scores[article["id"]] = score
+
+    pipeline = _redis().pipeline()
+    pipeline.set(PROFILE_KEY.format(user_id=user_id), json.dumps(profile), ex=settings.FEED_ACTIVE_DAYS * 86400)
+    _store_scores(pipeline, user_id, scores, replace=True)
+    pipeline.srem(STALE_USERS_KEY, user_id)
+    pipeline.execute()
+    log_event(logger, "FEED", f"Rebuilt feed with {min(len(scores), settings.FEED_SIZE)} articles", user_id=user_id)
+    return min(len(scores), settings.FEED_SIZE)
+
+
+def add_articles_to_feeds(article_ids: list):
+    """
+    Score newly stored articles for every active user and merge them into
+    their feeds. Run by a Celery task queued by the writer after each
+    committed batch, so the fan-out stays off the ingestion write stage.
+
+    Args:
+        article_ids (list): IDs of the inserted articles.
+    """
+    if not article_ids:
+        return
+    client = _redis()
+    active_since = time.time() - settings.FEED_ACTIVE_DAYS * 86400
+    user_ids = [int(user_id) for user_id in client.zrangebyscore(ACTIVE_USERS_KEY, active_since, "+inf")]
+    if not user_ids:
+        return
+    query = "SELECT id, title, content, source_id, published_at FROM articles WHERE id = ANY(%s)"
+    articles = execute_query(query, (list(article_ids),))["data"]
+    profiles = client.mget([PROFILE_KEY.format(user_id=user_id) for user_id in user_ids])
+
+    pipeline = client.pipeline(transaction=False)
+    for user_id, profile in zip(user_ids, profiles):
+        if profile is None:
+            # Profile expired while the user kept reading; have refresh_stale_feeds rebuild the feed
+            pipeline.sadd(STALE_USERS_KEY, user_id)
+            continue
+        profile = json.loads(profile)
+        scores = {}
+        for article in articles:
+            score = score_article(article, profile)
+            if score is not None:
+                scores[article["id"]] = score
+        _store_scores(pipeline, user_id, scores)
+    pipeline.execute()
+    log_event(logger, "FEED", f"Merged {len(articles)} new articles into {len(user_ids)} active feeds.")
+
+
+def mark_feed_stale(user_id: int):
+    """Queue a user's feed for re-ranking, e.g. after new feedback."""
+    try:
+        _redis().sadd(STALE_USERS_KEY, user_id)
+    except Exception as e:
+        log_exception(logger, e, "Failed to mark feed stale", user_id=user_id)
+
+
+def rebuild_stale_feeds(limit: int = 100) -> int:
+    """Re-rank feeds queued by ``mark_feed_stale``; returns how many were rebuilt."""
+    user_ids = [int(user_id) for user_id in _redis().spop(STALE_USERS_KEY, limit) or []]
+    for user_id in user_ids:
+        try:
+            rebuild_user_feed(user_id)
+        except Exception as e:
+            log_exception(logger, e, "Failed to rebuild stale feed", user_id=user_id)
+    return len(user_ids)
+
+
+def get_user_feed(user_id: int, skip: int = 0, limit: int = 20) -> list:
+    """
+    A page of a user's materialized feed, best first.
+
+    Reads are a single ``ZREVRANGE`` plus a primary-key lookup of the page;
+    a feed whose entries or scoring profile are missing (cold or expired) is
+    rebuilt once, synchronously, since new articles are only merged into
+    feeds that have a profile.
+
+    Returns:
+        list: Article summaries with their feed ``score``.
+    """
+    client = _redis()
+    key = FEED_KEY.format(user_id=user_id)
+    client.zadd(ACTIVE_USERS_KEY, {user_id: time.time()})
+    if client.exists(key, PROFILE_KEY.format(user_id=user_id)) < 2:
+        rebuild_user_feed(user_id)
+    entries = client.zrevrange(key, skip, skip + limit - 1, withscores=True)
+    if not entries:
+        return []
+
+    ids = [int(member) for member, _ in entries]
+    columns, from_sql = select_clause(SUMMARY_FIELDS)
+    rows = execute_query(f"SELECT {columns} FROM {from_sql} WHERE a.id = ANY(%s)", (ids,))["data"]
+    by_id = {row["id"]: row for row in finalize_rows(rows, SUMMARY_FIELDS)}
+    return [dict(by_id[int(member)], score=score) for member, score in entries if int(member) in by_id]
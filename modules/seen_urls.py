@@ -0,0 +1,151 @@
+import os
+import threading
+
+import redis
+
+from app.config import settings
+from app.utilities.bloom_filter import BloomFilter
+from app.utilities.database import execute_query
+from app.utilities.logging import get_logger, log_event, log_exception
+
+logger = get_logger(__name__)
+
+REDIS_KEY = "seen_urls:bloom"
+WARM_CHUNK_SIZE = 50000
+
+
+class SeenUrlFilter:
+    """
+    Probabilistic set of article URLs already stored in the ``articles`` table.
+
+    Aggregation drops entries whose URL is (probably) present before they reach
+    the writer. A false positive only means a new article is skipped for this
+    run; it never causes a duplicate write, because the database still enforces
+    URL uniqueness through ``article_urls``.
+    """
+
+    def __init__(
+        self,
+        capacity: int = settings.SEEN_URL_FILTER_CAPACITY,
+        error_rate: float = settings.SEEN_URL_FILTER_ERROR_RATE,
+        backend: str = settings.SEEN_URL_FILTER_BACKEND,
+        path: str = settings.SEEN_URL_FILTER_PATH,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.backend = backend
+        self.path = path
+        self.bloom: BloomFilter = None
+        self.checked = 0
+        self.filtered = 0
+        self._lock = threading.Lock()
+
+    def ensure_warm(self):
+        """Load the filter from persistence, or rebuild it from the database."""
+        if self.bloom is not None:
+            return
+        with self._lock:
+            if self.bloom is None:
+                self.bloom = self._load() or self._build_from_db()
+
+    def _build_from_db(self) -> BloomFilter:
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        query = "SELECT id, url FROM articles WHERE id > %s ORDER BY id LIMIT %s"
+        last_id = 0
+        while True:
+            rows = execute_query(query, (last_id, WARM_CHUNK_SIZE))["data"]
+            for row in rows:
+                bloom.add(row["url"])
+            if len(rows) < WARM_CHUNK_SIZE:
+                break
+            last_id = rows[-1]["id"]
+        log_event(logger, "SEEN_URLS", f"Warmed seen-URL filter with {len(bloom)} URLs from the database.")
+        return bloom
+
+    def _load(self) -> BloomFilter:
+        try:
+            if self.backend == "disk" and os.path.exists(self.path):
+                with open(self.path, "rb") as f:
+                    data = f.read()
+            elif self.backend == "redis":
+                data = redis.Redis.from_url(settings.REDIS_URL).get(REDIS_KEY)
+            else:
+                return None
+            if not data:
+                return None
+            bloom = BloomFilter.from_bytes(data)
+            if (bloom.capacity, bloom.error_rate) != (self.capacity, self.error_rate):
+                log_event(logger, "SEEN_URLS", "Persisted seen-URL filter has different sizing; rebuilding.", level="WARNING")
+                return None
+            log_event(logger, "SEEN_URLS", f"Loaded seen-URL filter with {len(bloom)} URLs from {self.backend}.")
+            return bloom
+        except Exception as e:
+            log_exception(logger, e, f"Failed to load seen-URL filter from {self.backend}")
+            return None
+
+    def persist(self):
+        """Save the filter to the configured backend, if any."""
+        if self.bloom is None or self.backend not in ("disk", "redis"):
+            return
+        try:
+            with self._lock:
+                data = self.bloom.to_bytes()
+            if self.backend == "disk":
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            else:
+                redis.Redis.from_url(settings.REDIS_URL).set(REDIS_KEY, data)
+        except Exception as e:
+            log_exception(logger, e, f"Failed to persist seen-URL filter to {self.backend}")
+
+    def filter_new(self, articles: list) -> list:
+        """
+        Drop articles whose URL has (probably) been stored already.
+
+        Returns:
+            list: The articles that are likely new.
+        """
+        self.ensure_warm()
+        new_articles = [article for article in articles if article["url"] not in self.bloom]
+        self.checked += len(articles)
+        self.filtered += len(articles) - len(new_articles)
+        return new_articles
+
+    def add_many(self, urls):
+        """Record URLs that are now known to be in the ``articles`` table."""
+        self.ensure_warm()
+        with self._lock:
+            for url in urls:
+                self.bloom.add(url)
+        if len(self.bloom) > self.capacity:
+            log_event(
+                logger,
+                "SEEN_URLS",
+                f"Seen-URL filter holds {len(self.bloom)} URLs, above its capacity of {self.capacity}; "
+                "raise SEEN_URL_FILTER_CAPACITY to keep the false-positive rate down.",
+                level="WARNING",
+            )
+
+    def stats(self) -> dict:
+        """Size, memory footprint and false-positive rate of the filter."""
+        if self.bloom is None:
+            return {"warm": False, "backend": self.backend}
+        return {
+            "warm": True,
+            "backend": self.backend,
+            "urls": len(self.bloom),
+            "capacity": self.capacity,
+            "target_false_positive_rate": self.error_rate,
+            "estimated_false_positive_rate": self.bloom.estimated_false_positive_rate(),
+            "memory_bytes": self.bloom.memory_bytes,
+            "hash_functions": self.bloom.num_hashes,
+            "checked": self.checked,
+            "filtered": self.filtered,
+        }
+
+
+# Instantiate a shared filter instance
+seen_url_filter = SeenUrlFilter()
@@ -2,16 +2,18 @@ from app.utilities.database import execute_query
 from app.utilities.validation import is_valid_url
 from app.utilities.logging import get_logger, log_event, log_exception
 from app.utilities.general import handle_error
+from app.utilities.response_cache import invalidate_tags
+from app.modules.source_geo import source_geo_index, source_geohash
 from datetime import datetime
 
 logger = get_logger(__name__)
 
 LOCAL_SOURCES = [
-    {"name": "Lewiston Tribune", "website": "https://lmtribune.com/rss"},
-    {"name": "Idaho Statesman", "website": "https://idahostatesman.com/local/rss"},
-    {"name": "KLEW TV", "website": "https://klewtv.com/rss"},
-    {"name": "The Moscow-Pullman Daily News", "website": "https://dnews.com/rss"},
-    {"name": "Idaho County Free Press", "website": "https://idahocountyfreepress.com/rss"},
+    {"name": "Lewiston Tribune", "website": "https://lmtribune.com/rss", "latitude": 46.4165, "longitude": -117.0177},
+    {"name": "Idaho Statesman", "website": "https://idahostatesman.com/local/rss", "latitude": 43.6150, "longitude": -116.2023},
+    {"name": "KLEW TV", "website": "https://klewtv.com/rss", "latitude": 46.4165, "longitude": -117.0177},
+    {"name": "The Moscow-Pullman Daily News", "website": "https://dnews.com/rss", "latitude": 46.7324, "longitude": -117.0002},
+    {"name": "Idaho County Free Press", "website": "https://idahocountyfreepress.com/rss", "latitude": 45.9266, "longitude": -116.1224},
 ]
 
 @handle_error
@@ -24,16 +26,22 @@ def discover_sources():
     for source in LOCAL_SOURCES:
         if is_valid_url(source["website"]):
             query = """
-                INSERT INTO news_sources (name, website, status, discovery_timestamp)
-                VALUES (%s, %s, 'active', %s)
-                ON CONFLICT (website) DO NOTHING
+                INSERT INTO news_sources (name, website, status, discovery_timestamp, latitude, longitude, geohash)
+                VALUES (%s, %s, 'active', %s, %s, %s, %s)
+                ON CONFLICT (website) DO UPDATE
+                SET latitude = COALESCE(news_sources.latitude, EXCLUDED.latitude),
+                    longitude = COALESCE(news_sources.longitude, EXCLUDED.longitude),
+                    geohash = COALESCE(news_sources.geohash, EXCLUDED.geohash)
             """
-            params = (source["name"], source["website"], datetime.now())
+            latitude, longitude = source.get("latitude"), source.get("longitude")
+            params = (source["name"], source["website"], datetime.now(), latitude, longitude, source_geohash(latitude, longitude))
             execute_query(query, params)
             log_event(logger, "DISCOVERY", "Source added", source_name=source["name"], website=source["website"])
         else:
             log_event(logger, "VALIDATION", "Invalid source URL skipped", website=source["website"], level="WARNING")
 
+    invalidate_tags("sources")
+    source_geo_index.invalidate()
     log_event(logger, "DISCOVERY", "Source discovery process completed successfully")
 
 @handle_error
@@ -41,10 +49,15 @@ def validate_sources():
     """
     Validate the availability of all sources in the database.
     Updates the source status to 'active' if valid or 'inactive' if unreachable.
+    Sources whose circuit breaker is open are left alone until their retry time.
     """
     log_event(logger, "VALIDATION", "Starting source validation process")
 
-    query = "SELECT id, website FROM news_sources"
+    query = """
+        SELECT id, website,
+               (circuit_state <> 'closed' AND circuit_retry_at > NOW()) AS circuit_blocked
+        FROM news_sources
+    """
     update_query = "UPDATE news_sources SET status = %s WHERE id = %s"
     sources = execute_query(query)["data"]
 
@@ -52,10 +65,16 @@ def validate_sources():
         source_id = source["id"]
         website = source["website"]
 
+        if source.get("circuit_blocked"):
+            log_event(logger, "VALIDATION", "Source skipped, circuit open", source_id=source_id, website=website)
+            continue
+
         status = "active" if is_valid_url(website) else "inactive"
         execute_query(update_query, (status, source_id))
         log_event(logger, "VALIDATION", "Source validated", source_id=source_id, website=website, status=status)
 
+    invalidate_tags("sources")
+    source_geo_index.invalidate()
     log_event(logger, "VALIDATION", "Source validation process completed successfully")
 
 @handle_error
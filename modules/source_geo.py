@@ -0,0 +1,122 @@
+import threading
+import time
+
+from app.config import settings
+from app.modules.article_projection import SUMMARY_FIELDS, finalize_rows, select_clause
+from app.utilities.database import execute_query
+from app.utilities.geohash import GeoIndex, cover_bbox, encode, haversine_km, radius_bbox
+from app.utilities.logging import get_logger, log_event
+
+logger = get_logger(__name__)
+
+POSTGRES = "postgres"
+MEMORY = "memory"
+GEOHASH_PRECISION = 9  # Stored on news_sources.geohash, about 5 m x 5 m
+SOURCE_COLUMNS = "id, name, website, latitude, longitude"
+
+
+def geo_backend() -> str:
+    """The configured geo backend, resolving ``auto`` from ``DATABASE_URL``."""
+    if settings.GEO_BACKEND != "auto":
+        return settings.GEO_BACKEND
+    return POSTGRES if settings.DATABASE_URL.startswith("postgres") else MEMORY
+
+
+def source_geohash(latitude, longitude):
+    """Geohash stored with a source, or None when it has no coordinates."""
+    if latitude is None or longitude is None:
+        return None
+    return encode(float(latitude), float(longitude), GEOHASH_PRECISION)
+
+
+class SourceGeoIndex:
+    """
+    In-process geohash grid of active sources with coordinates.
+
+    Sources change rarely, so the whole set is reloaded from ``news_sources``
+    at most every ``GEO_INDEX_REFRESH_SECONDS``.
+    """
+
+    def __init__(self, precision: int = settings.GEO_INDEX_PRECISION):
+        self.precision = precision
+        self.index: GeoIndex = None
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def ensure_fresh(self):
+        if self.index is not None and time.monotonic() - self.loaded_at < settings.GEO_INDEX_REFRESH_SECONDS:
+            return
+        with self._lock:
+            if self.index is None or time.monotonic() - self.loaded_at >= settings.GEO_INDEX_REFRESH_SECONDS:
+                query = f"""
+                    SELECT {SOURCE_COLUMNS} FROM news_sources
+                    WHERE status = 'active' AND latitude IS NOT NULL AND longitude IS NOT NULL
+                """
+                index = GeoIndex(self.precision)
+                for row in execute_query(query)["data"]:
+                    index.add(row["id"], float(row["latitude"]), float(row["longitude"]), row)
+                self.index = index
+                self.loaded_at = time.monotonic()
+                log_event(logger, "GEO", f"Loaded {len(index)} located sources into the geo index.")
+
+    def invalidate(self):
+        """Reload on next use, e.g. after a source is added or moved."""
+        self.loaded_at = 0.0
+
+
+def _sources_in_cells(cells: list) -> list:
+    # Each prefix is a range scan on ix_news_sources_geohash (text_pattern_ops)
+    conditions = " OR ".join(["geohash LIKE %s"] * len(cells))
+    query = f"SELECT {SOURCE_COLUMNS} FROM news_sources WHERE status = 'active' AND ({conditions})"
+    return execute_query(query, tuple(f"{cell}%" for cell in cells))["data"]
+
+
+def find_sources_near(latitude: float, longitude: float, radius_km: float, limit: int = 50) -> list:
+    """
+    Active sources within ``radius_km`` of a point, nearest first.
+
+    Returns:
+        list: Source rows with an added ``distance_km``.
+    """
+    if geo_backend() == POSTGRES:
+        matches = []
+        for row in _sources_in_cells(cover_bbox(*radius_bbox(latitude, longitude, radius_km))):
+            distance = haversine_km(latitude, longitude, float(row["latitude"]), float(row["longitude"]))
+            if distance <= radius_km:
+                matches.append((distance, row))
+        matches.sort(key=lambda match: match[0])
+    else:
+        source_geo_index.ensure_fresh()
+        matches = [(distance, row) for _, distance, row in source_geo_index.index.within_radius(latitude, longitude, radius_km)]
+    return [dict(row, distance_km=round(distance, 3)) for distance, row in matches[:limit]]
+
+
+def find_sources_within(min_lat: float, min_lon: float, max_lat: float, max_lon: float, limit: int = 50) -> list:
+    """Active sources inside a bounding box."""
+    if geo_backend() == POSTGRES:
+        rows = [
+            row for row in _sources_in_cells(cover_bbox(min_lat, min_lon, max_lat, max_lon))
+            if min_lat <= float(row["latitude"]) <= max_lat and min_lon <= float(row["longitude"]) <= max_lon
+        ]
+    else:
+        source_geo_index.ensure_fresh()
+        rows = [row for _, _, _, row in source_geo_index.index.within_bbox(min_lat, min_lon, max_lat, max_lon)]
+    return rows[:limit]
+
+
+def latest_articles_for_sources(source_ids: list, limit: int = 20) -> list:
+    """The newest article summaries across a set of sources."""
+    if not source_ids:
+        return []
+    columns, from_sql = select_clause(SUMMARY_FIELDS)
+    query = f"""
+        SELECT {columns} FROM {from_sql}
+        WHERE a.source_id = ANY(%s)
+        ORDER BY a.published_at DESC, a.id DESC
+        LIMIT %s
+    """
+    return finalize_rows(execute_query(query, (list(source_ids), limit))["data"], SUMMARY_FIELDS)
+
+
+# Instantiate a shared source geo index
+source_geo_index = SourceGeoIndex()
@@ -0,0 +1,94 @@
+import threading
+
+from app.config import settings
+from app.utilities.database import execute_query
+from app.utilities.logging import get_logger, log_event
+from app.utilities.simhash import SimHashIndex, simhash, to_signed64, to_unsigned64
+
+logger = get_logger(__name__)
+
+
+class StoryClusterIndex:
+    """
+    Assigns near-duplicate articles (e.g. syndicated wire stories published
+    under different URLs) to a shared cluster ID.
+
+    A story's cluster ID is the SimHash of the first article seen for it, so
+    it can be computed before the row is inserted. The index holds the most
+    recent ``NEAR_DUP_INDEX_CAPACITY`` fingerprints of inserted articles and
+    is warmed from the ``articles`` table on first use.
+
+    Only the title and the first ``NEAR_DUP_MAX_TOKENS`` words are
+    fingerprinted. Articles with fewer than ``NEAR_DUP_MIN_FEATURES`` features
+    (e.g. a bare "No Title") are too generic to match on and are left
+    unclustered.
+    """
+
+    def __init__(self, max_distance: int = settings.NEAR_DUP_MAX_DISTANCE, capacity: int = settings.NEAR_DUP_INDEX_CAPACITY):
+        self.max_distance = max_distance
+        self.capacity = capacity
+        self.index: SimHashIndex = None
+        self._lock = threading.Lock()
+
+    def ensure_warm(self):
+        if self.index is not None:
+            return
+        with self._lock:
+            if self.index is None:
+                index = SimHashIndex(self.max_distance, self.capacity)
+                query = """
+                    SELECT simhash, cluster_id FROM articles
+                    WHERE simhash IS NOT NULL
+                    ORDER BY id DESC
+                    LIMIT %s
+                """
+                rows = execute_query(query, (self.capacity,))["data"]
+                for row in reversed(rows):
+                    index.add(to_unsigned64(row["simhash"]), row["cluster_id"])
+                self.index = index
+                log_event(logger, "CLUSTERING", f"Warmed near-duplicate index with {len(rows)} fingerprints.")
+
+    def assign(self, articles: list) -> list:
+        """
+        Set ``simhash`` and ``cluster_id`` on a batch of articles about to be inserted.
+
+        Copies of one story within the batch share a cluster. The fingerprints
+        are not indexed until ``remember`` is called with the rows that were
+        actually inserted.
+
+        Returns:
+            list: The same articles.
+        """
+        self.ensure_warm()
+        batch = SimHashIndex(self.max_distance, max(len(articles), 1))
+        for article in articles:
+            fingerprint = simhash(
+                f"{article['title']} {article.get('content') or ''}",
+                max_tokens=settings.NEAR_DUP_MAX_TOKENS,
+                min_features=settings.NEAR_DUP_MIN_FEATURES,
+            )
+            if fingerprint is None:
+                article["simhash"] = article["cluster_id"] = None
+                continue
+            with self._lock:
+                cluster_id = self.index.find(fingerprint)
+            if cluster_id is None:
+                cluster_id = batch.find(fingerprint)
+            if cluster_id is None:
+                cluster_id = to_signed64(fingerprint)
+            batch.add(fingerprint, cluster_id)
+            article["simhash"] = to_signed64(fingerprint)
+            article["cluster_id"] = cluster_id
+        return articles
+
+    def remember(self, articles: list):
+        """Index the fingerprints of articles that were inserted, so later copies join their clusters."""
+        self.ensure_warm()
+        with self._lock:
+            for article in articles:
+                if article.get("simhash") is not None:
+                    self.index.add(to_unsigned64(article["simhash"]), article["cluster_id"])
+
+
+# Instantiate a shared cluster index
+story_cluster_index = StoryClusterIndex()
@@ -0,0 +1,161 @@
+import time
+
+import redis
+
+from app.config import settings
+from app.modules.article_projection import SUMMARY_FIELDS, finalize_rows, select_clause
+from app.utilities.database import execute_query
+from app.utilities.logging import get_logger, log_event, log_exception
+
+logger = get_logger(__name__)
+
+TRENDING_KEY = "trending:articles"
+LANDMARK_KEY = "trending:landmark"
+BUILT_KEY = "trending:built"  # Absent after a Redis flush, which triggers a rebuild from the database
+# Rescale before forward-decayed scores (2 ** elapsed half-lives) lose range
+REBASE_AFTER_HALF_LIVES = 64
+
+FEEDBACK_WEIGHTS = {"like": 1.0, "dislike": -0.5, "flag": -1.0}
+DEFAULT_FEEDBACK_WEIGHT = 0.5  # Any other reaction still counts as engagement
+
+# Reads the landmark and adds the forward-decayed increment atomically, so a
+# concurrent rebase can never apply an increment at the wrong scale.
+_INCREMENT_SCRIPT = """
+local landmark = tonumber(redis.call('GET', KEYS[2]))
+if not landmark then
+    landmark = tonumber(ARGV[2])
+    redis.call('SET', KEYS[2], ARGV[2])
+end
+local increment = tonumber(ARGV[1]) * 2 ^ ((tonumber(ARGV[2]) - landmark) / tonumber(ARGV[3]))
+return redis.call('ZINCRBY', KEYS[1], increment, ARGV[4])
+"""
+
+_client: redis.Redis = None
+_increment = None
+
+
+def _redis() -> redis.Redis:
+    global _client, _increment
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+        _increment = _client.register_script(_INCREMENT_SCRIPT)
+    return _client
+
+
+def _half_life_seconds() -> float:
+    return settings.TRENDING_HALF_LIFE_HOURS * 3600
+
+
+def feedback_weight(feedback_type: str, impact_score: int = 1) -> float:
+    """Contribution of one reaction to an article's trending score, before decay."""
+    return FEEDBACK_WEIGHTS.get(feedback_type, DEFAULT_FEEDBACK_WEIGHT) * (impact_score or 1)
+
+
+def decay_factor(landmark: float, now: float, half_life_seconds: float) -> float:
+    """Factor turning a stored (forward-decayed) score into its value at ``now``."""
+    return 2 ** (-(now - landmark) / half_life_seconds)
+
+
+def record_feedback(content_id: int, feedback_type: str, impact_score: int = 1, timestamp: float = None):
+    """
+    Add one reaction to an article's trending score.
+
+    Scores use forward decay: a reaction at time ``t`` adds
+    ``weight * 2 ** ((t - landmark) / half_life)``. Every stored score then
+    shrinks by the same factor as time passes, so ranking by stored score is
+    ranking by time-decayed score, and each reaction is a single ZINCRBY.
+    """
+    _redis()
+    _increment(
+        keys=[TRENDING_KEY, LANDMARK_KEY],
+        args=[feedback_weight(feedback_type, impact_score), timestamp or time.time(), _half_life_seconds(), content_id],
+    )
+
+
+def get_trending(limit: int = 20, skip: int = 0) -> list:
+    """
+    The currently trending articles, hottest first.
+
+    Returns:
+        list: Article summaries with their current decayed ``trend_score``.
+    """
+    client = _redis()
+    landmark = client.get(LANDMARK_KEY)
+    entries = client.zrevrange(TRENDING_KEY, skip, skip + limit - 1, withscores=True)
+    entries = [(int(member), score) for member, score in entries if score > 0]
+    if not entries or landmark is None:
+        return []
+
+    factor = decay_factor(float(landmark), time.time(), _half_life_seconds())
+    columns, from_sql = select_clause(SUMMARY_FIELDS)
+    rows = execute_query(f"SELECT {columns} FROM {from_sql} WHERE a.id = ANY(%s)", ([member for member, _ in entries],))["data"]
+    by_id = {row["id"]: row for row in finalize_rows(rows, SUMMARY_FIELDS)}
+    return [dict(by_id[member], trend_score=round(score * factor, 4)) for member, score in entries if member in by_id]
+
+
+def maintain_trending():
+    """
+    Periodic upkeep of the trending set.
+
+    Drops articles whose decayed score fell below ``TRENDING_MIN_SCORE``, caps
+    the set at ``TRENDING_MAX_ITEMS``, rebuilds it from recent feedback if it
+    is missing (e.g. after a Redis flush), and rescales it before scores
+    outgrow their useful range.
+    """
+    client = _redis()
+    now = time.time()
+    half_life = _half_life_seconds()
+    if not client.exists(BUILT_KEY):
+        rebuild_trending(now)
+        return
+    landmark = float(client.get(LANDMARK_KEY) or now)
+
+    threshold = settings.TRENDING_MIN_SCORE / decay_factor(landmark, now, half_life)
+    pipeline = client.pipeline()
+    pipeline.zremrangebyscore(TRENDING_KEY, "-inf", f"({threshold}")
+    pipeline.zremrangebyrank(TRENDING_KEY, 0, -settings.TRENDING_MAX_ITEMS - 1)
+    pipeline.execute()
+
+    if (now - landmark) / half_life >= REBASE_AFTER_HALF_LIVES:
+        factor = decay_factor(landmark, now, half_life)
+        # ZUNIONSTORE and the new landmark apply in one MULTI; increments run as scripts, so never in between
+        pipeline = client.pipeline()
+        pipeline.zunionstore(TRENDING_KEY, {TRENDING_KEY: factor})
+        pipeline.set(LANDMARK_KEY, now)
+        pipeline.execute()
+        log_event(logger, "TRENDING", "Rescaled trending scores to a new landmark.")
+
+
+def rebuild_trending(now: float = None):
+    """Recompute the trending set from the last ``TRENDING_REBUILD_HALF_LIVES`` half-lives of feedback."""
+    now = now or time.time()
+    half_life = _half_life_seconds()
+    window = half_life * settings.TRENDING_REBUILD_HALF_LIVES
+    # Feedback timestamps are naive UTC; NOW() would follow the session time zone
+    query = """
+        SELECT content_id, feedback_type, impact_score, EXTRACT(EPOCH FROM timestamp) AS ts
+        FROM feedback
+        WHERE timestamp >= timezone('utc', now()) - make_interval(secs => %s)
+    """
+    scores = {}
+    for row in execute_query(query, (window,))["data"]:
+        weight = feedback_weight(row["feedback_type"], row["impact_score"])
+        scores[row["content_id"]] = scores.get(row["content_id"], 0.0) + weight * 2 ** ((float(row["ts"]) - now) / half_life)
+
+    scores = {content_id: score for content_id, score in scores.items() if score >= settings.TRENDING_MIN_SCORE}
+    pipeline = _redis().pipeline()
+    pipeline.delete(TRENDING_KEY)
+    if scores:
+        pipeline.zadd(TRENDING_KEY, scores)
+    pipeline.set(LANDMARK_KEY, now)
+    pipeline.set(BUILT_KEY, now)
+    pipeline.execute()
+    log_event(logger, "TRENDING", f"Rebuilt trending set with {len(scores)} articles from recent feedback.")
+
+
+def safe_record_feedback(content_id: int, feedback_type: str, impact_score: int = 1):
+    """``record_feedback`` for write paths: a Redis hiccup must not fail the feedback write."""
+    try:
+        record_feedback(content_id, feedback_type, impact_score)
+    except Exception as e:
+        log_exception(logger, e, "Failed to update trending score", content_id=content_id)
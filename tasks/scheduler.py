@@ -3,6 +3,11 @@ from app.modules.content_aggregation import aggregate_articles
 from app.modules.weather import fetch_weather
 from app.modules.market_data import fetch_market_data
 from app.modules.emergency_alerts import fetch_emergency_alerts
+from app.modules.poll_scheduler import claim_due_sources, record_poll_result
+from app.modules.preferences import add_articles_to_feeds, rebuild_stale_feeds
+from app.modules.trending import maintain_trending
+from app.modules.partitions import maintain_partitions
+from app.config import settings
 from app.utilities.logging import log_event, log_exception
 from datetime import datetime
 
@@ -17,11 +22,94 @@ def aggregate_content(self):
     log_event("SCHEDULER", "Starting scheduled content aggregation.")
     try:
         result = aggregate_articles()
-        log_event("SCHEDULER", f"Content aggregation completed. Articles aggregated: {result['total_articles']}")
+        log_event(
+            "SCHEDULER",
+            f"Content aggregation completed. Articles aggregated: {result['total_articles']}, "
+            f"feeds parsed: {result.get('feeds_parsed', 0)}, feeds skipped: {result.get('feeds_skipped', 0)}",
+        )
     except Exception as e:
         log_exception(e, "Failed to aggregate content during scheduled task")
         raise
 
+@app.task(bind=True)
+def dispatch_due_sources(self):
+    """
+    Celery task to send every source whose next poll is due to its own aggregation task.
+    """
+    try:
+        source_ids = claim_due_sources()
+        for source_id in source_ids:
+            aggregate_source.delay(source_id)
+        log_event("SCHEDULER", f"Dispatched {len(source_ids)} due sources for aggregation.")
+    except Exception as e:
+        log_exception(e, "Failed to dispatch due sources")
+        raise
+
+@app.task(bind=True)
+def aggregate_source(self, source_id: int):
+    """
+    Celery task to aggregate a single source and schedule its next poll.
+    """
+    log_event("SCHEDULER", f"Starting aggregation for source {source_id}.")
+    try:
+        result = aggregate_articles(source_ids=[source_id])
+        record_poll_result(source_id)
+        log_event("SCHEDULER", f"Aggregation for source {source_id} completed. Articles aggregated: {result.get('total_articles', 0)}")
+    except Exception as e:
+        log_exception(e, f"Failed to aggregate source {source_id}")
+        raise
+
+@app.task(bind=True)
+def merge_articles_into_feeds(self, article_ids: list):
+    """
+    Celery task to score newly inserted articles for every active user and merge them into their feeds.
+    """
+    try:
+        add_articles_to_feeds(article_ids)
+    except Exception as e:
+        log_exception(e, f"Failed to merge {len(article_ids)} new articles into user feeds")
+        raise
+
+@app.task(bind=True)
+def refresh_stale_feeds(self):
+    """
+    Celery task to re-rank personalized feeds whose users left new feedback.
+    """
+    try:
+        rebuilt = rebuild_stale_feeds()
+        if rebuilt:
+            log_event("SCHEDULER", f"Re-ranked {rebuilt} personalized feeds.")
+    except Exception as e:
+        log_exception(e, "Failed to refresh stale feeds")
+        raise
+
+@app.task(bind=True)
+def maintain_trending_scores(self):
+    """
+    Celery task to prune and rescale the trending set.
+    """
+    try:
+        maintain_trending()
+    except Exception as e:
+        log_exception(e, "Failed to maintain trending scores")
+        raise
+
+@app.task(bind=True)
+def maintain_table_partitions(self):
+    """
+    Celery task to create upcoming monthly partitions and archive expired ones to Parquet.
+    """
+    try:
+        result = maintain_partitions()
+        if result["created"] or result["archived"]:
+            log_event(
+                "SCHEDULER",
+                f"Partition maintenance: created {len(result['created'])}, archived {len(result['archived'])} partitions.",
+            )
+    except Exception as e:
+        log_exception(e, "Failed to maintain table partitions")
+        raise
+
 @app.task(bind=True)
 def update_weather(self, location: str):
     """
@@ -73,8 +161,33 @@ def setup_periodic_tasks(sender, **kwargs):
     """
     Register periodic tasks with the Celery scheduler.
     """
-    # Schedule content aggregation every hour
-    sender.add_periodic_task(3600.0, aggregate_content.s(), name="Aggregate content every hour")
+    # Dispatch sources whose adaptive poll time has come; each source is aggregated by its own task
+    sender.add_periodic_task(
+        settings.POLL_DISPATCH_INTERVAL_SECONDS,
+        dispatch_due_sources.s(),
+        name="Dispatch due sources for aggregation",
+    )
+
+    # Re-rank personalized feeds after new feedback
+    sender.add_periodic_task(
+        settings.FEED_REFRESH_INTERVAL_SECONDS,
+        refresh_stale_feeds.s(),
+        name="Refresh stale personalized feeds",
+    )
+
+    # Prune and rescale trending scores
+    sender.add_periodic_task(
+        settings.TRENDING_MAINTENANCE_INTERVAL_SECONDS,
+        maintain_trending_scores.s(),
+        name="Maintain trending scores",
+    )
+
+    # Keep monthly partitions ahead of inserts and archive those past retention
+    sender.add_periodic_task(
+        settings.PARTITION_MAINTENANCE_INTERVAL_SECONDS,
+        maintain_table_partitions.s(),
+        name="Maintain table partitions",
+    )
 
     # Schedule weather updates every 30 minutes for default location
     sender.add_periodic_task(1800.0, update_weather.s("Lewiston"), name="Update weather every 30 minutes")
@@ -0,0 +1,25 @@
+import json
+from datetime import datetime
+from app.modules.article_export import iter_csv, iter_ndjson
+
+BATCHES = [
+    [{"id": 1, "title": "Snow, again", "published_at": datetime(2024, 12, 1, 12, 0), "transparency_metadata": {"source": "KLEW"}}],
+    [{"id": 2, "title": "Budget", "published_at": datetime(2024, 12, 2, 8, 30), "transparency_metadata": None}],
+]
+FIELDS = ("id", "title", "published_at", "transparency_metadata")
+
+def test_ndjson_writes_one_line_per_article():
+    lines = b"".join(iter_ndjson(BATCHES)).decode("utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [1, 2]
+    assert json.loads(lines[0])["published_at"] == "2024-12-01T12:00:00"
+
+def test_csv_streams_header_then_one_chunk_per_batch():
+    chunks = list(iter_csv(iter(BATCHES), FIELDS))
+    assert len(chunks) == 2
+    rows = b"".join(chunks).decode("utf-8").splitlines()
+    assert rows[0] == "id,title,published_at,transparency_metadata"
+    assert rows[1] == '1,"Snow, again",2024-12-01T12:00:00,"{""source"": ""KLEW""}"'
+    assert rows[2] == "2,Budget,2024-12-02T08:30:00,"
+
+def test_csv_of_empty_export_is_just_the_header():
+    assert b"".join(iter_csv(iter([]), FIELDS)) == b"id,title,published_at,transparency_metadata\r\n"
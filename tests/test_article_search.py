@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import create_engine
+
+from app.modules.article_search import ArticleSearchIndex, search_articles
+
+def test_search_runs_end_to_end_on_sqlite(mocker):
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT, url TEXT, source_id INTEGER, published_at DATETIME)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO articles VALUES "
+            "(1, 'Flood warning for the river', 'Water is rising downtown.', 'https://example.com/1', 1, '2026-10-17 08:00:00'), "
+            "(2, 'Budget vote', 'Council delays the budget after the flood.', 'https://example.com/2', 2, '2026-10-18 09:00:00'), "
+            "(3, 'Farmers market', 'Fresh produce on Saturday.', 'https://example.com/3', 1, '2026-10-18 10:00:00')"
+        )
+    mocker.patch("app.modules.article_search.engine", engine)
+    mocker.patch("app.modules.article_search.settings.SEARCH_BACKEND", "memory")
+    mocker.patch("app.modules.article_search.article_search_index", ArticleSearchIndex())
+
+    assert [article["id"] for article in search_articles("flood")] == [1, 2]
+    assert [article["id"] for article in search_articles("flood", sort="recent")] == [2, 1]
+    assert search_articles("flood", source_ids=[2])[0]["published_at"] == datetime(2026, 10, 18, 9, 0)
+
+    with engine.begin() as connection:
+        connection.exec_driver_sql("INSERT INTO articles VALUES (4, 'Flood cleanup', '', 'https://example.com/4', 1, '2026-10-18 11:00:00')")
+    assert 4 in [article["id"] for article in search_articles("flood")]
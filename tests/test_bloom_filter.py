@@ -0,0 +1,25 @@
+import pytest
+from app.utilities.bloom_filter import BloomFilter
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    urls = [f"https://example.com/article/{n}" for n in range(1000)]
+    for url in urls:
+        bloom.add(url)
+    assert all(url in bloom for url in urls)
+
+def test_bloom_filter_false_positive_rate_is_near_target():
+    bloom = BloomFilter(capacity=5000, error_rate=0.01)
+    for n in range(5000):
+        bloom.add(f"https://example.com/seen/{n}")
+    false_positives = sum(f"https://example.com/unseen/{n}" in bloom for n in range(10000))
+    assert false_positives / 10000 < 0.02
+    assert bloom.estimated_false_positive_rate() == pytest.approx(0.01, rel=0.2)
+
+def test_bloom_filter_round_trips_through_bytes():
+    bloom = BloomFilter(capacity=100, error_rate=0.001)
+    bloom.add("https://example.com/a")
+    restored = BloomFilter.from_bytes(bloom.to_bytes())
+    assert "https://example.com/a" in restored
+    assert len(restored) == 1
+    assert restored.memory_bytes == bloom.memory_bytes
@@ -0,0 +1,30 @@
+from app.modules.circuit_breaker import CLOSED, OPEN, HALF_OPEN, compute_retry_delay, next_circuit_state, filter_permitted_sources
+from app.config import settings
+
+def test_circuit_opens_after_threshold_failures():
+    threshold = settings.CIRCUIT_FAILURE_THRESHOLD
+    assert next_circuit_state(CLOSED, threshold - 1, success=False) == CLOSED
+    assert next_circuit_state(CLOSED, threshold, success=False) == OPEN
+
+def test_half_open_probe_result_decides_state():
+    assert next_circuit_state(HALF_OPEN, 1, success=True) == CLOSED
+    assert next_circuit_state(HALF_OPEN, 1, success=False) == OPEN
+
+def test_retry_delay_backs_off_exponentially_up_to_cap():
+    threshold = settings.CIRCUIT_FAILURE_THRESHOLD
+    base = settings.CIRCUIT_BASE_RETRY_SECONDS
+    assert compute_retry_delay(threshold) == base
+    assert compute_retry_delay(threshold + 2) == base * 4
+    assert compute_retry_delay(threshold + 50) == settings.CIRCUIT_MAX_RETRY_SECONDS
+
+def test_filter_permitted_sources_sends_claimed_probes_only(mocker):
+    mocker.patch("app.modules.circuit_breaker.execute_query", return_value={"data": [{"id": 2}]})
+    sources = [
+        {"id": 1, "circuit_state": CLOSED},
+        {"id": 2, "circuit_state": OPEN},
+        {"id": 3, "circuit_state": OPEN},
+    ]
+    permitted, blocked = filter_permitted_sources(sources)
+    assert [source["id"] for source in permitted] == [1, 2]
+    assert permitted[1]["circuit_state"] == HALF_OPEN
+    assert [source["id"] for source in blocked] == [3]
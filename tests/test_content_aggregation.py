@@ -1,16 +1,55 @@
 from app.modules.content_aggregation import aggregate_articles, fetch_rss_feed, save_articles_to_db
+from app.modules.story_clusters import StoryClusterIndex
 from unittest.mock import patch
+import hashlib
 
 def test_aggregate_articles(mocker):
     """
     Test the aggregate_articles function to ensure it fetches and saves articles.
     """
+    mocker.patch("app.modules.content_aggregation.execute_query", return_value={
+        "data": [{"id": 1, "website": "https://example.com/rss"}]
+    })
+    mocker.patch("app.modules.feed_fetcher.FeedFetcher.fetch", return_value={
+        "source_id": 1, "url": "https://example.com/rss", "status": 200, "content": b"<rss/>",
+        "etag": None, "last_modified": None, "elapsed": 0.1, "error": None
+    })
     mocker.patch("app.modules.content_aggregation.fetch_rss_feed", return_value=[
         {"title": "Test Article", "url": "https://example.com/test", "source_id": 1}
     ])
-    mocker.patch("app.modules.content_aggregation.save_articles_to_db")
+    mocker.patch("app.modules.content_aggregation.record_fetch_result")
+    mocker.patch("app.modules.content_aggregation.seen_url_filter.filter_new", side_effect=lambda articles: articles)
+    mocker.patch("app.modules.content_aggregation.seen_url_filter.persist")
+    mocker.patch("app.modules.content_aggregation.save_articles_to_db", return_value={"inserted": 1, "duplicates": 0, "failed": 0})
     result = aggregate_articles()
     assert result["total_articles"] == 1
+    assert result["articles_inserted"] == 1
+
+def test_aggregate_articles_skips_unchanged_feeds(mocker):
+    """
+    Test that 304 responses and unchanged bodies are counted as skipped, not parsed.
+    """
+    body = b"<rss/>"
+    mocker.patch("app.modules.content_aggregation.execute_query", return_value={
+        "data": [
+            {"id": 1, "website": "https://a.example.com/rss", "etag": '"v1"', "last_modified": None, "content_hash": None},
+            {"id": 2, "website": "https://b.example.com/rss", "etag": None, "last_modified": None,
+             "content_hash": hashlib.sha256(body).hexdigest()},
+        ]
+    })
+    mocker.patch("app.modules.feed_fetcher.FeedFetcher.fetch", side_effect=[
+        {"source_id": 1, "url": "https://a.example.com/rss", "status": 304, "content": None,
+         "etag": '"v1"', "last_modified": None, "elapsed": 0.1, "error": None},
+        {"source_id": 2, "url": "https://b.example.com/rss", "status": 200, "content": body,
+         "etag": None, "last_modified": None, "elapsed": 0.1, "error": None},
+    ])
+    parse = mocker.patch("app.modules.content_aggregation.fetch_rss_feed")
+    mocker.patch("app.modules.content_aggregation.record_fetch_result")
+    mocker.patch("app.modules.content_aggregation.seen_url_filter.persist")
+    result = aggregate_articles()
+    parse.assert_not_called()
+    assert result["feeds_skipped"] == 2
+    assert result["feeds_parsed"] == 0
 
 def test_fetch_rss_feed():
     """
@@ -26,13 +65,118 @@ def test_fetch_rss_feed():
         assert len(articles) == 1
         assert articles[0]["title"] == "Test Article"
 
+def test_fetch_rss_feed_parses_downloaded_bytes():
+    """
+    Test that fetch_rss_feed parses a downloaded body without touching the network.
+    """
+    body = b"""<?xml version="1.0"?>
+    <rss version="2.0"><channel><title>Example</title>
+    <item><title>Bytes Article</title><link>https://example.com/bytes</link></item>
+    </channel></rss>"""
+    articles = fetch_rss_feed("https://example.com/rss", 1, content=body)
+    assert len(articles) == 1
+    assert articles[0]["url"] == "https://example.com/bytes"
+    assert articles[0]["transparency_metadata"]["source_name"] == "Example"
+
+def _article(n):
+    return {
+        "title": f"Article {n}",
+        "content": f"Story number {n} from the example wire service, reported in full detail by our correspondent today.",
+        "url": f"https://example.com/{n}",
+        "published_at": None,
+        "source_id": 1,
+        "transparency_metadata": {"source_name": "Example", "rss_url": "https://example.com/rss", "fetched_at": "2024-12-01 12:00:00"},
+    }
+
 def test_save_articles_to_db(mocker):
     """
-    Test the save_articles_to_db function to ensure articles are saved correctly.
+    Test that save_articles_to_db writes one multi-row statement per batch and counts duplicates.
+    """
+    mocker.patch("app.modules.content_aggregation.seen_url_filter.add_many")
+    mocker.patch("app.modules.story_clusters.execute_query", return_value={"data": []})
+    add_to_feeds = mocker.patch("app.modules.content_aggregation._queue_feed_merge")
+    engine = mocker.patch("app.modules.content_aggregation.engine")
+    connection = engine.begin.return_value.__enter__.return_value
+    connection.exec_driver_sql.return_value.fetchall.side_effect = [
+        [(1, "https://example.com/0"), (2, "https://example.com/1")],
+        [(3, "https://example.com/2")],
+    ]
+    articles = [_article(n) for n in range(4)]
+    result = save_articles_to_db(articles, batch_size=2)
+    assert connection.exec_driver_sql.call_count == 2
+    assert result == {"inserted": 3, "duplicates": 1, "failed": 0}
+    assert all(article["cluster_id"] is not None for article in articles)
+    assert [article_id for call in add_to_feeds.call_args_list for article_id, _ in call.args[0]] == [1, 2, 3]
+
+def test_save_articles_to_db_indexes_only_inserted_articles(mocker):
+    """
+    Test that a row skipped by ON CONFLICT leaves no fingerprint behind for later articles to cluster with.
+    """
+    mocker.patch("app.modules.content_aggregation.seen_url_filter.add_many")
+    mocker.patch("app.modules.content_aggregation._queue_feed_merge")
+    mocker.patch("app.modules.story_clusters.execute_query", return_value={"data": []})
+    index = StoryClusterIndex()
+    mocker.patch("app.modules.content_aggregation.story_cluster_index", index)
+    engine = mocker.patch("app.modules.content_aggregation.engine")
+    engine.begin.return_value.__enter__.return_value.exec_driver_sql.return_value.fetchall.return_value = [
+        (1, "https://example.com/0")
+    ]
+    save_articles_to_db([_article(0), _article(1)])
+    assert len(index.index) == 1
+
+def test_short_articles_are_not_clustered(mocker):
+    """
+    Test that articles too short to fingerprint get no cluster instead of all sharing one.
     """
-    mocker.patch("app.utilities.database.execute_query")
-    articles = [{"title": "Test Article", "url": "https://example.com/test", "source_id": 1}]
-    save_articles_to_db(articles)
-    # No exception should occur, indicating successful execution.
-    assert True
+    mocker.patch("app.modules.story_clusters.execute_query", return_value={"data": []})
+    articles = [{"title": "No Title", "content": ""}, {"title": "No Title", "content": None}]
+    StoryClusterIndex().assign(articles)
+    assert [article["cluster_id"] for article in articles] == [None, None]
+
+def _aggregate_one_feed(mocker, saved):
+    mocker.patch("app.modules.content_aggregation.execute_query", return_value={
+        "data": [{"id": 1, "website": "https://example.com/rss", "etag": None, "last_modified": None, "content_hash": None}]
+    })
+    mocker.patch("app.modules.feed_fetcher.FeedFetcher.fetch", return_value={
+        "source_id": 1, "url": "https://example.com/rss", "status": 200, "content": b"<rss/>",
+        "etag": '"v2"', "last_modified": None, "elapsed": 0.1, "error": None
+    })
+    mocker.patch("app.modules.content_aggregation.fetch_rss_feed", return_value=[
+        {"title": "Flood", "url": "https://example.com/flood", "source_id": 1},
+        {"title": "Seen", "url": "https://example.com/seen", "source_id": 1},
+    ])
+    mocker.patch("app.modules.content_aggregation.record_fetch_result")
+    mocker.patch("app.modules.content_aggregation.seen_url_filter.filter_new", side_effect=lambda articles: articles[:1])
+    mocker.patch("app.modules.content_aggregation.seen_url_filter.persist")
+    save = mocker.patch("app.modules.content_aggregation.save_articles_to_db", return_value=saved)
+    validators = mocker.patch("app.modules.content_aggregation.update_feed_validators")
+    aggregate_articles()
+    save.assert_called_once()
+    return validators
+
+def test_feed_validators_are_saved_after_the_articles_are_written(mocker):
+    validators = _aggregate_one_feed(mocker, {"inserted": 1, "duplicates": 0, "failed": 0})
+    validators.assert_called_once_with(1, '"v2"', None, hashlib.sha256(b"<rss/>").hexdigest())
 
+def test_feed_validators_are_kept_when_a_write_fails(mocker):
+    validators = _aggregate_one_feed(mocker, {"inserted": 0, "duplicates": 0, "failed": 1})
+    validators.assert_not_called()
+
+def test_feed_is_deferred_when_its_parse_times_out(mocker):
+    """
+    Test that a feed whose parse timed out keeps its old validators, so the next poll parses it again.
+    """
+    mocker.patch("app.modules.content_aggregation.execute_query", return_value={
+        "data": [{"id": 1, "website": "https://example.com/rss", "etag": None, "last_modified": None, "content_hash": None}]
+    })
+    mocker.patch("app.modules.feed_fetcher.FeedFetcher.fetch", return_value={
+        "source_id": 1, "url": "https://example.com/rss", "status": 200, "content": b"<rss/>",
+        "etag": '"v2"', "last_modified": None, "elapsed": 0.1, "error": None
+    })
+    mocker.patch("app.modules.content_aggregation.parse_feed_offloaded", return_value=None)
+    mocker.patch("app.modules.content_aggregation.record_fetch_result")
+    save = mocker.patch("app.modules.content_aggregation.save_articles_to_db")
+    validators = mocker.patch("app.modules.content_aggregation.update_feed_validators")
+    aggregate_articles()
+    save.assert_not_called()
+    validators.assert_not_called()
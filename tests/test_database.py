@@ -0,0 +1,69 @@
+import contextvars
+import sqlite3
+import time
+
+import pytest
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.utilities.database import (
+    InstrumentedQueuePool,
+    ReplicaRouter,
+    _numbered_placeholders,
+    is_read_statement,
+    note_statement,
+    pinned_to_primary,
+    pool_metrics,
+)
+
+def test_placeholders_are_numbered_for_prepare():
+    assert _numbered_placeholders("SELECT * FROM articles WHERE id = %s AND title LIKE '%%storm' LIMIT %s") == (
+        "SELECT * FROM articles WHERE id = $1 AND title LIKE '%storm' LIMIT $2", 2,
+    )
+
+def test_pool_records_waits_and_exhaustion():
+    pool_metrics.reset()
+    pool = InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), pool_size=1, max_overflow=0, timeout=0.05)
+    connection = pool.connect()
+    with pytest.raises(PoolTimeoutError):
+        pool.connect()
+    connection.close()
+    pool.connect().close()
+
+    metrics = pool_metrics.as_dict()
+    assert metrics["timeouts"] == 1
+    assert metrics["wait"]["count"] == 3
+    assert metrics["wait"]["max_ms"] >= 50
+
+def test_only_plain_reads_are_sent_to_replicas():
+    assert is_read_statement("  select * from articles where id = %s")
+    assert not is_read_statement("SELECT * FROM articles WHERE id = %s FOR UPDATE")
+    assert not is_read_statement("WITH inserted AS (INSERT INTO feedback VALUES (%s)) SELECT 1")
+    assert not is_read_statement("UPDATE users SET preferences = %s WHERE id = %s")
+
+def _router(lags):
+    router = ReplicaRouter([f"sqlite:///replica{index}.db" for index in range(len(lags))], max_lag_seconds=5)
+    for replica, lag in zip(router.replicas, lags):
+        replica.healthy, replica.lag_seconds = lag is not None, lag or 0.0
+    router.checked_at = time.monotonic()
+    return router
+
+def test_router_skips_lagging_and_unhealthy_replicas():
+    router = _router([30.0, None, 0.5])
+    assert {router.choose() for _ in range(5)} == {router.replicas[2]}
+    router.replicas[2].lag_seconds = 10.0
+    assert router.choose() is None
+
+def test_router_balances_by_queries_in_flight():
+    router = _router([0.0, 0.0])
+    with router.replicas[0].use():
+        assert router.choose() is router.replicas[1]
+
+def test_reads_stay_on_the_primary_after_a_write():
+    def request():
+        router = _router([0.0])
+        assert router.choose() is router.replicas[0]
+        note_statement("INSERT INTO feedback (user_id) VALUES (%s)")
+        return router.choose()
+
+    assert contextvars.copy_context().run(request) is None
+    assert not pinned_to_primary()
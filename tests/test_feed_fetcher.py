@@ -0,0 +1,37 @@
+import asyncio
+
+from app.modules.feed_fetcher import FeedFetcher
+
+class _Response:
+    status_code = 200
+    headers = {}
+    content = b"<rss/>"
+
+    def raise_for_status(self):
+        pass
+
+class _Client:
+    """Requests to slow.example hang until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def get(self, url, headers=None):
+        if "slow.example" in url:
+            await self.release.wait()
+        return _Response()
+
+def test_slow_host_does_not_starve_other_hosts():
+    async def run():
+        fetcher = FeedFetcher(max_concurrency=2, per_host_limit=1)
+        await fetcher.connect()
+        await fetcher.client.aclose()
+        fetcher.client = _Client()
+        slow = [asyncio.create_task(fetcher.fetch(f"https://slow.example/{n}")) for n in range(3)]
+        await asyncio.sleep(0)
+        fast = await asyncio.wait_for(fetcher.fetch("https://fast.example/rss"), timeout=1)
+        fetcher.client.release.set()
+        await asyncio.gather(*slow)
+        return fast
+
+    assert asyncio.run(run())["content"] == b"<rss/>"
@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from app.modules import feed_parsing
+from app.modules.feed_parsing import parse_feed_offloaded
+
+PARSED = (False, "Example", ())
+
+def _setup(mocker, offload_bytes=100):
+    mocker.patch.object(feed_parsing.settings, "FEED_PARSE_OFFLOAD_BYTES", offload_bytes)
+    pool = mocker.Mock(_processes={})
+    mocker.patch("app.modules.feed_parsing.get_parse_pool", return_value=pool)
+    inline = mocker.patch("app.modules.feed_parsing.parse_feed", return_value=PARSED)
+    return pool, inline
+
+def test_small_feeds_are_parsed_inline(mocker):
+    pool, inline = _setup(mocker)
+    assert parse_feed_offloaded(b"x" * 99) == PARSED
+    pool.submit.assert_not_called()
+    inline.assert_called_once_with(b"x" * 99)
+
+def test_large_feeds_are_parsed_in_the_pool(mocker):
+    pool, inline = _setup(mocker)
+    pool.submit.return_value.result.return_value = PARSED
+    assert parse_feed_offloaded(b"x" * 100) == PARSED
+    pool.submit.assert_called_once()
+    inline.assert_not_called()
+
+def test_pool_failure_falls_back_to_inline_parse(mocker):
+    pool, inline = _setup(mocker)
+    pool.submit.side_effect = RuntimeError("daemonic processes are not allowed to have children")
+    assert parse_feed_offloaded(b"x" * 100) == PARSED
+    inline.assert_called_once()
+
+def test_broken_pool_is_restarted_on_next_use(mocker):
+    pool, inline = _setup(mocker)
+    pool.submit.return_value.result.side_effect = BrokenProcessPool()
+    mocker.patch.object(feed_parsing, "_parse_pool", pool)
+    assert parse_feed_offloaded(b"x" * 100) == PARSED
+    assert feed_parsing._parse_pool is None
+    inline.assert_called_once()
+
+def test_timed_out_parse_recycles_the_pool_and_is_not_retried_inline(mocker):
+    pool, inline = _setup(mocker)
+    worker = mocker.Mock()
+    pool._processes = {1: worker}
+    pool.submit.return_value.result.side_effect = FutureTimeoutError()
+    mocker.patch.object(feed_parsing, "_parse_pool", pool)
+    assert parse_feed_offloaded(b"x" * 100) is None
+    assert feed_parsing._parse_pool is None
+    worker.terminate.assert_called_once()
+    inline.assert_not_called()
+
+def test_recycling_stops_workers_that_are_still_busy():
+    pool = ProcessPoolExecutor(max_workers=1)
+    future = pool.submit(time.sleep, 30)
+    while not pool._processes:
+        time.sleep(0.01)
+    worker = next(iter(pool._processes.values()))
+    feed_parsing._recycle_parse_pool(pool)
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert future.exception(timeout=5) is not None
@@ -0,0 +1,72 @@
+import os
+from datetime import datetime, timezone
+
+from sqlalchemy.exc import IntegrityError
+
+from app.modules.feedback_buffer import FeedbackBuffer
+
+def _buffer(tmp_path, **kwargs):
+    return FeedbackBuffer(mode="spool", batch_size=2, spool_dir=str(tmp_path), fsync=False, **kwargs)
+
+def test_spooled_events_flush_as_multi_row_inserts(tmp_path, mocker):
+    execute_query = mocker.patch("app.modules.feedback_buffer.execute_query")
+    flushed = []
+    buffer = _buffer(tmp_path, on_flush=flushed.extend)
+    for content_id in (101, 102, 103):
+        buffer.add(1, content_id, "like")
+    assert buffer.pending == 3 and execute_query.call_count == 0
+
+    assert buffer.flush() == 3
+    # Batches of two: one two-row INSERT, then one single-row INSERT
+    assert [len(call.args[1]) for call in execute_query.call_args_list] == [10, 5]
+    assert [event["content_id"] for event in flushed] == [101, 102, 103]
+    assert os.listdir(tmp_path) == []
+    assert buffer.stats()["flushed"] == 3 and buffer.stats()["flush_latency"]["count"] == 2
+
+def test_failed_flush_keeps_events_for_retry(tmp_path, mocker):
+    execute_query = mocker.patch("app.modules.feedback_buffer.execute_query", side_effect=ConnectionError("database down"))
+    buffer = _buffer(tmp_path)
+    buffer.add(1, 101, "like")
+    assert buffer.flush() == 0
+    assert buffer.pending == 1 and buffer.stats()["failed_flushes"] == 1
+
+    execute_query.side_effect = None
+    assert buffer.flush() == 1
+    assert os.listdir(tmp_path) == []
+
+def test_rejected_rows_are_dropped_without_blocking_the_batch(tmp_path, mocker):
+    def insert(query, params):
+        if len(params) > 5 or params[1] == 999:
+            raise IntegrityError(query, params, Exception("foreign key violation"))
+    execute_query = mocker.patch("app.modules.feedback_buffer.execute_query", side_effect=insert)
+    on_flush = mocker.Mock()
+    buffer = _buffer(tmp_path, on_flush=on_flush)
+    buffer.add(1, 999, "like")
+    buffer.add(1, 101, "like")
+    assert buffer.flush() == 1
+    assert execute_query.call_count == 3
+    assert buffer.stats()["dropped"] == 1 and buffer.stats()["flushed"] == 1 and buffer.pending == 0
+    assert [event["content_id"] for event in on_flush.call_args.args[0]] == [101]
+
+def test_batch_insert_updates_rollups_in_the_same_statement(tmp_path, mocker):
+    execute_query = mocker.patch("app.modules.feedback_buffer.execute_query")
+    buffer = _buffer(tmp_path)
+    buffer.add(1, 101, "like")
+    buffer.flush()
+    query = execute_query.call_args.args[0]
+    assert execute_query.call_count == 1
+    for table in ("feedback_type_rollup", "feedback_content_rollup", "feedback_hourly_rollup"):
+        assert f"INSERT INTO {table}" in query
+
+def test_accept_time_is_stored_as_naive_utc(tmp_path, mocker):
+    execute_query = mocker.patch("app.modules.feedback_buffer.execute_query")
+    accepted_at = datetime(2026, 10, 18, 23, 30, tzinfo=timezone.utc)
+    mocker.patch("app.modules.feedback_buffer.time.time", return_value=accepted_at.timestamp())
+    buffer = _buffer(tmp_path)
+    buffer.add(1, 101, "like")
+    buffer.flush()
+
+    query, params = execute_query.call_args.args
+    # timezone('utc', to_timestamp(epoch)) is the epoch as UTC wall-clock time, whatever the session TimeZone
+    assert "(%s, %s, %s, %s, timezone('utc', to_timestamp(%s)))" in query
+    assert datetime.utcfromtimestamp(params[-1]) == datetime(2026, 10, 18, 23, 30)
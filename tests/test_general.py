@@ -1,5 +1,6 @@
+import asyncio
 import os
-from app.utilities.general import format_datetime, load_env_variable
+from app.utilities.general import format_datetime, handle_error, load_env_variable, make_snippet
 from datetime import datetime
 
 def test_format_datetime():
@@ -11,3 +12,15 @@ def test_load_env_variable(monkeypatch):
     assert load_env_variable("TEST_KEY") == "value"
     assert load_env_variable("NON_EXISTENT_KEY", "default") == "default"
 
+
+def test_make_snippet():
+    assert make_snippet("<p>Snow &amp; ice</p>\n<b>closes</b>  roads") == "Snow & ice closes roads"
+    assert make_snippet("Crews expect the highway to reopen Tuesday.", 20) == "Crews expect the…"
+    assert make_snippet(None) == ""
+
+def test_handle_error_wraps_async_functions():
+    @handle_error
+    async def failing():
+        raise RuntimeError("boom")
+
+    assert asyncio.run(failing()) == {"error": "An unexpected error occurred in failing"}
@@ -0,0 +1,44 @@
+import random
+from app.utilities.geohash import GeoIndex, cover_bbox, decode_bbox, encode, haversine_km, radius_bbox
+
+LEWISTON = (46.4165, -117.0177)
+
+def test_encode_matches_reference_geohash():
+    assert encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    min_lat, min_lon, max_lat, max_lon = decode_bbox("u4pruydqqvj")
+    assert min_lat <= 57.64911 <= max_lat and min_lon <= 10.40744 <= max_lon
+
+def test_haversine_lewiston_to_moscow():
+    assert 34 < haversine_km(*LEWISTON, 46.7324, -117.0002) < 36
+
+def test_cover_bbox_contains_every_point_in_the_box():
+    box = radius_bbox(*LEWISTON, 25)
+    cells = cover_bbox(*box)
+    assert len(cells) <= 32
+    rng = random.Random(7)
+    for _ in range(500):
+        lat, lon = rng.uniform(box[0], box[2]), rng.uniform(box[1], box[3])
+        assert any(encode(lat, lon, len(cell)) == cell for cell in cells)
+
+def test_index_radius_and_bbox_match_brute_force():
+    rng = random.Random(11)
+    points = {key: (rng.uniform(45, 48), rng.uniform(-118, -115)) for key in range(2000)}
+    index = GeoIndex(precision=5)
+    for key, (lat, lon) in points.items():
+        index.add(key, lat, lon)
+
+    nearby = index.within_radius(*LEWISTON, 40)
+    assert {key for key, _, _ in nearby} == {key for key, (lat, lon) in points.items() if haversine_km(*LEWISTON, lat, lon) <= 40}
+    assert [distance for _, distance, _ in nearby] == sorted(distance for _, distance, _ in nearby)
+
+    box = (46.0, -117.5, 46.8, -116.2)
+    inside = {key for key, (lat, lon) in points.items() if box[0] <= lat <= box[2] and box[1] <= lon <= box[3]}
+    assert {key for key, *_ in index.within_bbox(*box)} == inside
+
+def test_index_moves_and_removes_points():
+    index = GeoIndex(precision=5)
+    index.add("klew", *LEWISTON)
+    index.add("klew", 43.6150, -116.2023)
+    assert index.within_radius(*LEWISTON, 10) == []
+    index.remove("klew")
+    assert len(index) == 0
@@ -0,0 +1,35 @@
+import asyncio
+from app.modules.ingestion_pipeline import IngestionPipeline, PipelineStage
+
+def test_pipeline_runs_items_through_every_stage():
+    written = []
+
+    async def fetch(n):
+        await asyncio.sleep(0)
+        return [n]
+
+    def parse(n):
+        if n == 3:
+            raise ValueError("malformed feed")
+        return [n * 10, n * 10 + 1]
+
+    def write(batch):
+        written.append(list(batch))
+        return []
+
+    pipeline = IngestionPipeline(
+        [
+            PipelineStage("fetch", fetch, workers=3),
+            PipelineStage("parse", parse, workers=2, blocking=True),
+            PipelineStage("write", write, workers=1, blocking=True, batch_size=4, flush_seconds=0.05),
+        ],
+        queue_size=2,
+    )
+    metrics = asyncio.run(pipeline.run(range(6)))
+
+    assert sorted(item for batch in written for item in batch) == [0, 1, 10, 11, 20, 21, 40, 41, 50, 51]
+    assert all(len(batch) <= 4 for batch in written)
+    assert metrics["stages"]["fetch"]["items_out"] == 6
+    assert metrics["stages"]["parse"]["errors"] == 1
+    assert metrics["stages"]["write"]["items_in"] == 10
+    assert metrics["stages"]["write"]["max_queue_depth"] <= 2
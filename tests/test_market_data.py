@@ -0,0 +1,9 @@
+import asyncio
+
+from app.modules.market_data import MARKET_ITEMS_QUERY, fetch_market_items_async
+
+def test_fetch_market_items_async_uses_the_async_engine(mocker):
+    rows = [{"id": 2, "title": "Snow tires", "region": "Lewiston"}]
+    execute_query_async = mocker.patch("app.modules.market_data.execute_query_async", return_value={"data": rows})
+    assert asyncio.run(fetch_market_items_async(skip=10, limit=5)) == rows
+    execute_query_async.assert_awaited_once_with(MARKET_ITEMS_QUERY, ("Lewiston", 5, 10), read_only=True)
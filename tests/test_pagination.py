@@ -0,0 +1,17 @@
+import pytest
+from datetime import datetime
+from app.utilities.pagination import decode_cursor, encode_cursor
+
+def test_cursor_round_trip():
+    published_at = datetime(2024, 12, 1, 12, 30, 15)
+    token = encode_cursor(published_at, 42)
+    assert "=" not in token
+    assert decode_cursor(token) == (published_at, 42)
+
+def test_cursor_accepts_string_timestamps():
+    token = encode_cursor("2024-12-01 12:30:15", 7)
+    assert decode_cursor(token) == (datetime(2024, 12, 1, 12, 30, 15), 7)
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,124 @@
+import asyncio
+from datetime import datetime
+
+import pyarrow.parquet as pq
+import pytest
+from fastapi import HTTPException
+
+from app.api.articles import add_article
+
+from app.modules.content_aggregation import _within_partitions
+from app.modules.partitions import (
+    add_months,
+    archive_cutoff,
+    archive_partitions,
+    ensure_partitions,
+    export_partition,
+    partition_month,
+    partition_name,
+    partition_window,
+)
+
+def test_month_arithmetic_and_partition_names():
+    assert add_months(datetime(2026, 11, 1), 3) == datetime(2027, 2, 1)
+    assert add_months(datetime(2026, 1, 1), -13) == datetime(2024, 12, 1)
+    assert partition_name("articles", datetime(2026, 2, 1)) == "articles_p2026_02"
+    assert partition_month("articles", "articles_p2026_02") == datetime(2026, 2, 1)
+    assert partition_month("articles", "articles_url_key") is None
+    assert partition_month("articles", "feedback_p2026_02") is None
+
+def test_window_spans_retention_and_premade_months(mocker):
+    mocker.patch("app.modules.partitions.settings.ARTICLE_RETENTION_MONTHS", 12)
+    mocker.patch("app.modules.partitions.settings.PARTITION_PREMAKE_MONTHS", 3)
+    now = datetime(2026, 10, 18, 9, 30)
+    assert archive_cutoff("articles", now) == datetime(2025, 10, 1)
+    assert partition_window("articles", now) == (datetime(2025, 10, 1), datetime(2027, 2, 1))
+
+def test_articles_outside_the_partitions_are_left_out(mocker):
+    mocker.patch("app.modules.content_aggregation.partition_window", return_value=(datetime(2025, 10, 1), datetime(2027, 2, 1)))
+    metadata = {"fetched_at": "2026-10-18 09:30:00"}
+    articles = [
+        {"url": "old", "published_at": "2019-05-01 00:00:00", "transparency_metadata": metadata},
+        {"url": "undated", "published_at": None, "transparency_metadata": metadata},
+        {"url": "future", "published_at": "2031-01-01 00:00:00", "transparency_metadata": metadata},
+    ]
+    assert [article["url"] for article in _within_partitions(articles)] == ["undated"]
+
+def test_detached_partition_is_exported_to_zstd_parquet(mocker, tmp_path):
+    mocker.patch("app.modules.partitions.settings.PARTITION_ARCHIVE_DIR", str(tmp_path))
+    mocker.patch("app.modules.partitions.settings.PARTITION_ARCHIVE_BATCH_ROWS", 2)
+    engine = mocker.patch("app.modules.partitions.engine")
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.exec_driver_sql.return_value.fetchall.return_value = [
+        ("id", "integer"), ("published_at", "timestamp without time zone"), ("transparency_metadata", "json"),
+    ]
+    stream = connection.execution_options.return_value.exec_driver_sql
+    stream.return_value.partitions.return_value = iter([
+        [(1, datetime(2025, 1, 3), '{"source": "KLEW"}'), (2, datetime(2025, 1, 9), None)],
+        [(3, datetime(2025, 1, 30), "{}")],
+    ])
+
+    export = export_partition("articles", "articles_p2025_01")
+
+    assert "transparency_metadata::text AS transparency_metadata" in stream.call_args.args[0]
+    assert export == {"path": str(tmp_path / "articles" / "articles_p2025_01.parquet"), "rows": 3}
+    parquet = pq.ParquetFile(export["path"])
+    assert parquet.metadata.row_group(0).column(0).compression == "ZSTD"
+    assert parquet.read().to_pydict()["id"] == [1, 2, 3]
+    assert not list((tmp_path / "articles").glob("*.partial"))
+
+def test_every_month_in_the_window_gets_a_partition(mocker):
+    mocker.patch("app.modules.partitions.settings.ARTICLE_RETENTION_MONTHS", 3)
+    mocker.patch("app.modules.partitions.settings.FEEDBACK_RETENTION_MONTHS", 1)
+    mocker.patch("app.modules.partitions.settings.PARTITION_PREMAKE_MONTHS", 1)
+    engine = mocker.patch("app.modules.partitions.engine")
+    connection = engine.begin.return_value.__enter__.return_value
+    # articles has data only in August and October; the gap month and the rest of the window are filled in
+    connection.exec_driver_sql.return_value.fetchall.side_effect = [
+        [("articles_p2026_08",), ("articles_p2026_10",)],
+        [("feedback_p2026_10",)],
+    ]
+
+    created = ensure_partitions(datetime(2026, 10, 18))
+
+    assert created == ["articles_p2026_07", "articles_p2026_09", "articles_p2026_11", "feedback_p2026_09", "feedback_p2026_11"]
+    assert "FOR VALUES FROM ('2026-09-01') TO ('2026-10-01')" in connection.exec_driver_sql.call_args_list[2].args[0]
+
+def test_detaching_article_partitions_invalidates_cached_listings(mocker):
+    mocker.patch("app.modules.partitions.settings.ARTICLE_RETENTION_MONTHS", 12)
+    mocker.patch("app.modules.partitions.settings.FEEDBACK_RETENTION_MONTHS", 24)
+    invalidate_tags = mocker.patch("app.modules.partitions.invalidate_tags")
+    mocker.patch("app.modules.partitions.export_partition", return_value={"path": "archive.parquet", "rows": 5})
+    engine = mocker.patch("app.modules.partitions.engine")
+    connection = engine.connect.return_value.__enter__.return_value
+    connection.exec_driver_sql.return_value.fetchall.side_effect = [
+        [("articles_p2025_08",), ("articles_p2025_11",)],
+        [("articles_p2025_08",)],
+        [],
+        [],
+    ]
+
+    archived = archive_partitions(datetime(2026, 10, 18))
+
+    assert [entry["partition"] for entry in archived] == ["articles_p2025_08"]
+    invalidate_tags.assert_called_once_with("articles")
+
+def _add_article(mocker, rows, published_at="2026-10-18T09:30:00"):
+    mocker.patch("app.api.articles.partitioning_enabled", return_value=True)
+    mocker.patch("app.api.articles.partition_window", return_value=(datetime(2025, 10, 1), datetime(2027, 2, 1)))
+    mocker.patch("app.api.articles.search_backend", return_value="memory")
+    mocker.patch("app.api.articles.invalidate_tags")
+    execute = mocker.patch("app.api.articles.execute_query", return_value={"data": rows})
+    return execute, asyncio.run(add_article("Flood", "Body", "https://example.com/flood", 1, published_at))
+
+def test_added_article_with_a_claimed_url_is_a_conflict(mocker):
+    with pytest.raises(HTTPException) as error:
+        _add_article(mocker, [])
+    assert error.value.status_code == 409
+    _, result = _add_article(mocker, [{"id": 5}])
+    assert result["id"] == 5
+
+def test_added_article_outside_the_partitions_is_rejected(mocker):
+    with pytest.raises(HTTPException) as error:
+        _add_article(mocker, [{"id": 5}], published_at="2019-05-01T00:00:00")
+    assert error.value.status_code == 400
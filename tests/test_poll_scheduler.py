@@ -0,0 +1,19 @@
+from app.modules.poll_scheduler import compute_poll_interval
+from datetime import datetime, timedelta
+
+def _history(gap_minutes, count=10):
+    start = datetime(2024, 12, 1, 12, 0, 0)
+    return [start + timedelta(minutes=gap_minutes * n) for n in range(count)]
+
+def test_busy_source_polls_at_half_its_cadence():
+    assert compute_poll_interval(_history(40), min_interval=300, max_interval=21600) == 1200
+
+def test_interval_is_clamped_to_bounds():
+    assert compute_poll_interval(_history(1), min_interval=300, max_interval=21600) == 300
+    assert compute_poll_interval(_history(60 * 24), min_interval=300, max_interval=21600) == 21600
+
+def test_failures_back_off_exponentially():
+    history = _history(40)
+    assert compute_poll_interval(history, consecutive_failures=1, min_interval=300, max_interval=21600) == 2400
+    assert compute_poll_interval(history, consecutive_failures=3, min_interval=300, max_interval=21600) == 9600
+    assert compute_poll_interval(history, consecutive_failures=10, min_interval=300, max_interval=21600) == 21600
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime, timedelta
+from app.modules.preferences import STALE_USERS_KEY, add_articles_to_feeds, get_user_feed, normalize_preferences, score_article
+
+NOW = datetime(2024, 12, 1, 12, 0, 0)
+
+def _profile(**overrides):
+    profile = {"sources": [], "muted_sources": [], "keywords": [], "source_affinity": {}, "hidden_articles": []}
+    profile.update(overrides)
+    return profile
+
+def _article(article_id=1, source_id=1, title="Snowstorm closes Highway 12", age_hours=0):
+    return {"id": article_id, "source_id": source_id, "title": title, "content": "", "published_at": NOW - timedelta(hours=age_hours)}
+
+def test_normalize_preferences_drops_unknown_keys():
+    assert normalize_preferences({"sources": ["2", 1, 2], "keywords": [" Snow ", ""], "theme": "dark"}) == {
+        "sources": [1, 2], "muted_sources": [], "keywords": ["snow"],
+    }
+
+def test_preferences_and_keywords_raise_relevance():
+    plain = score_article(_article(), _profile(), half_life_hours=12)
+    assert score_article(_article(), _profile(sources=[1]), half_life_hours=12) > plain
+    assert score_article(_article(), _profile(keywords=["snowstorm"]), half_life_hours=12) > plain
+    assert score_article(_article(), _profile(source_affinity={"1": -5}), half_life_hours=12) < plain
+
+def test_muted_sources_and_disliked_articles_are_excluded():
+    assert score_article(_article(), _profile(muted_sources=[1])) is None
+    assert score_article(_article(), _profile(hidden_articles=[1])) is None
+
+def test_scores_decay_by_half_life_without_recomputation():
+    # A preferred article twelve hours older ties with a fresh plain one (relevance 2 vs 1, one half-life apart)
+    older_preferred = score_article(_article(source_id=1, age_hours=12), _profile(sources=[1]), half_life_hours=12)
+    fresh_plain = score_article(_article(source_id=2), _profile(sources=[1]), half_life_hours=12)
+    assert abs(older_preferred - fresh_plain) < 1e-9
+
+def test_feed_is_rebuilt_when_its_profile_has_expired(mocker):
+    client = mocker.patch("app.modules.preferences._redis").return_value
+    client.exists.return_value = 1  # Feed entries present, profile gone
+    client.zrevrange.return_value = []
+    rebuild = mocker.patch("app.modules.preferences.rebuild_user_feed")
+    get_user_feed(7)
+    rebuild.assert_called_once_with(7)
+
+def test_active_users_with_expired_profiles_are_queued_for_rebuild(mocker):
+    client = mocker.patch("app.modules.preferences._redis").return_value
+    client.zrangebyscore.return_value = [b"1", b"2"]
+    client.mget.return_value = [json.dumps(_profile()), None]
+    mocker.patch("app.modules.preferences.execute_query", return_value={"data": [_article()]})
+    add_articles_to_feeds([1])
+    pipeline = client.pipeline.return_value
+    pipeline.sadd.assert_called_once_with(STALE_USERS_KEY, 2)
+    assert pipeline.zadd.call_args.args[0] == "feed:user:1"
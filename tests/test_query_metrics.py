@@ -0,0 +1,63 @@
+from sqlalchemy import create_engine
+
+from app.utilities.metrics import Histogram, render_metric
+from app.utilities.query_metrics import QueryMetrics, fingerprint, instrument_queries, query_metrics
+
+def test_fingerprint_ignores_literals_placeholders_and_list_lengths():
+    assert fingerprint("SELECT * FROM articles  WHERE id = %s -- by id\n AND title = 'x''y'") == (
+        "SELECT * FROM articles WHERE id = ? AND title = ?"
+    )
+    assert fingerprint("SELECT * FROM items WHERE id IN (%s, %s, %s) LIMIT 10") == fingerprint(
+        "SELECT * FROM items WHERE id IN ($1, $2) LIMIT 20"
+    ) == "SELECT * FROM items WHERE id IN (?, ...) LIMIT ?"
+    assert fingerprint("INSERT INTO feedback VALUES (%s, %s), (%s, %s), (%s, %s)") == "INSERT INTO feedback VALUES (?, ...), ..."
+    assert fingerprint("SELECT created_at::date, col_2 FROM t1") == "SELECT created_at::date, col_2 FROM t1"
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(0.99) == float("inf")
+    assert render_metric("latency_seconds", "histogram", "Latency.", [({"db": "primary"}, histogram)])[2:] == [
+        'latency_seconds_bucket{db="primary",le="0.1"} 1',
+        'latency_seconds_bucket{db="primary",le="1.0"} 3',
+        'latency_seconds_bucket{db="primary",le="+Inf"} 4',
+        'latency_seconds_sum{db="primary"} 4.25',
+        'latency_seconds_count{db="primary"} 4',
+    ]
+
+def test_engine_events_record_statements_by_fingerprint():
+    query_metrics.reset()
+    engine = create_engine("sqlite://")
+    instrument_queries(engine, "test")
+    with engine.connect() as connection:
+        for item_id in range(3):
+            connection.exec_driver_sql("SELECT ? + 1", (item_id,)).fetchall()
+
+    stats = [stats for (database, _), stats in query_metrics.statements.items() if database == "test"]
+    assert [(stats.fingerprint, stats.latency.count) for stats in stats] == [("SELECT ? + ?", 3)]
+    assert any(line.startswith('db_query_duration_seconds_count{database="test"') for line in query_metrics.prometheus_lines())
+
+def test_slow_queries_are_kept_for_explain(mocker):
+    mocker.patch("app.utilities.query_metrics.settings.SLOW_QUERY_THRESHOLD_MS", 100)
+    metrics = QueryMetrics()
+    metrics.record("primary", "SELECT * FROM articles WHERE id = %s", (7,), 0.01)
+    metrics.record("primary", "SELECT * FROM articles WHERE id = %s", (8,), 0.25)
+
+    [slow] = metrics.recent_slow_queries()
+    assert slow["duration_ms"] == 250.0 and "params" not in slow
+    assert metrics.find_slow_query(slow["fingerprint_id"]).params == (8,)
+
+def test_repeated_statements_in_one_request_are_flagged_as_n_plus_one(mocker):
+    mocker.patch("app.utilities.query_metrics.settings.N_PLUS_ONE_THRESHOLD", 3)
+    metrics = QueryMetrics()
+    stats = metrics.start_request()
+    metrics.record("primary", "SELECT * FROM articles LIMIT 10", (), 0.001)
+    for article_id in range(4):
+        metrics.record("primary", f"SELECT * FROM feedback WHERE content_id = {article_id}", (), 0.001)
+
+    assert metrics.finish_request(stats, "GET /articles/") == [("SELECT * FROM feedback WHERE content_id = ?", 4)]
+    assert stats.count == 5
+    assert metrics.n_plus_one["GET /articles/"] == 1
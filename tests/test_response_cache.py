@@ -0,0 +1,77 @@
+import asyncio
+from app.utilities import response_cache
+from app.utilities.response_cache import cached_response
+
+class FakeCache:
+    def __init__(self):
+        self.redis = object()
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def get_many(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, expire=None, only_if_missing=False):
+        if not (only_if_missing and key in self.store):
+            self.store[key] = value.decode("utf-8") if isinstance(value, bytes) else value
+
+class FakeRequest:
+    def __init__(self, if_none_match=None):
+        self.headers = {"if-none-match": if_none_match} if if_none_match else {}
+
+def _endpoint(cache, calls):
+    @cached_response("market.list", tags=["items:region={region}"], cache=cache)
+    async def list_items(region: str = "Lewiston", limit: int = 10):
+        calls.append(region)
+        return {"region": region, "items": [len(calls)]}
+    return list_items
+
+def test_repeat_reads_are_served_from_cache():
+    cache, calls = FakeCache(), []
+    list_items = _endpoint(cache, calls)
+    first = asyncio.run(list_items(region="Lewiston", limit=10))
+    second = asyncio.run(list_items(region="Lewiston", limit=10))
+    assert calls == ["Lewiston"]
+    assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+    assert first.body == second.body
+
+def test_bumping_a_tag_invalidates_only_its_entries():
+    cache, calls = FakeCache(), []
+    list_items = _endpoint(cache, calls)
+    asyncio.run(list_items(region="Lewiston", limit=10))
+    asyncio.run(list_items(region="Moscow", limit=10))
+    cache.store[f"{response_cache.TAG_KEY_PREFIX}items:region=Lewiston"] += "1"
+    asyncio.run(list_items(region="Lewiston", limit=10))
+    asyncio.run(list_items(region="Moscow", limit=10))
+    assert calls == ["Lewiston", "Moscow", "Lewiston"]
+
+def test_disconnected_cache_passes_through():
+    cache, calls = FakeCache(), []
+    cache.redis = None
+    list_items = _endpoint(cache, calls)
+    assert asyncio.run(list_items(region="Lewiston", limit=10)) == {"region": "Lewiston", "items": [1]}
+    assert asyncio.run(list_items(region="Lewiston", limit=10)) == {"region": "Lewiston", "items": [2]}
+
+def test_matching_etag_gets_304_without_running_the_endpoint():
+    cache, calls = FakeCache(), []
+    list_items = _endpoint(cache, calls)
+    first = asyncio.run(list_items(region="Lewiston", limit=10, cache_request=FakeRequest()))
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"') and "must-revalidate" in first.headers["Cache-Control"]
+
+    cache.store = {key: value for key, value in cache.store.items() if key.startswith(response_cache.TAG_KEY_PREFIX)}
+    revalidated = asyncio.run(list_items(region="Lewiston", limit=10, cache_request=FakeRequest(etag)))
+    assert revalidated.status_code == 304
+    assert calls == ["Lewiston"]
+
+    cache.store[f"{response_cache.TAG_KEY_PREFIX}items:region=Lewiston"] += "1"
+    changed = asyncio.run(list_items(region="Lewiston", limit=10, cache_request=FakeRequest(etag)))
+    assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+def test_etag_matching_is_weak():
+    assert response_cache.etag_matches('"abc", W/"def"', 'W/"abc"')
+    assert response_cache.etag_matches("*", 'W/"abc"')
+    assert not response_cache.etag_matches('W/"abd"', 'W/"abc"')
+    assert not response_cache.etag_matches(None, 'W/"abc"')
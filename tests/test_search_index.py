@@ -0,0 +1,29 @@
+from app.utilities.search_index import InvertedIndex, tokenize
+
+def _index():
+    index = InvertedIndex()
+    index.add(1, "Snowstorm closes Highway 12", "Crews expect the highway to reopen Tuesday.", {"source_id": 1})
+    index.add(2, "City council budget", "Council approves parks budget; a snowstorm delayed the vote.", {"source_id": 2})
+    index.add(3, "Farmers market opens", "Fresh produce every Saturday downtown.", {"source_id": 1})
+    return index
+
+def test_tokenize_drops_markup_and_stop_words():
+    assert tokenize("<p>The Snowstorm and the Highway</p>") == ["snowstorm", "highway"]
+
+def test_title_matches_rank_first():
+    results = _index().search("snowstorm")
+    assert [doc_id for doc_id, _, _ in results] == [1, 2]
+
+def test_predicate_and_pagination():
+    index = _index()
+    assert [doc_id for doc_id, _, _ in index.search("snowstorm", predicate=lambda m: m["source_id"] == 2)] == [2]
+    assert [doc_id for doc_id, _, _ in index.search("snowstorm", limit=1, offset=1)] == [2]
+
+def test_remove_and_replace():
+    index = _index()
+    index.remove(1)
+    assert [doc_id for doc_id, _, _ in index.search("highway")] == []
+    index.add(2, "Highway budget", "", {"source_id": 2})
+    assert [doc_id for doc_id, _, _ in index.search("highway")] == [2]
+    assert index.search("parks") == []
+    assert len(index) == 2
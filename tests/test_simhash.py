@@ -0,0 +1,43 @@
+from app.utilities.simhash import SimHashIndex, hamming_distance, simhash, to_signed64, to_unsigned64
+
+WIRE_STORY = (
+    "Snowstorm closes Highway 12 near Lewiston. Idaho Transportation Department crews "
+    "expect the highway to reopen Tuesday morning after plows clear drifts up to four feet deep."
+)
+
+def test_syndicated_copies_are_near_duplicates():
+    copy = "<p>" + WIRE_STORY.replace("Tuesday morning", "Tuesday") + "</p>"
+    unrelated = "City council approves new budget for Lewiston parks and recreation programs this fall."
+    assert hamming_distance(simhash(WIRE_STORY), simhash(copy)) <= 10
+    assert hamming_distance(simhash(WIRE_STORY), simhash(unrelated)) > 10
+
+def test_only_leading_tokens_are_fingerprinted():
+    tail = " ".join(f"word{n}" for n in range(500))
+    assert simhash(f"{WIRE_STORY} {tail}", max_tokens=12) == simhash(WIRE_STORY, max_tokens=12)
+    assert simhash(f"{WIRE_STORY} {tail}") != simhash(WIRE_STORY)
+
+def test_texts_with_too_few_features_have_no_fingerprint():
+    assert simhash("No Title", min_features=8) is None
+    assert simhash("", min_features=1) is None
+    assert simhash(WIRE_STORY, min_features=8) is not None
+
+def test_index_finds_fingerprints_within_max_distance():
+    index = SimHashIndex(max_distance=3, capacity=10)
+    fingerprint = simhash(WIRE_STORY)
+    index.add(fingerprint, "cluster-a")
+    assert index.find(fingerprint ^ 0b101) == "cluster-a"
+    assert index.find(fingerprint ^ 0b1111) is None
+
+def test_index_evicts_oldest_entries():
+    index = SimHashIndex(max_distance=3, capacity=2)
+    oldest, middle, newest = 0, 0xFFFFFFFFFFFFFFFF, 0x5555555555555555
+    for value in (oldest, middle, newest):
+        index.add(value, value)
+    assert len(index) == 2
+    assert index.find(oldest) is None
+    assert index.find(newest) == newest
+
+def test_signed_round_trip():
+    value = (1 << 64) - 5
+    assert to_signed64(value) == -5
+    assert to_unsigned64(to_signed64(value)) == value
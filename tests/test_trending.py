@@ -0,0 +1,18 @@
+from app.modules.trending import decay_factor, feedback_weight
+
+HALF_LIFE = 7200
+
+def test_feedback_weights():
+    assert feedback_weight("like", 3) == 3.0
+    assert feedback_weight("dislike") == -0.5
+    assert feedback_weight("share") == 0.5
+
+def test_forward_decay_preserves_ranking_over_time():
+    landmark = 1_700_000_000
+    # An older burst of likes against a single recent like, stored forward-decayed
+    older = 4 * 2 ** ((landmark + 0) / HALF_LIFE - landmark / HALF_LIFE)
+    recent = 1 * 2 ** ((landmark + 3 * HALF_LIFE) / HALF_LIFE - landmark / HALF_LIFE)
+    for now in (landmark + 3 * HALF_LIFE, landmark + 10 * HALF_LIFE):
+        factor = decay_factor(landmark, now, HALF_LIFE)
+        assert recent * factor > older * factor
+    assert abs(older * decay_factor(landmark, landmark + 2 * HALF_LIFE, HALF_LIFE) - 1.0) < 1e-9
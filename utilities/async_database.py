@@ -0,0 +1,135 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.config import settings
+from app.utilities.database import (
+    InstrumentedQueuePool,
+    PoolMetrics,
+    Replica,
+    describe_pool,
+    instrument_engine,
+    is_read_statement,
+    note_statement,
+    query_result,
+    replica_router,
+)
+from app.utilities.query_metrics import instrument_queries
+
+# Async drivers for the backends DATABASE_URL may name
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+async_pool_metrics = PoolMetrics()
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """The async engine's pool, with checkout waits recorded in ``async_pool_metrics``."""
+
+    metrics = async_pool_metrics
+
+
+def to_async_url(url: str):
+    """``url`` switched to the async driver for its backend."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    url = url.set(drivername=ASYNC_DRIVERS[backend])
+    if backend == "postgresql":
+        url = url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)})
+    return url
+
+
+def async_database_url():
+    """
+    ``ASYNC_DATABASE_URL``, or ``DATABASE_URL`` switched to its async driver.
+
+    asyncpg prepares every statement and keeps up to
+    ``DB_STATEMENT_CACHE_SIZE`` of them per connection. Set
+    ``ASYNC_DATABASE_URL`` explicitly if ``DATABASE_URL`` carries
+    psycopg2-only options such as ``sslmode``.
+    """
+    if settings.ASYNC_DATABASE_URL:
+        return make_url(settings.ASYNC_DATABASE_URL)
+    return to_async_url(settings.DATABASE_URL)
+
+
+def _async_engine_options(url, poolclass=InstrumentedAsyncQueuePool) -> dict:
+    options = {"query_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    if url.get_backend_name() == "sqlite":
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.ASYNC_DB_POOL_SIZE,
+        max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    return options
+
+
+def _replica_async_engine(replica: Replica):
+    # Shares the replica's pool metrics with its sync engine
+    if replica.async_engine is None:
+        url = to_async_url(replica.url)
+        poolclass = type("AsyncReplicaQueuePool", (InstrumentedAsyncQueuePool,), {"metrics": replica.metrics})
+        options = _async_engine_options(url, poolclass)
+        options["connect_args"] = {"timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS}
+        replica.async_engine = create_async_engine(url, **options)
+        instrument_engine(replica.async_engine.sync_engine, replica.metrics)
+        instrument_queries(replica.async_engine.sync_engine, f"replica:{replica.name}")
+    return replica.async_engine
+
+
+# Async database engine; queries wait for a connection without blocking the event loop
+async_engine = create_async_engine(async_database_url(), **_async_engine_options(async_database_url()))
+instrument_engine(async_engine.sync_engine, async_pool_metrics)
+instrument_queries(async_engine.sync_engine, "primary")
+
+# Async session maker
+AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, autocommit=False, autoflush=False, expire_on_commit=False)
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def async_pool_status() -> dict:
+    """Current occupancy of the async connection pool plus cumulative checkout metrics."""
+    return describe_pool(async_engine.sync_engine, async_pool_metrics, settings.ASYNC_DB_MAX_OVERFLOW)
+
+
+@asynccontextmanager
+async def async_transaction():
+    """Async counterpart of ``transaction()``."""
+    async with async_engine.begin() as connection:
+        yield connection
+
+
+async def execute_query_async(query: str, params=None, rows: str = "dict", connection=None, read_only: bool = False) -> dict:
+    """
+    Async counterpart of ``execute_query``: same ``%s`` SQL, same arguments,
+    same return value, same replica routing.
+
+    While the statement runs the event loop serves other requests, so one
+    worker can have as many queries in flight as the async pool has connections.
+    """
+    if isinstance(params, list):
+        params = tuple(params)
+    if connection is None:
+        replica = replica_router.choose() if read_only and is_read_statement(query) else None
+        if replica is not None:
+            try:
+                with replica.use():
+                    async with _replica_async_engine(replica).begin() as connection:
+                        return query_result(await connection.exec_driver_sql(query, params), rows)
+            except OperationalError as e:
+                replica_router.mark_failed(replica, e)
+        async with async_transaction() as connection:
+            return await execute_query_async(query, params, rows, connection)
+    # Tracked here rather than by an engine event: the event would run in SQLAlchemy's greenlet, not the request's context
+    note_statement(query)
+    return query_result(await connection.exec_driver_sql(query, params), rows)
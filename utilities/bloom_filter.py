@@ -0,0 +1,82 @@
+import hashlib
+import math
+import struct
+
+_HEADER = struct.Struct(">QdQQB")  # capacity, error_rate, bit count, item count, hash count
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+
+    Membership tests never give false negatives; false positives occur at
+    roughly ``error_rate`` while fewer than ``capacity`` items have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray(math.ceil(self.num_bits / 8))
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, item: str) -> bool:
+        """
+        Add an item to the filter.
+
+        Returns:
+            bool: True if the item was (probably) not present before.
+        """
+        added = False
+        for position in self._positions(item):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        if added:
+            self.count += 1
+        return added
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    def estimated_false_positive_rate(self) -> float:
+        """Expected false-positive rate given the number of items added so far."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def to_bytes(self) -> bytes:
+        """Serialize the filter, including its sizing parameters."""
+        header = _HEADER.pack(self.capacity, self.error_rate, self.num_bits, self.count, self.num_hashes)
+        return header + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        """Restore a filter serialized with ``to_bytes``."""
+        capacity, error_rate, num_bits, count, num_hashes = _HEADER.unpack_from(data)
+        bloom = cls(capacity, error_rate)
+        if (bloom.num_bits, bloom.num_hashes) != (num_bits, num_hashes):
+            raise ValueError("Serialized Bloom filter does not match its sizing parameters")
+        bits = data[_HEADER.size:]
+        if len(bits) != len(bloom.bits):
+            raise ValueError("Serialized Bloom filter has an unexpected length")
+        bloom.bits = bytearray(bits)
+        bloom.count = count
+        return bloom
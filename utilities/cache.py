@@ -16,10 +16,10 @@ class RedisCache:
         if self.redis:
             await self.redis.close()
 
-    async def set(self, key: str, value: str, expire: int = None):
-        """Set a key-value pair with an optional expiration time."""
+    async def set(self, key: str, value: str, expire: int = None, only_if_missing: bool = False):
+        """Set a key-value pair with an optional expiration time, optionally only if the key does not exist."""
         try:
-            await self.redis.set(key, value, ex=expire)
+            await self.redis.set(key, value, ex=expire, nx=only_if_missing)
         except Exception as e:
             raise RuntimeError(f"Failed to set key '{key}': {e}")
 
@@ -31,6 +31,14 @@ class RedisCache:
         except Exception as e:
             raise RuntimeError(f"Failed to get key '{key}': {e}")
 
+    async def get_many(self, keys: list) -> list:
+        """Get the values for several keys in one round-trip (None for missing keys)."""
+        try:
+            values = await self.redis.mget(keys)
+            return [value.decode("utf-8") if value else None for value in values]
+        except Exception as e:
+            raise RuntimeError(f"Failed to get keys {keys}: {e}")
+
     async def delete(self, key: str):
         """Delete a key."""
         try:
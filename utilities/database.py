@@ -1,13 +1,153 @@
-from sqlalchemy import create_engine
+import itertools
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.config import settings
+from app.utilities.logging import log_event
+from app.utilities.metrics import Histogram, LatencyStats
+from app.utilities.query_metrics import instrument_queries, query_metrics
+
+
+class PoolMetrics:
+    """Checkout counts, wait times and hold times of the connection pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.wait = LatencyStats()  # Time spent waiting for a free connection
+        self.wait_histogram = Histogram()
+        self.hold = LatencyStats()  # Time between checkout and checkin
+
+    def observe_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            self.wait.observe(seconds)
+            self.wait_histogram.observe(seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def observe_hold(self, seconds: float):
+        with self._lock:
+            self.hold.observe(seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "wait": self.wait.as_dict(),
+            "hold": self.hold.as_dict(),
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """``QueuePool`` that records how long each checkout waited for a connection."""
+
+    metrics = pool_metrics
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            waited = time.perf_counter() - started
+            self.metrics.observe_wait(waited, timed_out=True)
+            log_event(
+                "DATABASE",
+                f"Connection pool exhausted: no connection after {waited:.1f}s "
+                f"({self.checkedout()} checked out, pool size {self.size()}, overflow {self.overflow()}).",
+                level="WARNING",
+            )
+            raise
+        self.metrics.observe_wait(time.perf_counter() - started)
+        return connection
+
+
+def instrument_engine(engine, metrics: PoolMetrics):
+    """Count connects, checkouts and invalidations of ``engine``'s pool and time how long connections are held."""
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.checkouts += 1
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.observe_hold(time.perf_counter() - checked_out_at)
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.invalidations += 1
+
+
+def describe_pool(engine, metrics: PoolMetrics, max_overflow: int) -> dict:
+    """Current occupancy of ``engine``'s pool plus its cumulative checkout metrics."""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=max_overflow,
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    status.update(metrics.as_dict())
+    return status
+
+
+def _engine_options(url: str, poolclass=InstrumentedQueuePool) -> dict:
+    options = {"query_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        return options
+    options.update(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if backend == "postgresql" and make_url(url).get_driver_name() == "psycopg2":
+        # executemany() is sent as pages of statements instead of one round-trip per parameter set
+        options.update(executemany_mode="values_plus_batch", executemany_batch_page_size=settings.DB_EXECUTEMANY_PAGE_SIZE)
+    return options
+
 
 # Database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {},
-)
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+
+
+instrument_engine(engine, pool_metrics)
 
 # Session maker
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -23,3 +163,367 @@ def get_db():
     finally:
         db.close()
 
+
+def pool_status() -> dict:
+    """Current occupancy of the connection pool plus cumulative checkout metrics."""
+    return describe_pool(engine, pool_metrics, settings.DB_MAX_OVERFLOW)
+
+
+# Read-your-writes
+
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|SHOW|EXPLAIN)\b", re.IGNORECASE)
+_LOCKING_READ = re.compile(r"\bFOR\s+(NO\s+KEY\s+)?(UPDATE|SHARE)\b", re.IGNORECASE)
+# Statements the data-access layer issues itself; they neither write nor read user data
+_PLUMBING_STATEMENT = re.compile(r"^\s*(PREPARE|EXECUTE|DEALLOCATE|SAVEPOINT|RELEASE|ROLLBACK)\b", re.IGNORECASE)
+
+_wrote_to_primary: ContextVar[bool] = ContextVar("wrote_to_primary", default=False)
+
+
+def is_read_statement(query: str) -> bool:
+    """True for statements a replica can answer: plain reads without row locks."""
+    return bool(_READ_STATEMENT.match(query)) and not _LOCKING_READ.search(query)
+
+
+def note_statement(query: str):
+    """Pin the rest of the current request to the primary if ``query`` writes."""
+    if not is_read_statement(query):
+        _wrote_to_primary.set(True)
+
+
+def reset_read_your_writes():
+    """Start a new request (or task) unpinned; called by ``ReadYourWritesMiddleware``."""
+    _wrote_to_primary.set(False)
+
+
+def pinned_to_primary() -> bool:
+    """Whether the current request has written and must read from the primary."""
+    return _wrote_to_primary.get()
+
+
+def track_writes(engine):
+    """Pin the request to the primary whenever ``engine`` runs a statement that writes."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def on_execute(connection, cursor, statement, parameters, context, executemany):
+        if not _PLUMBING_STATEMENT.match(statement):
+            note_statement(statement)
+
+
+track_writes(engine)
+instrument_queries(engine, "primary")
+
+
+# Read replicas
+
+# Seconds the replica is behind the primary; zero when it has replayed everything it received
+REPLICA_LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+class Replica:
+    """One read replica: its engine, pool metrics, and last known health and lag."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.name = make_url(url).host or url
+        self.metrics = PoolMetrics()
+        poolclass = type("ReplicaQueuePool", (InstrumentedQueuePool,), {"metrics": self.metrics})
+        options = _engine_options(url, poolclass)
+        if make_url(url).get_backend_name() == "postgresql":
+            options["connect_args"] = {"connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS}
+        self.engine = create_engine(url, **options)
+        instrument_engine(self.engine, self.metrics)
+        instrument_queries(self.engine, f"replica:{self.name}")
+        self.async_engine = None  # Created on first async use by utilities.async_database
+        # Out of rotation until the first health check has measured its lag
+        self.healthy = False
+        self.lag_seconds = 0.0
+        self.error = "Not checked yet"
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def available(self, max_lag_seconds: float) -> bool:
+        return self.healthy and self.lag_seconds <= max_lag_seconds
+
+    @contextmanager
+    def use(self):
+        with self._lock:
+            self.in_flight += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": round(self.lag_seconds, 3),
+            "in_flight": self.in_flight,
+            "error": self.error,
+            "pool": describe_pool(self.engine, self.metrics, settings.DB_MAX_OVERFLOW),
+        }
+
+
+class ReplicaRouter:
+    """
+    Sends read-only queries to ``READ_REPLICA_URLS``.
+
+    Each read goes to the available replica with the fewest queries in
+    flight (rotating among ties). A replica is available while its last health
+    check succeeded and its replication lag is at most
+    ``REPLICA_MAX_LAG_SECONDS``; checks run in a background thread at most
+    every ``REPLICA_CHECK_INTERVAL_SECONDS``, triggered by reads. Reads fall back
+    to the primary when no replica is available or the request has already
+    written (read-your-writes).
+    """
+
+    def __init__(self, urls: list, max_lag_seconds: float = settings.REPLICA_MAX_LAG_SECONDS):
+        self.replicas = [Replica(url) for url in urls]
+        self.max_lag_seconds = max_lag_seconds
+        self.checked_at = 0.0
+        self.primary_reads = 0
+        self.replica_reads = 0
+        self._check_lock = threading.Lock()
+        self._turn = itertools.count(random.randrange(1000))
+
+    def check(self, replica: Replica):
+        """Probe one replica's connectivity and replication lag."""
+        try:
+            with replica.engine.connect() as connection:
+                replica.lag_seconds = float(connection.exec_driver_sql(REPLICA_LAG_QUERY).scalar() or 0)
+            if not replica.healthy:
+                log_event("DATABASE", f"Read replica {replica.name} is available (lag {replica.lag_seconds:.1f}s).")
+            replica.healthy, replica.error = True, None
+        except Exception as e:
+            self.mark_failed(replica, e)
+
+    def _check_all(self):
+        try:
+            for replica in self.replicas:
+                self.check(replica)
+            self.checked_at = time.monotonic()
+        finally:
+            self._check_lock.release()
+
+    def ensure_checked(self):
+        """Start a background health check if the last one is stale; never blocks the caller."""
+        if time.monotonic() - self.checked_at < settings.REPLICA_CHECK_INTERVAL_SECONDS:
+            return
+        if self._check_lock.acquire(blocking=False):
+            threading.Thread(target=self._check_all, name="replica-health-check", daemon=True).start()
+
+    def mark_failed(self, replica: Replica, error: Exception):
+        """Take a replica out of rotation until its next successful health check."""
+        if replica.healthy:
+            log_event("DATABASE", f"Read replica {replica.name} is unavailable: {error}", level="WARNING")
+        replica.healthy, replica.error = False, str(error)
+
+    def choose(self):
+        """The replica for the next read, or None to read from the primary."""
+        if not self.replicas or pinned_to_primary():
+            self.primary_reads += 1
+            return None
+        self.ensure_checked()
+        candidates = [replica for replica in self.replicas if replica.available(self.max_lag_seconds)]
+        if not candidates:
+            self.primary_reads += 1
+            return None
+        offset = next(self._turn) % len(candidates)
+        self.replica_reads += 1
+        return min(candidates[offset:] + candidates[:offset], key=lambda replica: replica.in_flight)
+
+    def status(self) -> dict:
+        return {
+            "replicas": [replica.status() for replica in self.replicas],
+            "max_lag_seconds": self.max_lag_seconds,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+        }
+
+
+# Shared replica router; without READ_REPLICA_URLS every read goes to the primary
+replica_router = ReplicaRouter(settings.READ_REPLICA_URLS)
+
+
+# Prepared statements
+
+_PLACEHOLDER = re.compile(r"%%|%s")
+_PREPARABLE = ("select", "insert", "update", "delete", "with", "values")
+_statement_names = itertools.count(1)
+
+
+def _numbered_placeholders(query: str):
+    """``query`` with ``%s`` placeholders renumbered ``$1, $2, ...`` and its parameter count."""
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group() == "%%":
+            return "%"
+        count += 1
+        return f"${count}"
+
+    return _PLACEHOLDER.sub(replace, query), count
+
+
+def _prepared_statement(connection, query: str):
+    """
+    ``(name, parameter count)`` of a server-side prepared statement for
+    ``query`` on this connection, preparing it on first use. Returns None for
+    statements that cannot be prepared; the answer is cached either way.
+
+    The cache lives in the DBAPI connection's ``info``, which SQLAlchemy
+    clears whenever the connection is replaced, so names never outlive the
+    session that prepared them.
+    """
+    cache = connection.connection.info.setdefault("prepared_statements", OrderedDict())
+    if query in cache:
+        cache.move_to_end(query)
+        return cache[query]
+
+    name = None
+    sql, count = _numbered_placeholders(query)
+    if sql.lstrip().split(None, 1)[0].lower() in _PREPARABLE:
+        name = f"stmt_{next(_statement_names)}"
+        try:
+            # In a savepoint, so a statement Postgres cannot prepare does not abort the transaction
+            with connection.begin_nested():
+                connection.exec_driver_sql(f"PREPARE {name} AS {sql}".replace("%", "%%"), ())
+        except DBAPIError:
+            name = None
+    cache[query] = (name, count) if name else None
+    if len(cache) > settings.DB_STATEMENT_CACHE_SIZE:
+        _, evicted = cache.popitem(last=False)
+        if evicted:
+            connection.exec_driver_sql(f"DEALLOCATE {evicted[0]}")
+    return cache[query]
+
+
+def _use_prepared_statements(connection) -> bool:
+    return settings.DB_PREPARED_STATEMENTS and connection.dialect.driver == "psycopg2"
+
+
+def _execute(connection, query: str, params):
+    if isinstance(params, list):
+        params = tuple(params)
+    if isinstance(params, tuple) and _use_prepared_statements(connection):
+        prepared = _prepared_statement(connection, query)
+        if prepared and prepared[1] == len(params):
+            # The write tracker and query metrics only see "EXECUTE name", so pass on the original statement
+            note_statement(query)
+            name, count = prepared
+            execute = f"EXECUTE {name} ({', '.join(['%s'] * count)})" if count else f"EXECUTE {name}"
+            return connection.exec_driver_sql(execute, params, {"fingerprint_sql": query})
+    return connection.exec_driver_sql(query, params)
+
+
+# Query API
+
+def query_result(result, rows: str = "dict") -> dict:
+    """``execute_query``'s return value for a buffered SQLAlchemy result."""
+    if not result.returns_rows:
+        return {"data": [], "rowcount": result.rowcount}
+    if rows == "tuple":
+        data = [tuple(row) for row in result]
+    else:
+        data = [dict(row) for row in result.mappings()]
+    return {"data": data, "rowcount": result.rowcount}
+
+
+@contextmanager
+def transaction():
+    """
+    A connection in a single transaction, committed when the block exits and
+    rolled back if it raises. Pass it to ``execute_query`` or
+    ``execute_batch`` to run several statements atomically.
+    """
+    with engine.begin() as connection:
+        yield connection
+
+
+def execute_query(query: str, params=None, rows: str = "dict", connection=None, read_only: bool = False) -> dict:
+    """
+    Execute one SQL statement with ``%s`` placeholders.
+
+    Args:
+        query (str): SQL in the driver's paramstyle.
+        params (tuple): Positional parameters, if any.
+        rows (str): ``"dict"`` for rows as dicts, ``"tuple"`` for plain tuples.
+        connection: Connection from ``transaction()``; by default the
+            statement runs and commits in its own transaction.
+        read_only (bool): The caller tolerates replication lag, so the read
+            may be served by a replica (see ``ReplicaRouter``).
+
+    Returns:
+        dict: ``data`` with the result rows (empty for statements that return
+        none) and the driver's ``rowcount``.
+    """
+    if connection is None:
+        replica = replica_router.choose() if read_only and is_read_statement(query) else None
+        if replica is not None:
+            try:
+                with replica.use(), replica.engine.begin() as connection:
+                    return query_result(_execute(connection, query, params), rows)
+            except OperationalError as e:
+                # The replica is down or unreachable; the primary answers instead
+                replica_router.mark_failed(replica, e)
+        with transaction() as connection:
+            return execute_query(query, params, rows, connection)
+    return query_result(_execute(connection, query, params), rows)
+
+
+def execute_batch(query: str, params_seq, connection=None) -> int:
+    """
+    Execute one statement for many parameter tuples.
+
+    On psycopg2 the statements are sent in pages of
+    ``DB_EXECUTEMANY_PAGE_SIZE`` per round-trip.
+
+    Returns:
+        int: The driver's ``rowcount`` (-1 where the driver cannot report it).
+    """
+    params_seq = [tuple(params) for params in params_seq]
+    if not params_seq:
+        return 0
+    if connection is None:
+        with transaction() as connection:
+            return execute_batch(query, params_seq, connection)
+    return connection.exec_driver_sql(query, params_seq).rowcount
+
+
+def explain_slow_query(fingerprint_id: str, analyze: bool = False) -> dict:
+    """
+    ``EXPLAIN`` the latest slow execution of a fingerprint on the primary,
+    with the parameters it actually ran with.
+
+    Args:
+        fingerprint_id (str): ID from the slow-query log or ``/metrics``.
+        analyze (bool): Run ``EXPLAIN ANALYZE`` too; only allowed for reads,
+            since it executes the statement.
+
+    Returns:
+        dict: The slow query and its ``plan`` as PostgreSQL's JSON output.
+
+    Raises:
+        LookupError: The fingerprint is not in the slow-query log.
+        ValueError: The database cannot ``EXPLAIN``, or ``analyze`` was asked for a write.
+    """
+    slow_query = query_metrics.find_slow_query(fingerprint_id)
+    if slow_query is None:
+        raise LookupError(f"No slow query with fingerprint {fingerprint_id} in the log.")
+    if engine.dialect.name != "postgresql":
+        raise ValueError(f"EXPLAIN plans are only collected on PostgreSQL, not {engine.dialect.name}.")
+    if analyze and not is_read_statement(slow_query.statement):
+        raise ValueError("EXPLAIN ANALYZE executes the statement and is only allowed for reads.")
+    options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    with engine.connect() as connection:
+        # ANALYZE of a read still runs in a transaction that is rolled back on exit
+        plan = connection.exec_driver_sql(f"EXPLAIN ({options}) {slow_query.statement}", slow_query.params).scalar()
+    return {**slow_query.as_dict(), "analyze": analyze, "plan": plan}
@@ -1,5 +1,8 @@
 import os
+import re
+import html
 import functools
+import inspect
 import logging
 from datetime import datetime
 
@@ -10,7 +13,18 @@ def handle_error(func):
     """
     Decorator to handle errors gracefully in functions.
     Logs the exception and prevents the application from crashing.
+    Works on both plain and ``async`` functions.
     """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                logging.error(f"Error in {func.__name__}: {e}", exc_info=True)
+                return {"error": f"An unexpected error occurred in {func.__name__}"}
+        return async_wrapper
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
@@ -26,6 +40,19 @@ def format_datetime(dt: datetime) -> str:
     """
     return dt.strftime("%Y-%m-%d %H:%M:%S")
 
+def make_snippet(text: str, length: int = 200) -> str:
+    """
+    Plain-text preview of an article body: markup stripped, whitespace
+    collapsed, and cut at a word boundary with an ellipsis if too long.
+    """
+    if not text:
+        return ""
+    plain = " ".join(html.unescape(re.sub(r"<[^>]*>?", " ", text)).split())
+    if len(plain) <= length:
+        return plain
+    cut = plain[:length].rsplit(" ", 1)[0] or plain[:length]
+    return cut.rstrip(" ,.;:") + "…"
+
 def load_env_variable(key: str, default: str = None) -> str:
     """
     Load an environment variable, with an optional default value.
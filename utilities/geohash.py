@@ -0,0 +1,157 @@
+import math
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode(latitude: float, longitude: float, precision: int = 9) -> str:
+    """Geohash of a point; each extra character narrows the cell about 32-fold."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        target, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = value = 0
+    return "".join(chars)
+
+
+def decode_bbox(geohash: str) -> tuple:
+    """Bounds of a geohash cell as ``(min_lat, min_lon, max_lat, max_lon)``."""
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            if value >> shift & 1:
+                bounds[0] = middle
+            else:
+                bounds[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[1], lon_range[1]
+
+
+def decode(geohash: str) -> tuple:
+    """Center of a geohash cell as ``(latitude, longitude)``."""
+    min_lat, min_lon, max_lat, max_lon = decode_bbox(geohash)
+    return (min_lat + max_lat) / 2, (min_lon + max_lon) / 2
+
+
+def cell_size(precision: int) -> tuple:
+    """Height and width in degrees of a cell at ``precision``."""
+    lon_bits = math.ceil(precision * 5 / 2)
+    lat_bits = precision * 5 - lon_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi, d_lambda = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bbox(latitude: float, longitude: float, radius_km: float) -> tuple:
+    """Bounding box ``(min_lat, min_lon, max_lat, max_lon)`` enclosing a circle."""
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    cos_lat = math.cos(math.radians(latitude))
+    d_lon = 180.0 if cos_lat < 1e-9 else min(180.0, math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat)))
+    return max(-90.0, latitude - d_lat), max(-180.0, longitude - d_lon), min(90.0, latitude + d_lat), min(180.0, longitude + d_lon)
+
+
+def cover_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float, max_cells: int = 32, max_precision: int = 9) -> list:
+    """
+    Geohash cells covering a bounding box, at the finest precision (up to
+    ``max_precision``) that needs at most ``max_cells`` cells.
+
+    Every point inside the box lies in one of the returned cells, so a prefix
+    match on them finds all candidates; callers still filter by exact bounds.
+    """
+    for precision in range(max_precision, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor(max_lat / height) - math.floor(min_lat / height) + 1
+        columns = math.floor(max_lon / width) - math.floor(min_lon / width) + 1
+        if rows * columns <= max_cells or precision == 1:
+            break
+    cells = set()
+    start_lat = (math.floor(min_lat / height) + 0.5) * height
+    start_lon = (math.floor(min_lon / width) + 0.5) * width
+    for row in range(rows):
+        for column in range(columns):
+            lat = min(max(start_lat + row * height, -90.0), 90.0)
+            lon = min(max(start_lon + column * width, -180.0), 180.0)
+            cells.add(encode(lat, lon, precision))
+    return sorted(cells)
+
+
+class GeoIndex:
+    """
+    In-process grid index of points bucketed by geohash cell.
+
+    Points are stored under their cell at ``precision``; a query covers its
+    area with cells no finer than that, scans only the matching buckets and
+    then filters by exact distance or bounds.
+    """
+
+    def __init__(self, precision: int = 5):
+        self.precision = precision
+        self._cells: dict[str, dict] = {}
+        self._points: dict = {}
+
+    def add(self, key, latitude: float, longitude: float, value=None):
+        self.remove(key)
+        cell = encode(latitude, longitude, self.precision)
+        self._cells.setdefault(cell, {})[key] = (latitude, longitude, value)
+        self._points[key] = cell
+
+    def remove(self, key):
+        cell = self._points.pop(key, None)
+        if cell is not None:
+            del self._cells[cell][key]
+            if not self._cells[cell]:
+                del self._cells[cell]
+
+    def _candidates(self, min_lat, min_lon, max_lat, max_lon):
+        cells = set()
+        for prefix in cover_bbox(min_lat, min_lon, max_lat, max_lon, max_precision=self.precision):
+            if len(prefix) == self.precision:
+                cells.add(prefix)
+            else:
+                cells.update(cell for cell in self._cells if cell.startswith(prefix))
+        for cell in cells:
+            yield from self._cells.get(cell, {}).items()
+
+    def within_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> list:
+        """``(key, latitude, longitude, value)`` for every point inside the box."""
+        return [
+            (key, lat, lon, value)
+            for key, (lat, lon, value) in self._candidates(min_lat, min_lon, max_lat, max_lon)
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+        ]
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float) -> list:
+        """``(key, distance_km, value)`` for every point within the radius, nearest first."""
+        matches = []
+        for key, (lat, lon, value) in self._candidates(*radius_bbox(latitude, longitude, radius_km)):
+            distance = haversine_km(latitude, longitude, lat, lon)
+            if distance <= radius_km:
+                matches.append((key, distance, value))
+        matches.sort(key=lambda match: match[1])
+        return matches
+
+    def __len__(self) -> int:
+        return len(self._points)
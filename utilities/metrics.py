@@ -0,0 +1,95 @@
+class LatencyStats:
+    """Count, mean and maximum of a latency, in milliseconds."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def observe(self, seconds: float):
+        milliseconds = seconds * 1000
+        self.count += 1
+        self.total_ms += milliseconds
+        self.max_ms = max(self.max_ms, milliseconds)
+        self.last_ms = milliseconds
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "last_ms": round(self.last_ms, 3),
+        }
+
+
+# Upper bounds in seconds, from sub-millisecond index lookups to multi-second scans
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus model."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the ``q`` quantile (``inf`` past the last bucket)."""
+        target, seen = q * self.count, 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target and self.count:
+                return bound
+        return float("inf")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_metric(name: str, kind: str, help_text: str, samples: list) -> list:
+    """
+    Prometheus text exposition lines for one metric family.
+
+    Args:
+        name (str): Metric name.
+        kind (str): ``counter``, ``gauge`` or ``histogram``.
+        help_text (str): HELP line.
+        samples (list): ``(labels, value)`` pairs; for histograms ``value`` is a ``Histogram``.
+    """
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if kind != "histogram":
+            lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            continue
+        cumulative = 0
+        for bound, count in zip(value.buckets, value.counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}")
+        lines.append(f"{name}_bucket{_labels({**labels, 'le': '+Inf'})} {value.count}")
+        lines.append(f"{name}_sum{_labels(labels)} {_number(value.sum)}")
+        lines.append(f"{name}_count{_labels(labels)} {value.count}")
+    return lines
@@ -1,6 +1,8 @@
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 from starlette.responses import JSONResponse
+from app.utilities.database import reset_read_your_writes
+from app.utilities.query_metrics import query_metrics
 
 class HeaderValidationMiddleware(BaseHTTPMiddleware):
     """Middleware to validate headers in incoming requests."""
@@ -20,3 +22,21 @@ class HeaderValidationMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
         return response
 
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """Start every request unpinned, so replica reads are only redirected to the primary after a write in the same request."""
+    async def dispatch(self, request: Request, call_next):
+        reset_read_your_writes()
+        return await call_next(request)
+
+
+class QueryStatsMiddleware(BaseHTTPMiddleware):
+    """Count each request's database queries, flag N+1 patterns and report the count in ``X-Query-Count``."""
+    async def dispatch(self, request: Request, call_next):
+        stats = query_metrics.start_request()
+        response = await call_next(request)
+        # The route template, not the raw path, so IDs do not multiply the metric's labels
+        route = request.scope.get("route")
+        query_metrics.finish_request(stats, f"{request.method} {route.path if route else 'unmatched'}")
+        response.headers["X-Query-Count"] = str(stats.count)
+        return response
@@ -0,0 +1,31 @@
+import base64
+import json
+from datetime import datetime
+
+
+def encode_cursor(published_at, row_id: int) -> str:
+    """
+    Build an opaque continuation token for keyset pagination on ``(published_at, id)``.
+    """
+    if isinstance(published_at, datetime):
+        published_at = published_at.isoformat()
+    payload = json.dumps([published_at, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple:
+    """
+    Decode a token produced by ``encode_cursor``.
+
+    Returns:
+        tuple: ``(published_at, id)``.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        published_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(published_at), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
@@ -0,0 +1,252 @@
+import hashlib
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.utilities.logging import log_event
+from app.utilities.metrics import Histogram, render_metric
+
+OTHER_FINGERPRINT = "other"
+REQUEST_QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_COMMENT = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|\?|(?<!:):(?!:)\w+")
+_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_REPEATED_GROUP = re.compile(r"(\((?:[^()]|\([^()]*\))*\))(?:\s*,\s*\1)+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalized shape of a SQL statement: literals and placeholders become
+    ``?``, whitespace and comments collapse, and value lists of any length
+    (``IN (?, ?, ?)``, multi-row ``VALUES``) fold into one, so every execution
+    of the same query lands on the same fingerprint.
+    """
+    sql = _COMMENT.sub(" ", statement)
+    sql = _STRING.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _WHITESPACE.sub(" ", sql).strip()
+    sql = _VALUE_LIST.sub("(?, ...)", sql)
+    return _REPEATED_GROUP.sub(r"\1, ...", sql)
+
+
+def fingerprint_id(sql_fingerprint: str) -> str:
+    """Short stable ID of a fingerprint, used as a metric label."""
+    return hashlib.sha1(sql_fingerprint.encode("utf-8")).hexdigest()[:12]
+
+
+class SlowQuery:
+    """One slow execution. Parameters stay in memory for ``EXPLAIN`` and are never logged or served."""
+
+    def __init__(self, database: str, statement: str, params, seconds: float):
+        self.database = database
+        self.statement = statement
+        self.params = params
+        self.seconds = seconds
+        self.fingerprint = fingerprint(statement)
+        self.fingerprint_id = fingerprint_id(self.fingerprint)
+        self.at = datetime.utcnow()
+
+    def as_dict(self) -> dict:
+        return {
+            "fingerprint_id": self.fingerprint_id,
+            "fingerprint": self.fingerprint,
+            "database": self.database,
+            "duration_ms": round(self.seconds * 1000, 3),
+            "at": self.at.isoformat(),
+        }
+
+
+class StatementStats:
+    """Latency histogram, row and error counts for one fingerprint on one database."""
+
+    def __init__(self, sql_fingerprint: str):
+        self.fingerprint = sql_fingerprint
+        self.latency = Histogram()
+        self.rows = 0
+        self.errors = 0
+        self.slow = 0
+
+
+class RequestQueryStats:
+    """Queries run while serving one request, by fingerprint."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.by_fingerprint = Counter()
+
+    def repeated(self, threshold: int) -> list:
+        """``(fingerprint, executions)`` for shapes run at least ``threshold`` times, the N+1 signature."""
+        return [(sql, count) for sql, count in self.by_fingerprint.most_common() if count >= threshold]
+
+
+_request_stats: ContextVar[RequestQueryStats] = ContextVar("request_query_stats", default=None)
+
+
+class QueryMetrics:
+    """
+    Process-wide query statistics fed by SQLAlchemy engine events.
+
+    Statements are grouped by ``fingerprint``; at most
+    ``QUERY_METRICS_MAX_FINGERPRINTS`` shapes are tracked per database and any
+    further ones are counted under ``other``. Executions slower than
+    ``SLOW_QUERY_THRESHOLD_MS`` are logged and the latest
+    ``SLOW_QUERY_LOG_SIZE`` kept for ``EXPLAIN`` on demand.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.statements: dict = {}
+        self.slow_queries = deque(maxlen=settings.SLOW_QUERY_LOG_SIZE)
+        self.request_queries = Histogram(REQUEST_QUERY_BUCKETS)
+        self.n_plus_one = Counter()
+
+    def _stats(self, database: str, sql_fingerprint: str) -> tuple:
+        key = (database, fingerprint_id(sql_fingerprint))
+        if key not in self.statements:
+            tracked = sum(1 for db, _ in self.statements if db == database)
+            if tracked >= settings.QUERY_METRICS_MAX_FINGERPRINTS:
+                key = (database, OTHER_FINGERPRINT)
+                sql_fingerprint = OTHER_FINGERPRINT
+            self.statements.setdefault(key, StatementStats(sql_fingerprint))
+        return key, self.statements[key]
+
+    def record(self, database: str, statement: str, params, seconds: float, rows: int = 0, failed: bool = False):
+        sql_fingerprint = fingerprint(statement)
+        slow = seconds * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS
+        with self._lock:
+            (_, statement_id), stats = self._stats(database, sql_fingerprint)
+            stats.latency.observe(seconds)
+            stats.rows += max(rows, 0)
+            stats.errors += failed
+            if slow:
+                stats.slow += 1
+                self.slow_queries.append(SlowQuery(database, statement, params, seconds))
+
+        request = _request_stats.get()
+        if request is not None:
+            request.count += 1
+            request.seconds += seconds
+            request.by_fingerprint[sql_fingerprint] += 1
+        if slow:
+            log_event(
+                "SLOW_QUERY",
+                f"{seconds * 1000:.0f} ms on {database} [{statement_id}]: {sql_fingerprint[:1000]}",
+                level="WARNING",
+            )
+
+    def find_slow_query(self, statement_id: str):
+        """The latest slow execution with this fingerprint ID, if still in the log."""
+        with self._lock:
+            for slow_query in reversed(self.slow_queries):
+                if slow_query.fingerprint_id == statement_id:
+                    return slow_query
+        return None
+
+    def recent_slow_queries(self, limit: int = 50) -> list:
+        with self._lock:
+            return [slow_query.as_dict() for slow_query in list(self.slow_queries)[::-1][:limit]]
+
+    def prometheus_lines(self) -> list:
+        with self._lock:
+            items = sorted(self.statements.items())
+            n_plus_one = sorted(self.n_plus_one.items())
+            request_queries = self.request_queries
+            labels = [({"database": database, "fingerprint_id": statement_id}, stats) for (database, statement_id), stats in items]
+            lines = render_metric(
+                "db_query_duration_seconds", "histogram", "Statement latency by normalized SQL fingerprint.",
+                [(label, stats.latency) for label, stats in labels],
+            )
+            lines += render_metric("db_query_rows_total", "counter", "Rows returned or affected.", [(label, stats.rows) for label, stats in labels])
+            lines += render_metric("db_query_errors_total", "counter", "Statements that raised.", [(label, stats.errors) for label, stats in labels])
+            lines += render_metric("db_slow_queries_total", "counter", "Statements slower than SLOW_QUERY_THRESHOLD_MS.", [(label, stats.slow) for label, stats in labels])
+            lines += render_metric(
+                "db_query_fingerprint_info", "gauge", "SQL text of each fingerprint ID.",
+                [({**label, "fingerprint": stats.fingerprint[:500]}, 1) for label, stats in labels],
+            )
+            lines += render_metric("http_request_db_queries", "histogram", "Database queries per HTTP request.", [({}, request_queries)])
+            lines += render_metric(
+                "http_request_n_plus_one_total", "counter", "Requests that repeated one statement at least N_PLUS_ONE_THRESHOLD times.",
+                [({"route": route}, count) for route, count in n_plus_one],
+            )
+        return lines
+
+    # Per-request tracking
+
+    def start_request(self) -> RequestQueryStats:
+        """Begin counting the current request's queries."""
+        stats = RequestQueryStats()
+        _request_stats.set(stats)
+        return stats
+
+    def finish_request(self, stats: RequestQueryStats, route: str) -> list:
+        """
+        Record a finished request's query count and flag N+1 patterns.
+
+        Returns:
+            list: ``(fingerprint, executions)`` pairs at or above ``N_PLUS_ONE_THRESHOLD``.
+        """
+        repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+        with self._lock:
+            self.request_queries.observe(stats.count)
+            if repeated:
+                self.n_plus_one[route] += 1
+        for sql_fingerprint, count in repeated:
+            log_event(
+                "N_PLUS_ONE",
+                f"{route} ran one statement {count} times ({stats.count} queries in total): {sql_fingerprint[:500]}",
+                level="WARNING",
+            )
+        return repeated
+
+
+# Shared query metrics for every engine in the process
+query_metrics = QueryMetrics()
+
+
+def instrument_queries(engine, database: str):
+    """
+    Time every statement ``engine`` runs and feed it to ``query_metrics``.
+
+    The data-access layer passes the caller's SQL as the ``fingerprint_sql``
+    execution option when it rewrites a statement (e.g. to ``EXECUTE`` a
+    prepared statement), so the original shape is what gets recorded.
+    """
+    if not settings.QUERY_METRICS_ENABLED:
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def on_before_execute(connection, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def on_after_execute(connection, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is not None:
+            statement = context.execution_options.get("fingerprint_sql", statement)
+            query_metrics.record(database, statement, parameters, time.perf_counter() - started, cursor.rowcount)
+
+    @event.listens_for(engine, "handle_error")
+    def on_error(exception_context):
+        context = exception_context.execution_context
+        started = getattr(context, "_query_started", None)
+        if started is not None and exception_context.statement:
+            statement = context.execution_options.get("fingerprint_sql", exception_context.statement)
+            query_metrics.record(database, statement, exception_context.parameters, time.perf_counter() - started, failed=True)
@@ -0,0 +1,155 @@
+import functools
+import hashlib
+import inspect
+import json
+import time
+
+import redis
+from fastapi.encoders import jsonable_encoder
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from app.config import settings
+from app.utilities.cache import RedisCache, redis_cache
+from app.utilities.logging import get_logger, log_exception
+
+logger = get_logger(__name__)
+
+TAG_KEY_PREFIX = "cache:tag:"
+RESPONSE_KEY_PREFIX = "cache:resp:"
+REQUEST_PARAM = "cache_request"
+
+_sync_client: redis.Redis = None
+
+
+def _tag_client() -> redis.Redis:
+    # Writers run in sync code (Celery tasks, handle_error-wrapped modules), so
+    # invalidation uses the blocking client rather than the shared aioredis one.
+    global _sync_client
+    if _sync_client is None:
+        _sync_client = redis.Redis.from_url(settings.REDIS_URL)
+    return _sync_client
+
+
+def _initial_version() -> str:
+    # Tag counters start from the current time rather than 0, so a counter
+    # lost with a Redis flush never repeats a version (and ETag) seen before.
+    return str(time.time_ns())
+
+
+def invalidate_tags(*tags: str):
+    """
+    Invalidate every cached response carrying any of ``tags``.
+
+    Each tag has a version counter that is part of the key (and ETag) of every
+    response tagged with it; bumping the counter makes those keys unreachable,
+    and the orphaned entries expire on their TTL. Call this after the write commits.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED or not tags:
+        return
+    try:
+        pipeline = _tag_client().pipeline(transaction=False)
+        for tag in tags:
+            pipeline.set(f"{TAG_KEY_PREFIX}{tag}", _initial_version(), nx=True)
+            pipeline.incr(f"{TAG_KEY_PREFIX}{tag}")
+        pipeline.execute()
+    except Exception as e:
+        log_exception(logger, e, "Failed to invalidate cached responses", tags=list(tags))
+
+
+async def _tag_versions(cache: RedisCache, tags: list) -> list:
+    keys = [f"{TAG_KEY_PREFIX}{tag}" for tag in tags]
+    versions = await cache.get_many(keys)
+    if None in versions:
+        for key, version in zip(keys, versions):
+            if version is None:
+                await cache.set(key, _initial_version(), only_if_missing=True)
+        versions = await cache.get_many(keys)
+    return versions
+
+
+def _digest(route: str, params: dict, tag_versions: list) -> str:
+    # Identifies a response: its route, normalized query parameters and tag versions
+    normalized = json.dumps([route, sorted(params.items()), tag_versions], default=str, separators=(",", ":"))
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an ``If-None-Match`` header against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag.removeprefix("W/") in [candidate.removeprefix("W/") for candidate in candidates]
+
+
+def cached_response(route: str, tags: list, cache: RedisCache = redis_cache, ttl: int = None, key_params=None):
+    """
+    Cache a GET endpoint's JSON response in Redis, tagged by entity, and
+    answer conditional requests.
+
+    Args:
+        route (str): Name of the route, used as the key prefix.
+        tags (list): Entity tags, formatted with the endpoint's parameters,
+            e.g. ``"items:region={region}"``.
+        cache (RedisCache): Connected cache to read and write through.
+        ttl (int): Entry lifetime in seconds; defaults to ``RESPONSE_CACHE_TTL_SECONDS``.
+        key_params (callable): Maps the endpoint's parameters to those that
+            identify the response, e.g. to share entries across a geohash cell.
+
+    Every response carries a weak ETag derived from the parameters and the tag
+    versions, plus a ``Cache-Control`` header. A request whose ``If-None-Match``
+    still matches gets a 304 from the version lookup alone, without running
+    the endpoint or reading the cached body. Only successful responses are
+    cached. If Redis is not connected or fails, the endpoint is served straight
+    from the database without validators.
+    """
+    ttl = ttl or settings.RESPONSE_CACHE_TTL_SECONDS
+    cache_control = f"public, max-age={settings.HTTP_CACHE_MAX_AGE_SECONDS}, must-revalidate"
+
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(**params):
+            request: Request = params.pop(REQUEST_PARAM, None)
+            if not settings.RESPONSE_CACHE_ENABLED or cache.redis is None:
+                return await endpoint(**params)
+
+            entity_tags = [tag.format(**params) for tag in tags]
+            key = etag = None
+            try:
+                versions = await _tag_versions(cache, entity_tags)
+                digest = _digest(route, key_params(params) if key_params else params, versions)
+                key = f"{RESPONSE_KEY_PREFIX}{route}:{digest}"
+                etag = f'W/"{digest[:20]}"'
+                validators = {"ETag": etag, "Cache-Control": cache_control}
+                if request is not None and etag_matches(request.headers.get("if-none-match"), etag):
+                    return Response(status_code=304, headers=validators)
+                body = await cache.get(key)
+                if body is not None:
+                    return Response(content=body, media_type="application/json", headers={**validators, "X-Cache": "HIT"})
+            except RuntimeError as e:
+                log_exception(logger, e, "Response cache read failed", route=route)
+
+            response = await endpoint(**params)
+            if not isinstance(response, Response):
+                response = JSONResponse(jsonable_encoder(response))
+            if key is not None and response.status_code == 200:
+                try:
+                    await cache.set(key, response.body, expire=ttl)
+                except RuntimeError as e:
+                    log_exception(logger, e, "Response cache write failed", route=route)
+                response.headers["ETag"] = etag
+                response.headers["Cache-Control"] = cache_control
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        # Have FastAPI pass the request in as well, for If-None-Match
+        signature = inspect.signature(endpoint)
+        wrapper.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ]
+        )
+        return wrapper
+
+    return decorator
@@ -0,0 +1,101 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase search terms with markup and stop words removed."""
+    return [token for token in _WORD_RE.findall(_TAG_RE.sub(" ", text or "").lower()) if token not in STOP_WORDS]
+
+
+class InvertedIndex:
+    """
+    In-memory inverted index ranked with Okapi BM25.
+
+    Each document has a title and a body; title terms count ``title_weight``
+    times towards a term's frequency, so matches in the headline rank higher.
+    Arbitrary per-document metadata is kept alongside so callers can filter
+    and render results without going back to the database.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: int = 2):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self._postings: dict[str, dict] = {}
+        self._lengths: dict = {}
+        self._terms: dict = {}
+        self._metadata: dict = {}
+        self._total_length = 0
+
+    def add(self, doc_id, title: str, body: str, metadata: dict = None):
+        """Index a document, replacing any earlier version with the same ID."""
+        if doc_id in self._lengths:
+            self.remove(doc_id)
+        frequencies = Counter(tokenize(body))
+        for term in tokenize(title):
+            frequencies[term] += self.title_weight
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(frequencies.values())
+        self._lengths[doc_id] = length
+        self._terms[doc_id] = tuple(frequencies)
+        self._metadata[doc_id] = metadata or {}
+        self._total_length += length
+
+    def remove(self, doc_id):
+        if doc_id not in self._lengths:
+            return
+        for term in self._terms.pop(doc_id):
+            del self._postings[term][doc_id]
+            if not self._postings[term]:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        self._metadata.pop(doc_id)
+
+    def search(self, query: str, limit: int = 10, offset: int = 0, predicate=None) -> list[tuple]:
+        """
+        Rank documents matching any query term.
+
+        Args:
+            query (str): Free-text query.
+            limit (int): Page size.
+            offset (int): Number of ranked results to skip.
+            predicate (callable): Optional filter called with a document's metadata.
+
+        Returns:
+            list: ``(doc_id, score, metadata)`` tuples, best first.
+        """
+        terms = set(tokenize(query))
+        if not terms or not self._lengths:
+            return []
+        count = len(self._lengths)
+        average_length = self._total_length / count
+        scores: dict = {}
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        if predicate is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if predicate(self._metadata[doc_id])}
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        return [(doc_id, score, self._metadata[doc_id]) for doc_id, score in top[offset:]]
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self._lengths
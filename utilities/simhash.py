@@ -0,0 +1,119 @@
+import hashlib
+import re
+from collections import deque
+from itertools import islice
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+FINGERPRINT_BITS = 64
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens, with any HTML markup stripped first."""
+    return _WORD_RE.findall(_TAG_RE.sub(" ", text or "").lower())
+
+
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text: str, max_tokens: int = None, min_features: int = 1) -> int:
+    """
+    64-bit SimHash of a text over word bigrams (unigrams for one-word texts).
+
+    Texts that share most of their wording get fingerprints a small Hamming
+    distance apart. Only the first ``max_tokens`` words are used, which keeps
+    the cost flat for long texts; texts with fewer than ``min_features``
+    features have no meaningful fingerprint and return None.
+    """
+    words = _WORD_RE.finditer(_TAG_RE.sub(" ", text or ""))
+    tokens = [match.group().lower() for match in islice(words, max_tokens)]
+    if len(tokens) > 1:
+        features = [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    else:
+        features = tokens
+    if not features or len(features) < min_features:
+        return None
+
+    # Lay the feature hashes out as one bit string and count each bit column
+    # with str.count, which is far cheaper than a Python loop per bit.
+    bits = "".join(format(_feature_hash(feature), "064b") for feature in features)
+    fingerprint = 0
+    for position in range(FINGERPRINT_BITS):
+        if bits[position::FINGERPRINT_BITS].count("1") * 2 > len(features):
+            fingerprint |= 1 << (FINGERPRINT_BITS - 1 - position)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit fingerprint onto a Postgres BIGINT."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned64(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class SimHashIndex:
+    """
+    Bounded near-duplicate lookup over SimHash fingerprints.
+
+    Fingerprints are split into ``max_distance + 1`` bands; two fingerprints
+    within ``max_distance`` bits must agree exactly on at least one band, so a
+    lookup only compares against the few entries sharing a band value. The
+    oldest entries are evicted once ``capacity`` is reached.
+    """
+
+    def __init__(self, max_distance: int = 3, capacity: int = 200000):
+        self.max_distance = max_distance
+        self.capacity = capacity
+        bands = max_distance + 1
+        width = FINGERPRINT_BITS // bands
+        self._bands = [
+            (index * width, FINGERPRINT_BITS - index * width if index == bands - 1 else width)
+            for index in range(bands)
+        ]
+        self._buckets: dict[tuple, list] = {}
+        self._entries = deque()
+
+    def _keys(self, fingerprint: int):
+        for index, (offset, width) in enumerate(self._bands):
+            yield index, (fingerprint >> offset) & ((1 << width) - 1)
+
+    def find(self, fingerprint: int):
+        """
+        Return the value stored with the nearest fingerprint within ``max_distance``, or None.
+        """
+        best = None
+        best_distance = self.max_distance + 1
+        for key in self._keys(fingerprint):
+            for candidate, value in self._buckets.get(key, ()):
+                distance = hamming_distance(fingerprint, candidate)
+                if distance < best_distance:
+                    best, best_distance = value, distance
+        return best
+
+    def add(self, fingerprint: int, value):
+        """Index a fingerprint with an associated value (e.g. a cluster ID)."""
+        entry = (fingerprint, value)
+        for key in self._keys(fingerprint):
+            self._buckets.setdefault(key, []).append(entry)
+        self._entries.append(entry)
+        while len(self._entries) > self.capacity:
+            self._evict(self._entries.popleft())
+
+    def _evict(self, entry):
+        for key in self._keys(entry[0]):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.remove(entry)
+                if not bucket:
+                    del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)